@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Labyrinthegame.settings')
 
 application = get_asgi_application()
+
+# Environnements compilés et résultats des pages précalculés (voir appgamme/warmup.py)
+from appgamme.warmup import warm_up_server  # noqa: E402
+
+warm_up_server()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -124,3 +125,69 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Tests : métriques propres au processus (voir appgamme/tests/runner.py)
+TEST_RUNNER = 'appgamme.tests.runner.TestRunner'
+
+
+# Exécuteur des entraînements (voir appgamme/executor.py)
+
+TRAINING_EXECUTOR = {
+    'max_workers': None,  # None = nombre de cœurs
+    'max_pending': 32,
+    'timeout': 30.0,
+    'mode': 'process',
+    # Processus démarrés sans fork (le serveur web est multi-thread) : 'forkserver' ou 'spawn'
+    'start_method': 'forkserver',
+}
+
+
+# Cache des résultats d'entraînement (voir rl_engine/cache.py)
+# 'directory' active la persistance sur disque, partagée entre les processus
+
+TRAINING_CACHE = {
+    'maxsize': 128,
+    'directory': None,
+}
+
+
+# Contrôle d'admission des API d'entraînement (voir appgamme/admission.py)
+
+TRAINING_ADMISSION = {
+    'max_episodes': 5000,
+    'max_cells': 400,
+    'max_request_cost': 500000,
+    'client_budget': 2000000,
+    'client_window': 60.0,
+    'max_concurrent': 16,
+    'retry_after': 5,
+}
+
+# Identifier les clients par X-Forwarded-For (derrière un répartiteur de charge de confiance)
+TRAINING_TRUST_FORWARDED_FOR = False
+
+
+# Vues asynchrones pour les pages et l'API d'entraînement (voir appgamme/async_views.py)
+# À activer sous un serveur ASGI (uvicorn, daphne) : Labyrinthegame.asgi.application
+
+TRAINING_ASYNC_VIEWS = False
+
+
+# Métriques opérationnelles exposées par /metrics/ (voir rl_engine/metrics.py)
+# 'path' : fichier partagé par les processus (web et exécuteur), None = par processus
+# Hors du dépôt par défaut ; les tests et manage.py benchmark n'y écrivent pas
+
+TRAINING_METRICS = {
+    'path': Path(tempfile.gettempdir()) / 'labyrinthe-metrics.sqlite3',
+    'flush_interval': 1.0,
+}
+
+
+# Préchauffage au démarrage : environnements compilés et pages précalculées (voir appgamme/warmup.py)
+# Effectué par les serveurs (wsgi.py, asgi.py, runserver), pas par les autres commandes manage.py
+# 'path' : résultats partagés par les processus (web et exécuteur), régénérés par manage.py warmup
+
+TRAINING_WARMUP = {
+    'enabled': True,
+    'path': BASE_DIR / 'warmup.pkl',
+}
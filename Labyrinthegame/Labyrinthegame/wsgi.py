@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Labyrinthegame.settings')
 
 application = get_wsgi_application()
+
+# Environnements compilés et résultats des pages précalculés (voir appgamme/warmup.py)
+from appgamme.warmup import warm_up_server  # noqa: E402
+
+warm_up_server()
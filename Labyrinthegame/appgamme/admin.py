@@ -1,3 +1,17 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import StoredQTable, TrainingJob
+
+
+@admin.register(TrainingJob)
+class TrainingJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'episodes_done', 'episodes_total', 'created_at')
+    list_filter = ('status',)
+    readonly_fields = ('key', 'params', 'result', 'error', 'created_at', 'updated_at')
+
+
+@admin.register(StoredQTable)
+class StoredQTableAdmin(admin.ModelAdmin):
+    list_display = ('maze_hash', 'rows', 'cols', 'gamma', 'episodes_trained', 'updated_at')
+    exclude = ('q_values', 'policy')
+    readonly_fields = ('maze_hash', 'gamma', 'rows', 'cols', 'final_path', 'updated_at')
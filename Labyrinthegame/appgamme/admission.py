@@ -0,0 +1,192 @@
+"""
+Module admission.py
+Contrôle d'admission et budgets de calcul des API d'entraînement
+
+Le coût d'un entraînement est estimé en pas d'agent : épisodes x nombre
+maximum de pas par épisode (100, ou moins si la grille a moins de cases
+libres). Chaque requête est soumise à :
+    - un budget par requête (épisodes, taille de grille, coût estimé) ;
+    - un budget par client sur une fenêtre glissante ;
+    - une limite globale d'entraînements simultanés.
+
+Configuration (settings.py, toutes les clés sont optionnelles) :
+    TRAINING_ADMISSION = {
+        'max_episodes': 5000,
+        'max_cells': 400,             # 20x20, comme create_maze_view
+        'max_request_cost': 500000,
+        'client_budget': 2000000,     # coût cumulé autorisé par fenêtre
+        'client_window': 60.0,        # secondes
+        'max_concurrent': 16,
+        'retry_after': 5,             # secondes, en cas de surcharge
+    }
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+MAX_STEPS_PER_EPISODE = 100
+
+DEFAULTS = {
+    'max_episodes': 5000,
+    'max_cells': 400,
+    'max_request_cost': 500000,
+    'client_budget': 2000000,
+    'client_window': 60.0,
+    'max_concurrent': 16,
+    'retry_after': 5,
+}
+
+
+class BudgetExceeded(Exception):
+    """La requête dépasse le budget autorisé pour une seule requête"""
+
+
+class Overloaded(Exception):
+    """Trop de demandes (client ou serveur) : réessayer après retry_after secondes"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_cost(maze_grid, episodes):
+    """Estime le coût d'un entraînement en pas d'agent"""
+    free_cells = sum(1 for row in maze_grid for cell in row if cell != '#')
+    return episodes * min(MAX_STEPS_PER_EPISODE, max(free_cells, 1))
+
+
+class Ticket:
+    """Place d'entraînement accordée, à libérer une fois l'entraînement terminé"""
+
+    def __init__(self, controller, cost):
+        self.controller = controller
+        self.cost = cost
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.controller._release()
+
+    def release_when_done(self, future):
+        """
+        Libère la place à la fin du job de l'exécuteur (terminé, en échec ou annulé)
+
+        Le délai d'attente d'une requête peut expirer avant la fin du job :
+        la place reste comptée tant que le job occupe un processus.
+        """
+        future.add_done_callback(lambda _future: self.release())
+
+
+class AdmissionController:
+    """Applique les budgets par requête, par client et la limite globale"""
+
+    def __init__(self, **config):
+        unknown = set(config) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Options d'admission inconnues: {', '.join(sorted(unknown))}")
+        self.config = {**DEFAULTS, **config}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # Consommation récente par client : deque de (horodatage, coût)
+        self._usage = {}
+
+    @property
+    def in_flight(self):
+        """Nombre d'entraînements admis et non terminés"""
+        return self._in_flight
+
+    def check_request(self, maze_grid, episodes):
+        """
+        Vérifie le budget par requête et retourne le coût estimé
+
+        Raises:
+            BudgetExceeded: si la requête est trop coûteuse
+        """
+        config = self.config
+        if episodes < 1:
+            raise BudgetExceeded("Le nombre d'épisodes doit être positif")
+        if episodes > config['max_episodes']:
+            raise BudgetExceeded(
+                f"Trop d'épisodes demandés ({episodes}), maximum: {config['max_episodes']}")
+        cells = len(maze_grid) * max((len(row) for row in maze_grid), default=0)
+        if cells > config['max_cells']:
+            raise BudgetExceeded(
+                f"Grille trop grande ({cells} cases), maximum: {config['max_cells']}")
+        cost = estimate_cost(maze_grid, episodes)
+        if cost > config['max_request_cost']:
+            raise BudgetExceeded(
+                f"Entraînement trop coûteux ({cost} pas), maximum: {config['max_request_cost']}")
+        return cost
+
+    def admit(self, client_id, maze_grid, episodes):
+        """
+        Admet un entraînement ou le refuse
+
+        Raises:
+            BudgetExceeded: budget par requête dépassé
+            Overloaded: budget du client ou limite globale atteints
+        """
+        cost = self.check_request(maze_grid, episodes)
+        config = self.config
+        now = time.monotonic()
+
+        with self._lock:
+            if self._in_flight >= config['max_concurrent']:
+                raise Overloaded("Serveur surchargé, réessayez plus tard", config['retry_after'])
+
+            usage = self._usage.setdefault(client_id, deque())
+            while usage and usage[0][0] <= now - config['client_window']:
+                usage.popleft()
+            used = sum(item_cost for _, item_cost in usage)
+            if used + cost > config['client_budget']:
+                # Attendre que suffisamment d'anciennes demandes sortent de la fenêtre
+                freed = 0
+                retry_after = config['client_window']
+                for timestamp, item_cost in usage:
+                    freed += item_cost
+                    if used - freed + cost <= config['client_budget']:
+                        retry_after = timestamp + config['client_window'] - now
+                        break
+                raise Overloaded("Budget de calcul du client épuisé",
+                                 max(1, math.ceil(retry_after)))
+
+            usage.append((now, cost))
+            self._in_flight += 1
+
+            # Nettoyage des clients inactifs
+            if len(self._usage) > 10000:
+                for key in [k for k, v in self._usage.items() if not v]:
+                    del self._usage[key]
+
+        return Ticket(self, cost)
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+
+def client_id_for(request):
+    """Identifiant du client : adresse IP (premier X-Forwarded-For si configuré)"""
+    if getattr(settings, 'TRAINING_TRUST_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', 'unknown')
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller():
+    """Retourne le contrôleur d'admission du processus"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController(**getattr(settings, 'TRAINING_ADMISSION', {}))
+        return _controller
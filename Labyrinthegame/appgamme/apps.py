@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class AppgammeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'appgamme'
+
+    def ready(self):
+        from rl_engine.cache import configure_cache
+        from rl_engine.metrics import configure_metrics
+
+        cache_config = getattr(settings, 'TRAINING_CACHE', {})
+        configure_cache(**cache_config)
+        metrics_config = getattr(settings, 'TRAINING_METRICS', {})
+        configure_metrics(**metrics_config)
@@ -0,0 +1,175 @@
+"""
+Module async_views.py
+Vues asynchrones (ASGI) des pages et API d'entraînement
+
+Sous un serveur ASGI (uvicorn, daphne), une vue synchrone occupe un thread
+pendant tout l'entraînement. Ces vues soumettent le calcul à l'exécuteur
+partagé (appgamme/executor.py) et attendent son résultat avec await : un seul
+processus web peut ainsi servir des centaines d'entraînements simultanés,
+limités seulement par le contrôle d'admission et la file de l'exécuteur.
+
+Les vues produisent exactement les mêmes réponses que leurs équivalents de
+views.py. Elles sont activées par TRAINING_ASYNC_VIEWS = True (urls.py).
+Les réponses en flux (train_stream_api, job_events_api) ont une version par
+mode : un itérateur asynchrone ici, synchrone dans views.py. Django mettrait
+en tampon tout le flux d'un itérateur de l'autre mode.
+"""
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+
+from rl_engine.q_learner import get_optimal_path, train_with_live_updates
+
+from .admission import client_id_for, get_admission_controller
+from .executor import get_executor
+from .jobs import expire_stale_jobs
+from .metrics import instrument_view
+from .models import TrainingJob
+from .qstore import train_and_store
+from .views import (
+    DEMO_MAZE, DEMO_PARAMS, TRAINING_PAGE_HISTORY,
+    _demo_context, _demo_error_context, _training_context, _training_error_context,
+    _parse_train_request, _check_train_budget, _validate_train_maze,
+    _train_response, _train_error_response, _start_train_stream, _stream_error_line,
+    _stream_response, _with_queue_depth, _job_status, _sse,
+    EVENTS_POLL_INTERVAL, EVENTS_KEEPALIVE,
+)
+
+
+@instrument_view('demo_view')
+async def demo_view(request):
+    """Démonstration avec animation progressive (version asynchrone)"""
+    maze_grid = DEMO_MAZE
+    solver = request.GET.get('solver', 'qlearning')
+
+    try:
+        if solver == 'qlearning':
+            path = await get_executor().run_async(get_optimal_path, grid=maze_grid, **DEMO_PARAMS)
+        else:
+            # Les planificateurs sont assez rapides pour s'exécuter dans la requête
+            path = get_optimal_path(grid=maze_grid, gamma=DEMO_PARAMS['gamma'], solver=solver)
+        context = _demo_context(maze_grid, path)
+    except Exception as e:
+        context = _demo_error_context(maze_grid, e)
+
+    return render(request, 'demo.html', context)
+
+
+@instrument_view('training_view')
+async def training_view(request):
+    """Visualisation de l'entraînement en direct (version asynchrone)"""
+    maze_grid = DEMO_MAZE
+
+    try:
+        training_result = await get_executor().run_async(
+            train_with_live_updates,
+            grid=maze_grid,
+            **DEMO_PARAMS,
+            **TRAINING_PAGE_HISTORY
+        )
+        context = _training_context(maze_grid, training_result)
+    except Exception as e:
+        context = _training_error_context(maze_grid, e)
+
+    return render(request, 'training.html', context)
+
+
+@instrument_view('train_api')
+async def train_api(request):
+    """API pour l'entraînement en temps réel (version asynchrone)"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Méthode non autorisée'}, status=405)
+
+    try:
+        params, encoding = _parse_train_request(request)
+        maze_grid = params['grid']
+
+        error_response = _check_train_budget(params) or _validate_train_maze(maze_grid)
+        if error_response:
+            return error_response
+
+        ticket = get_admission_controller().admit(client_id_for(request), maze_grid, params['episodes'])
+        executor = get_executor()
+        try:
+            future = executor.submit_with_timeout(train_and_store, **params)
+        except Exception:
+            ticket.release()
+            raise
+        ticket.release_when_done(future)
+        result = await executor.wait_async(future)
+
+        return _train_response(result, params, encoding)
+
+    except Exception as e:
+        return _train_error_response(e)
+
+
+class AsyncEventLines:
+    """Lignes NDJSON d'un EventStream, itérateur asynchrone (voir views.EventLines)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    async def __aiter__(self):
+        try:
+            async for event in self.stream:
+                yield json.dumps(event) + '\n'
+        except Exception as e:
+            yield _stream_error_line(e)
+
+    def close(self):
+        self.stream.close()
+
+
+async def train_stream_api(request):
+    """API d'entraînement en flux (NDJSON), version asynchrone de views.train_stream_api"""
+    stream, error_response = _start_train_stream(request)
+    if error_response:
+        return error_response
+    # La fermeture de la réponse (fin ou client déconnecté) arrête le job
+    return _with_queue_depth(_stream_response(AsyncEventLines(stream), 'application/x-ndjson'))
+
+
+async def _job_events(job_id):
+    """Événements 'progress' à chaque changement d'état du job, puis 'end'"""
+    last_status = None
+    last_sent = asyncio.get_running_loop().time()
+    while True:
+        await sync_to_async(expire_stale_jobs)(pk=job_id)
+        job = await TrainingJob.objects.filter(pk=job_id).afirst()
+        if job is None:
+            yield _sse('error', {'error': 'Job introuvable'})
+            return
+
+        status = _job_status(job)
+        now = asyncio.get_running_loop().time()
+        if status != last_status:
+            yield _sse('progress', status)
+            last_status = status
+            last_sent = now
+        elif now - last_sent >= EVENTS_KEEPALIVE:
+            yield ": keepalive\n\n"
+            last_sent = now
+
+        if job.status not in TrainingJob.ACTIVE_STATUSES:
+            yield _sse('end', status)
+            return
+        await asyncio.sleep(EVENTS_POLL_INTERVAL)
+
+
+async def job_events_api(request, job_id):
+    """
+    Avancement d'un job en flux Server-Sent Events (text/event-stream)
+
+    Utilisable directement avec EventSource côté navigateur : un événement
+    'progress' (même contenu que job_status_api) à chaque changement, puis un
+    événement 'end' quand le job est terminé, annulé ou en échec.
+    """
+    if not await TrainingJob.objects.filter(pk=job_id).aexists():
+        raise Http404("Job introuvable")
+
+    return _stream_response(_job_events(job_id), 'text/event-stream')
@@ -0,0 +1,257 @@
+"""
+Module benchmarks.py
+Mesures de performance du moteur RL et des API (commande manage.py benchmark)
+
+Chaque scénario est exécuté sur les labyrinthes prédéfinis (MAZES) et sur des
+labyrinthes générés de plus grande taille, avec des graines fixes. Les
+mesures de temps retiennent la meilleure de plusieurs répétitions pour
+limiter le bruit. Les résultats sont un dict {scénario: {métrique: valeur}}
+comparé à une référence enregistrée (benchmarks/baseline.json) : une
+métrique dégradée au-delà de la tolérance est signalée comme régression.
+"""
+
+import json
+import platform
+import statistics
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from rl_engine.generator import generate_maze
+from rl_engine.maze import MAZES
+from rl_engine.q_learner import QLearnerWithVisualization, train_with_live_updates
+
+# Sens d'amélioration de chaque métrique : True si une valeur plus grande est meilleure
+METRICS = {
+    'episodes_per_sec': True,
+    'steps_per_sec': True,
+    'calls_per_sec': True,
+    'peak_memory_kb': False,
+    'serialize_ms': False,
+    'payload_bytes': False,
+    'latency_p50_ms': False,
+    'latency_p95_ms': False,
+}
+
+# Labyrinthes générés ajoutés aux labyrinthes prédéfinis (algorithme, lignes, colonnes)
+GENERATED = (
+    ('prim', 21, 21),
+    ('prim', 51, 51),
+    ('obstacles', 100, 100),
+)
+
+
+def benchmark_mazes():
+    """Labyrinthes mesurés : {nom: grille}"""
+    mazes = {}
+    for idx, maze in enumerate(MAZES):
+        mazes[f'maze{idx + 1}-{len(maze)}x{len(maze[0])}'] = maze
+    for algorithm, rows, cols in GENERATED:
+        mazes[f'{algorithm}-{rows}x{cols}'] = generate_maze(rows, cols, algorithm=algorithm, seed=0)
+    return mazes
+
+
+def _calls_per_sec(func, repeat):
+    """Appels par seconde d'une fonction rapide (boucles d'au moins 0.2 s, voir timeit)"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat, number))
+
+
+def _start_position(grid):
+    """Position de S dans la grille"""
+    for r, row in enumerate(grid):
+        if 'S' in row:
+            return r, row.index('S')
+    raise ValueError("Aucune position de départ (S) trouvée")
+
+
+def bench_training(grid, episodes, repeat):
+    """
+    train_with_callback (graine 0) : épisodes/s et pas/s avec history='summary'
+    (meilleure de repeat mesures), pic mémoire d'une exécution avec history='full'
+    """
+    start_pos = _start_position(grid)
+
+    def train():
+        agent = QLearnerWithVisualization(seed=0)
+        return agent.train_with_callback(grid, start_pos, episodes, history='summary')
+
+    # Entraînement reproductible (seed) : même nombre de pas à chaque exécution
+    steps = sum(episode['steps'] for episode in train())
+    runs_per_sec = _calls_per_sec(train, repeat)
+
+    # Mémoire mesurée à part : tracemalloc ralentit l'exécution
+    tracemalloc.start()
+    QLearnerWithVisualization(seed=0).train_with_callback(grid, start_pos, episodes, history='full')
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'episodes_per_sec': episodes * runs_per_sec,
+        'steps_per_sec': steps * runs_per_sec,
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def bench_best_path(grid, repeat):
+    """get_current_best_path sur une Q-table entraînée"""
+    agent = QLearnerWithVisualization(seed=0)
+    start_pos = _start_position(grid)
+    agent.train_with_callback(grid, start_pos, 200, history='none')
+    return {'calls_per_sec': _calls_per_sec(lambda: agent.get_current_best_path(grid, start_pos),
+                                            repeat)}
+
+
+def bench_valid_actions(grid, repeat):
+    """get_valid_actions sur toutes les cases libres"""
+    agent = QLearnerWithVisualization(seed=0)
+    agent.init_q_table(grid)
+    states = [(r, c) for r, row in enumerate(grid) for c, cell in enumerate(row) if cell != '#']
+
+    def run():
+        for state in states:
+            agent.get_valid_actions(state, grid)
+
+    return {'calls_per_sec': _calls_per_sec(run, repeat) * len(states)}
+
+
+def bench_serialization(grid, episodes, encoding, repeat):
+    """Construction de la réponse JSON de train_api (historique 'every_n')"""
+    from .views import _train_response
+
+    params = {'grid': grid, 'episodes': episodes}
+    result = train_with_live_updates(grid, episodes=episodes, seed=0, use_cache=False,
+                                     history='every_n', history_every=10)
+    serialize = lambda: _train_response(result, params, encoding)
+    return {
+        'serialize_ms': 1000 / _calls_per_sec(serialize, repeat),
+        'payload_bytes': len(serialize().content),
+    }
+
+
+def bench_endpoint(client, grid, episodes, requests):
+    """Latence de bout en bout de POST /api/train/ (client de test Django)"""
+    latencies = []
+    payload = 0
+    for i in range(requests):
+        # Graine différente à chaque requête pour ne pas mesurer le cache de résultats,
+        # adresse différente pour ne pas épuiser le budget d'un seul client
+        body = json.dumps({'maze': grid, 'episodes': episodes, 'seed': 1000 + i})
+        start = time.perf_counter()
+        response = client.post('/api/train/', body, content_type='application/json',
+                               REMOTE_ADDR=f'10.0.{i // 250}.{i % 250}')
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"POST /api/train/ a répondu {response.status_code}: "
+                               f"{response.content[:200]!r}")
+        payload = len(response.content)
+    latencies.sort()
+    return {
+        'latency_p50_ms': statistics.median(latencies),
+        'latency_p95_ms': latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        'payload_bytes': payload,
+    }
+
+
+def _scenarios(quick, endpoints):
+    """Liste des scénarios (nom, fonction de mesure, arguments)"""
+    episodes = 100 if quick else 500
+    repeat = 2 if quick else 3
+    mazes = benchmark_mazes()
+    scenarios = []
+
+    for name, grid in mazes.items():
+        scenarios.append((f'train_with_callback[{name}]', bench_training, (grid, episodes, repeat)))
+        scenarios.append((f'get_current_best_path[{name}]', bench_best_path, (grid, repeat)))
+        scenarios.append((f'get_valid_actions[{name}]', bench_valid_actions, (grid, repeat)))
+
+    for name in list(mazes)[:len(MAZES)]:
+        for encoding in ('json', 'packed'):
+            scenarios.append((f'train_api_serialization[{name},{encoding}]', bench_serialization,
+                              (mazes[name], 1000, encoding, repeat)))
+
+    if endpoints:
+        from django.test import Client
+
+        client = Client()
+        for name in list(mazes)[:len(MAZES)]:
+            scenarios.append((f'train_api_latency[{name}]', bench_endpoint,
+                              (client, mazes[name], 200 if quick else 1000, 5 if quick else 20)))
+    return scenarios
+
+
+def run_benchmarks(quick=False, endpoints=True, rounds=None, log=None):
+    """
+    Exécute tous les scénarios
+
+    La suite complète est exécutée rounds fois et chaque métrique garde sa
+    meilleure valeur : un ralentissement passager de la machine (autres
+    processus, fréquence du processeur) n'affecte qu'une partie des tours.
+
+    Args:
+        quick: Moins d'épisodes, de répétitions et un seul tour (vérification rapide)
+        endpoints: Inclure la latence de bout en bout (base de données de test requise)
+        rounds: Nombre de tours (défaut: 1 avec quick, 3 sinon)
+        log: Fonction appelée avec le nom de chaque scénario
+
+    Returns:
+        Dict {'meta': {...}, 'results': {scénario: {métrique: valeur}}}
+    """
+    rounds = rounds or (1 if quick else 3)
+    scenarios = _scenarios(quick, endpoints)
+    results = {}
+
+    for index in range(rounds):
+        for name, func, args in scenarios:
+            if log is not None:
+                log(f"[{index + 1}/{rounds}] {name}")
+            best = results.setdefault(name, {})
+            for metric, value in func(*args).items():
+                value = round(value, 3)
+                if metric not in best:
+                    best[metric] = value
+                elif METRICS[metric]:
+                    best[metric] = max(best[metric], value)
+                else:
+                    best[metric] = min(best[metric], value)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'quick': quick,
+            'rounds': rounds,
+            'date': time.strftime('%Y-%m-%d'),
+        },
+        'results': results,
+    }
+
+
+def compare(results, baseline, tolerance=0.3):
+    """
+    Compare des résultats à une référence
+
+    Returns:
+        Liste de (scénario, métrique, référence, valeur, variation relative)
+        pour les métriques dégradées de plus de tolerance
+    """
+    regressions = []
+    for name, metrics in results['results'].items():
+        reference = baseline['results'].get(name)
+        if not reference:
+            continue
+        for metric, value in metrics.items():
+            base = reference.get(metric)
+            if not base or metric not in METRICS:
+                continue
+            higher_is_better = METRICS[metric]
+            change = (value - base) / base
+            if (higher_is_better and change < -tolerance) or \
+                    (not higher_is_better and change > tolerance):
+                regressions.append((name, metric, base, value, change))
+    return regressions
@@ -0,0 +1,464 @@
+"""
+Module executor.py
+Exécuteur d'entraînements partagé par les vues (pool de processus)
+
+Les entraînements sont exécutés dans un ProcessPoolExecutor afin d'utiliser
+tous les cœurs de la machine sans bloquer le GIL du processus web. La file
+d'attente est bornée : au-delà de max_workers + max_pending jobs en cours,
+les soumissions sont refusées avec ExecutorBusy.
+
+Configuration (settings.py, toutes les clés sont optionnelles) :
+    TRAINING_EXECUTOR = {
+        'max_workers': 4,     # nombre de processus (défaut: nombre de cœurs)
+        'max_pending': 32,    # jobs en attente au-delà des workers occupés
+        'timeout': 30.0,      # délai maximum d'attente d'un résultat (s)
+        'mode': 'process',    # 'process' ou 'inline' (synchrone, pour les tests)
+        'start_method': 'forkserver',  # ou 'spawn' ('fork' est déconseillé, voir ci-dessous)
+    }
+
+Les processus du pool ne sont pas créés par fork : le processus web est
+multi-thread et un fork pourrait copier un verrou tenu par un autre thread
+(blocage du processus enfant). Ils démarrent avec forkserver (ou spawn si
+forkserver n'est pas disponible) et initialisent Django eux-mêmes (init_worker).
+
+Délai : au-delà de timeout, run() lève TrainingTimeout et le job est
+interrompu dans son processus (minuterie SIGALRM, voir _run_job) : la place
+du pool est libérée au lieu de continuer un calcul dont le résultat est perdu.
+Sans signal.setitimer (Windows), le délai n'est appliqué qu'à l'attente.
+
+Flux : submit_stream() exécute un générateur dans le pool et retourne un
+EventStream ; chaque événement produit est transmis au processus web par une
+file (multiprocessing.Manager) dès sa production.
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from rl_engine.cache import configure_cache
+from rl_engine.metrics import configure_metrics, get_registry
+
+QUEUE_WAIT = get_registry().histogram(
+    'training_queue_wait_seconds', "Attente d'un entraînement dans la file de l'exécuteur")
+EXECUTOR_REJECTED = get_registry().counter(
+    'executor_rejected', "Entraînements refusés (file de l'exécuteur pleine)")
+
+
+class ExecutorBusy(Exception):
+    """La file d'attente des entraînements est pleine"""
+
+
+class TrainingTimeout(Exception):
+    """L'entraînement n'a pas terminé dans le délai imparti"""
+
+
+class StreamCancelled(Exception):
+    """Le flux a été fermé : l'entraînement s'arrête à la fin de l'épisode en cours"""
+
+
+class EventStream:
+    """
+    Événements d'un job de submit_stream(), lus au fil de sa progression
+
+    Itérable (une seule fois), de façon synchrone ou asynchrone (async for) :
+    chaque élément est un événement produit par le générateur du job. Une exception du job (ex. TrainingTimeout) est levée
+    par l'itération. close() arrête le job (ex. client déconnecté).
+    """
+
+    # Intervalle de vérification de l'état du job quand aucun événement n'arrive (s)
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, future, events, cancelled):
+        self.future = future
+        self._events = events
+        self._cancelled = cancelled
+
+    def get(self, timeout=None):
+        """
+        Prochain événement, ou _STREAM_END à la fin du job
+
+        Raises:
+            queue.Empty: si aucun événement n'arrive dans le délai
+            Exception: l'exception du job, s'il a échoué
+        """
+        try:
+            event = self._events.get(timeout=timeout)
+        except queue.Empty:
+            if not self.future.done():
+                raise
+            # Job terminé sans fin de flux (annulé en file, délai dépassé avant le démarrage, ...)
+            event = _STREAM_END
+        if event is _STREAM_END or event is None:
+            self.future.result()
+            return _STREAM_END
+        return event
+
+    def __iter__(self):
+        while True:
+            try:
+                event = self.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if event is _STREAM_END:
+                return
+            yield event
+
+    async def __aiter__(self):
+        # La lecture de la file est bloquante : elle s'effectue dans un thread
+        while True:
+            try:
+                event = await asyncio.to_thread(self.get, self.POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if event is _STREAM_END:
+                return
+            yield event
+
+    def close(self):
+        """Demande l'arrêt du job (annulé s'il n'a pas démarré)"""
+        self._cancelled.set()
+        self.future.cancel()
+
+
+# Fin d'un flux (None dans la file : le générateur du job ne produit jamais None)
+_STREAM_END = object()
+
+
+def default_start_method():
+    """Méthode de démarrage des processus du pool : forkserver si disponible, sinon spawn"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return 'forkserver'
+    return 'spawn'
+
+
+class TrainingExecutor:
+    """
+    Pool de processus avec file bornée, délai par job et annulation
+
+    En cas de dépassement du délai, un job encore en file est annulé ; un job
+    démarré est interrompu dans son processus à l'échéance (voir _run_job).
+    """
+
+    def __init__(self, max_workers=None, max_pending=32, timeout=30.0, mode='process',
+                 initializer=None, initargs=(), start_method=None):
+        if mode not in ('process', 'inline'):
+            raise ValueError(f"Mode d'exécution inconnu: {mode}")
+        start_method = start_method or default_start_method()
+        if start_method not in multiprocessing.get_all_start_methods():
+            raise ValueError(f"Méthode de démarrage inconnue: {start_method}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.mode = mode
+        self.initializer = initializer
+        self.initargs = initargs
+        self.start_method = start_method
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._pool = None
+        self._manager = None
+
+    @property
+    def in_flight(self):
+        """Nombre de jobs soumis et non terminés"""
+        return self._in_flight
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=self.initializer,
+                    initargs=self.initargs,
+                )
+            return self._pool
+
+    def _get_manager(self):
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context(self.start_method).Manager()
+            return self._manager
+
+    def _discard_broken_pool(self):
+        with self._lock:
+            pool = self._pool
+            if pool is not None and pool._broken:
+                self._pool = None
+            else:
+                pool = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """
+        Soumet un job sans délai, sans attendre son résultat
+
+        Raises:
+            ExecutorBusy: si la file d'attente est pleine
+        """
+        return self._submit(func, args, kwargs)
+
+    def submit_with_timeout(self, func, *args, timeout=None, **kwargs) -> Future:
+        """
+        Soumet un job interrompu s'il n'est pas terminé timeout secondes après la soumission
+
+        Le résultat s'attend avec wait() / wait_async().
+
+        Raises:
+            ExecutorBusy: si la file d'attente est pleine
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        return self._submit(func, args, kwargs, deadline=time.time() + timeout)
+
+    def _submit(self, func, args, kwargs, deadline=None) -> Future:
+        if not self._slots.acquire(blocking=False):
+            EXECUTOR_REJECTED.inc()
+            raise ExecutorBusy("Trop d'entraînements en cours, réessayez plus tard")
+        with self._lock:
+            self._in_flight += 1
+
+        # Horloge murale : l'attente est mesurée dans le processus qui exécute le job
+        submitted_at = time.time()
+        if self.mode == 'inline':
+            future = Future()
+            try:
+                future.set_result(_run_job(func, submitted_at, deadline, args, kwargs))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            try:
+                try:
+                    future = self._get_pool().submit(_run_job, func, submitted_at, deadline,
+                                                     args, kwargs)
+                except BrokenProcessPool:
+                    # Un processus de travail s'est arrêté brutalement : le pool est recréé
+                    self._discard_broken_pool()
+                    future = self._get_pool().submit(_run_job, func, submitted_at, deadline,
+                                                     args, kwargs)
+            except Exception:
+                self._release(None)
+                raise
+        future.add_done_callback(self._release)
+        return future
+
+    def submit_stream(self, func, *args, timeout=None, **kwargs) -> EventStream:
+        """
+        Soumet un générateur, dont les événements sont lus au fil de l'eau
+
+        Le générateur func(*args, on_episode=..., **kwargs) s'exécute dans le
+        pool, interrompu comme submit_with_timeout() à l'échéance ; il s'arrête
+        aussi à la fin de l'épisode en cours si le flux est fermé (voir _run_stream).
+
+        Raises:
+            ExecutorBusy: si la file d'attente est pleine
+        """
+        if self.mode == 'inline':
+            events, cancelled = queue.Queue(), threading.Event()
+        else:
+            manager = self._get_manager()
+            events, cancelled = manager.Queue(), manager.Event()
+        future = self.submit_with_timeout(_run_stream, func, events, cancelled, args, kwargs,
+                                          timeout=timeout)
+        return EventStream(future, events, cancelled)
+
+    def run(self, func, *args, timeout=None, **kwargs):
+        """
+        Soumet un job et attend son résultat
+
+        Raises:
+            ExecutorBusy: si la file d'attente est pleine
+            TrainingTimeout: si le job dépasse le délai
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        future = self.submit_with_timeout(func, *args, timeout=timeout, **kwargs)
+        return self.wait(future, timeout)
+
+    def wait(self, future, timeout=None):
+        """
+        Attend le résultat d'un job soumis
+
+        Raises:
+            TrainingTimeout: si le job dépasse le délai
+        """
+        try:
+            return future.result(timeout=timeout if timeout is not None else self.timeout)
+        except TimeoutError:
+            self.cancel(future)
+            raise TrainingTimeout("L'entraînement a dépassé le délai autorisé")
+
+    async def run_async(self, func, *args, timeout=None, **kwargs):
+        """
+        Version asynchrone de run() pour les vues ASGI
+
+        Le job s'exécute dans le pool ; la coroutine attend son résultat sans
+        occuper de thread, l'attente ne bloque pas la boucle d'événements.
+
+        Raises:
+            ExecutorBusy: si la file d'attente est pleine
+            TrainingTimeout: si le job dépasse le délai
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        future = self.submit_with_timeout(func, *args, timeout=timeout, **kwargs)
+        return await self.wait_async(future, timeout)
+
+    async def wait_async(self, future, timeout=None):
+        """Version asynchrone de wait()"""
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout if timeout is not None else self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.cancel(future)
+            raise TrainingTimeout("L'entraînement a dépassé le délai autorisé")
+
+    def cancel(self, future):
+        """Annule un job s'il n'a pas encore démarré"""
+        return future.cancel()
+
+    def shutdown(self, wait=True):
+        """Arrête le pool de processus"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            manager, self._manager = self._manager, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
+
+
+def _on_deadline(signum, frame):
+    raise TrainingTimeout("L'entraînement a dépassé le délai autorisé")
+
+
+def _run_job(func, submitted_at, deadline, args, kwargs):
+    """
+    Exécute un job en mesurant son attente dans la file
+
+    Si deadline (horodatage) est fourni, le job est interrompu à l'échéance
+    par TrainingTimeout (minuterie SIGALRM du processus) : un job dont le
+    demandeur a abandonné l'attente ne garde pas sa place dans le pool.
+    """
+    now = time.time()
+    QUEUE_WAIT.observe(max(now - submitted_at, 0.0))
+    alarm = deadline is not None and hasattr(signal, 'setitimer') and \
+        threading.current_thread() is threading.main_thread()
+    if deadline is not None and now >= deadline:
+        raise TrainingTimeout("L'entraînement a dépassé le délai autorisé")
+    if alarm:
+        previous = signal.signal(signal.SIGALRM, _on_deadline)
+        signal.setitimer(signal.ITIMER_REAL, deadline - now)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        # Les métriques du job sont visibles dès sa fin, quel que soit le processus
+        get_registry().flush()
+
+
+def _run_stream(func, events, cancelled, args, kwargs):
+    """
+    Transmet les événements du générateur func dans events, jusqu'à la fin ou l'annulation
+
+    func reçoit un callback on_episode qui interrompt l'entraînement dès que le
+    flux est fermé, même si aucun événement n'est produit (ex. history='best_changes').
+    L'état du flux est relu au plus toutes les EventStream.POLL_INTERVAL secondes
+    (cancelled est un objet partagé entre processus : chaque lecture est un échange).
+    """
+    last_check = None
+
+    def on_episode(episode):
+        nonlocal last_check
+        now = time.monotonic()
+        if last_check is not None and now - last_check < EventStream.POLL_INTERVAL:
+            return
+        last_check = now
+        if cancelled.is_set():
+            raise StreamCancelled()
+
+    try:
+        for event in func(*args, on_episode=on_episode, **kwargs):
+            if cancelled.is_set():
+                break
+            events.put(event)
+    except StreamCancelled:
+        pass
+    finally:
+        events.put(None)
+
+
+def init_worker(cache_maxsize=128, cache_directory=None, metrics_path=None,
+                metrics_flush_interval=1.0, warmup_path=None, database_names=None):
+    """
+    Initialise un processus du pool : Django (accès à la base), cache de résultats et métriques
+
+    Le cache est rempli avec les résultats précalculés de warmup_path (voir warmup.py).
+    database_names ({alias: NAME}) reprend les bases du processus parent : un
+    processus démarré sans fork relit settings.py et ne verrait pas, par
+    exemple, la base de test créée par le parent.
+    """
+    import django
+    from django.apps import apps
+    from django.db import connections
+
+    for alias, name in (database_names or {}).items():
+        settings.DATABASES[alias]['NAME'] = name
+    if not apps.ready:
+        django.setup()
+    # Les connexions héritées du processus parent ne doivent pas être partagées
+    connections.close_all()
+    configure_cache(cache_maxsize, cache_directory)
+    configure_metrics(metrics_path, metrics_flush_interval)
+    if warmup_path:
+        from .warmup import load_warmup
+        load_warmup(warmup_path)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _database_names():
+    """Noms des bases utilisées par ce processus, transmis aux processus du pool"""
+    from django.db import connections
+    return {alias: str(connections[alias].settings_dict['NAME']) for alias in connections}
+
+
+def get_executor():
+    """Retourne l'exécuteur partagé du processus, créé à la première utilisation"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            config = getattr(settings, 'TRAINING_EXECUTOR', {})
+            cache_config = getattr(settings, 'TRAINING_CACHE', {})
+            metrics_config = getattr(settings, 'TRAINING_METRICS', {})
+            warmup_config = getattr(settings, 'TRAINING_WARMUP', {})
+            warmup_path = warmup_config.get('path') if warmup_config.get('enabled') else None
+            # Chaque processus du pool configure Django, son propre cache de résultats et ses métriques
+            _executor = TrainingExecutor(
+                initializer=init_worker,
+                initargs=(cache_config.get('maxsize', 128), cache_config.get('directory'),
+                          metrics_config.get('path'), metrics_config.get('flush_interval', 1.0),
+                          warmup_path, _database_names()),
+                **config
+            )
+            atexit.register(_executor.shutdown, False)
+        return _executor
@@ -0,0 +1,209 @@
+"""
+Module jobs.py
+Entraînements asynchrones : soumission, exécution en arrière-plan, annulation
+
+Un job est enregistré dans la base (modèle TrainingJob) puis exécuté par
+l'exécuteur partagé (appgamme/executor.py). Le processus de travail met à
+jour l'avancement et son signe de vie (heartbeat_at) dans la base au plus
+toutes les PROGRESS_INTERVAL secondes, à la fin d'un épisode quelle que soit
+la politique d'historique, et s'arrête si le job a été annulé entre-temps.
+Deux soumissions identiques (même grille, mêmes paramètres) pendant qu'un job
+est en attente ou en cours renvoient le même job : une contrainte d'unicité
+sur les jobs actifs rend la déduplication sûre entre requêtes concurrentes.
+
+Un job en cours sans signe de vie depuis HEARTBEAT_TIMEOUT secondes (processus
+de travail arrêté brutalement) ou en attente depuis QUEUED_TIMEOUT secondes
+(processus web redémarré) est marqué en échec par expire_stale_jobs.
+"""
+
+import threading
+import time
+from datetime import timedelta
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from rl_engine.cache import make_key
+from rl_engine.q_learner import stream_live_updates
+
+from .executor import get_executor
+from .models import TrainingJob
+from .qstore import prepare_params, storing_callback
+
+# Intervalle minimum entre deux écritures de l'avancement (secondes)
+PROGRESS_INTERVAL = 0.5
+
+# Délai sans signe de vie au-delà duquel un job en cours est en échec (secondes)
+HEARTBEAT_TIMEOUT = 30
+
+# Délai d'attente au-delà duquel un job jamais démarré est en échec (secondes)
+QUEUED_TIMEOUT = 600
+
+# Tentatives de création d'un job (un job identique peut se terminer entre-temps)
+CREATE_ATTEMPTS = 3
+
+# Futures des jobs soumis par ce processus (pour annuler ceux encore en file)
+_futures = {}
+_futures_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Levée dans le processus de travail quand le job a été annulé"""
+
+
+def expire_stale_jobs(**filters):
+    """
+    Marque en échec les jobs dont le processus ne donne plus signe de vie
+
+    Args:
+        **filters: Restreint la vérification (ex. pk=job_id)
+
+    Returns:
+        Nombre de jobs marqués en échec
+    """
+    now = timezone.now()
+    jobs = TrainingJob.objects.filter(**filters)
+    expired = jobs.filter(
+        status=TrainingJob.RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=HEARTBEAT_TIMEOUT),
+    ).update(status=TrainingJob.FAILED, error='Processus de travail interrompu')
+    expired += jobs.filter(
+        status=TrainingJob.QUEUED,
+        created_at__lt=now - timedelta(seconds=QUEUED_TIMEOUT),
+    ).update(status=TrainingJob.FAILED, error="Job jamais démarré")
+    return expired
+
+
+def _get_or_create_job(key, params):
+    """Job actif de même empreinte, ou nouveau job : tuple (job, created)"""
+    for _ in range(CREATE_ATTEMPTS):
+        existing = (TrainingJob.objects
+                    .filter(key=key, status__in=TrainingJob.ACTIVE_STATUSES)
+                    .first())
+        if existing:
+            return existing, False
+        try:
+            with transaction.atomic():
+                job = TrainingJob.objects.create(
+                    key=key,
+                    params=params,
+                    episodes_total=params['episodes'],
+                )
+            return job, True
+        except IntegrityError:
+            # Job identique créé par une requête concurrente : il est relu
+            continue
+    raise IntegrityError(f"Impossible de créer le job {key}")
+
+
+def submit_job(params, on_finish=None):
+    """
+    Crée (ou retrouve) un job et le soumet à l'exécuteur
+
+    Args:
+        params: Paramètres de stream_live_updates (grid, episodes, alpha, ...)
+        on_finish: Appelé sans argument quand le job est terminé dans ce processus
+
+    Returns:
+        Tuple (job, deduplicated)
+
+    Raises:
+        ExecutorBusy: si la file de l'exécuteur est pleine (le job est alors annulé)
+    """
+    key = make_key('job', params['grid'], **{k: v for k, v in params.items() if k != 'grid'})
+
+    expire_stale_jobs(key=key)
+    job, created = _get_or_create_job(key, params)
+    if not created:
+        return job, True
+
+    try:
+        future = get_executor().submit(run_job, str(job.id))
+    except Exception as e:
+        TrainingJob.objects.filter(pk=job.pk).update(status=TrainingJob.CANCELLED, error=str(e))
+        raise
+
+    with _futures_lock:
+        _futures[str(job.id)] = future
+
+    def finished(_future):
+        with _futures_lock:
+            _futures.pop(str(job.id), None)
+        if not _future.cancelled() and _future.exception() is not None:
+            # Processus de travail arrêté (ex. BrokenProcessPool) : run_job n'a rien enregistré
+            TrainingJob.objects.filter(pk=job.pk, status__in=TrainingJob.ACTIVE_STATUSES).update(
+                status=TrainingJob.FAILED,
+                error=str(_future.exception()) or type(_future.exception()).__name__,
+            )
+        if on_finish is not None:
+            on_finish()
+
+    future.add_done_callback(finished)
+    return job, False
+
+
+def cancel_job(job):
+    """Annule un job en attente ou en cours (sans effet s'il est terminé)"""
+    updated = (TrainingJob.objects
+               .filter(pk=job.pk, status__in=TrainingJob.ACTIVE_STATUSES)
+               .update(status=TrainingJob.CANCELLED))
+    with _futures_lock:
+        future = _futures.get(str(job.pk))
+    if future is not None:
+        future.cancel()
+    return bool(updated)
+
+
+def run_job(job_id):
+    """Exécute un job (appelé dans un processus de l'exécuteur)"""
+    close_old_connections()
+    started = (TrainingJob.objects
+               .filter(pk=job_id, status=TrainingJob.QUEUED)
+               .update(status=TrainingJob.RUNNING, heartbeat_at=timezone.now()))
+    if not started:
+        # Annulé (ou expiré) avant de démarrer
+        return
+
+    job = TrainingJob.objects.get(pk=job_id)
+    history = []
+    last_update = time.monotonic()
+
+    def on_episode(episode):
+        nonlocal last_update
+        now = time.monotonic()
+        if now - last_update < PROGRESS_INTERVAL:
+            return
+        last_update = now
+        # L'annulation est détectée à la mise à jour de l'avancement
+        if not (TrainingJob.objects
+                .filter(pk=job_id, status=TrainingJob.RUNNING)
+                .update(episodes_done=episode + 1, heartbeat_at=timezone.now())):
+            raise JobCancelled(job_id)
+
+    try:
+        params, base_episodes = prepare_params(job.params)
+        on_finish = storing_callback(params, base_episodes)
+        for event in stream_live_updates(**params, on_finish=on_finish, on_episode=on_episode):
+            if event['type'] == 'episode':
+                history.append(event['data'])
+            else:
+                result = {
+                    'history': history,
+                    'final_path': event['final_path'],
+                    'total_episodes': event['total_episodes'],
+                    'converged_episode': event['converged_episode'],
+                }
+                TrainingJob.objects.filter(pk=job_id, status=TrainingJob.RUNNING).update(
+                    status=TrainingJob.DONE,
+                    episodes_done=event['total_episodes'],
+                    result=result,
+                )
+    except JobCancelled:
+        pass
+    except Exception as e:
+        TrainingJob.objects.filter(pk=job_id, status=TrainingJob.RUNNING).update(
+            status=TrainingJob.FAILED,
+            error=str(e),
+        )
+    finally:
+        close_old_connections()
@@ -0,0 +1,119 @@
+"""
+Commande manage.py benchmark
+Mesure les performances et les compare à la référence enregistrée
+
+Exemples :
+    python manage.py benchmark                  # mesure et compare à benchmarks/baseline.json
+    python manage.py benchmark --quick          # vérification rapide
+    python manage.py benchmark --save-baseline  # remplace la référence
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+)
+
+from appgamme.benchmarks import compare, run_benchmarks
+from appgamme.metrics import process_local_metrics
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+
+
+class Command(BaseCommand):
+    help = "Mesure les performances du moteur RL et des API et détecte les régressions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quick', action='store_true',
+                            help="Moins d'épisodes et de répétitions")
+        parser.add_argument('--rounds', type=int,
+                            help="Nombre de tours de la suite (défaut: 1 avec --quick, 3 sinon)")
+        parser.add_argument('--no-endpoints', action='store_true',
+                            help="Ne mesure pas la latence de bout en bout de /api/train/")
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE),
+                            help="Fichier de référence (JSON)")
+        parser.add_argument('--save-baseline', action='store_true',
+                            help="Enregistre les résultats comme nouvelle référence")
+        parser.add_argument('--tolerance', type=float, default=0.3,
+                            help="Dégradation relative tolérée (défaut: 0.3)")
+        parser.add_argument('--output', help="Enregistre aussi les résultats dans ce fichier")
+
+    def handle(self, *args, **options):
+        endpoints = not options['no_endpoints']
+        log = lambda name: self.stderr.write(f"  {name}")
+
+        # Les entraînements mesurés n'alimentent pas les métriques du serveur
+        with process_local_metrics():
+            if endpoints:
+                results = self._run_with_test_database(options['quick'], options['rounds'], log)
+            else:
+                results = run_benchmarks(quick=options['quick'], endpoints=False,
+                                         rounds=options['rounds'], log=log)
+
+        self._print_results(results)
+        if options['output']:
+            self._write(options['output'], results)
+
+        baseline_path = options['baseline']
+        if options['save_baseline']:
+            self._write(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f"Référence enregistrée: {baseline_path}"))
+            return
+
+        if not os.path.exists(baseline_path):
+            self.stdout.write(self.style.WARNING(
+                f"Aucune référence ({baseline_path}), relancer avec --save-baseline"))
+            return
+
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('quick') != options['quick']:
+            self.stdout.write(self.style.WARNING(
+                "La référence n'a pas été mesurée avec les mêmes options (--quick)"))
+
+        regressions = compare(results, baseline, options['tolerance'])
+        if regressions:
+            for name, metric, base, value, change in regressions:
+                self.stdout.write(self.style.ERROR(
+                    f"{name} {metric}: {base} -> {value} ({change:+.0%})"))
+            raise CommandError(f"{len(regressions)} régression(s) au-delà de "
+                               f"{options['tolerance']:.0%}")
+        self.stdout.write(self.style.SUCCESS("Aucune régression"))
+
+    def _run_with_test_database(self, quick, rounds, log):
+        """Exécute les mesures sur une base de test (les entraînements enregistrent les Q-tables)"""
+        # Base de test dans un fichier : les processus de l'exécuteur doivent la partager
+        test_dir = tempfile.TemporaryDirectory()
+        for connection in connections.all():
+            if connection.vendor == 'sqlite':
+                connection.settings_dict['TEST']['NAME'] = os.path.join(
+                    test_dir.name, f'benchmark_{connection.alias}.sqlite3')
+
+        # Environnement de test : ALLOWED_HOSTS accepte l'hôte du client de test
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            return run_benchmarks(quick=quick, endpoints=True, rounds=rounds, log=log)
+        finally:
+            from appgamme.executor import get_executor
+            get_executor().shutdown()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            test_dir.cleanup()
+
+    def _print_results(self, results):
+        for name, metrics in results['results'].items():
+            values = ', '.join(f"{metric}={value}" for metric, value in metrics.items())
+            self.stdout.write(f"{name}: {values}")
+
+    def _write(self, path, results):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
@@ -0,0 +1,38 @@
+"""
+Commande manage.py warmup
+Compile les labyrinthes prédéfinis et précalcule les résultats des pages (voir appgamme/warmup.py)
+
+À exécuter au déploiement : les processus qui démarrent ensuite chargent le
+fichier au lieu de recalculer les résultats.
+
+Exemples :
+    python manage.py warmup                     # recalcule settings.TRAINING_WARMUP['path']
+    python manage.py warmup --path /tmp/w.pkl   # autre fichier
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from appgamme.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Compile les labyrinthes prédéfinis et précalcule les résultats des pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help="Fichier des résultats (défaut: TRAINING_WARMUP['path'])")
+        parser.add_argument('--if-stale', action='store_true',
+                            help="Ne recalcule pas si le fichier est à jour")
+
+    def handle(self, *args, **options):
+        path = options['path'] or getattr(settings, 'TRAINING_WARMUP', {}).get('path')
+        if not path:
+            raise CommandError("Aucun fichier de résultats (--path ou TRAINING_WARMUP['path'])")
+
+        stats = warm_up(path, rebuild=not options['if_stale'])
+        if not stats['loaded'] and not stats['saved']:
+            raise CommandError(f"Impossible d'écrire le fichier de résultats: {path}")
+        origin = "chargés" if stats['loaded'] else "calculés"
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['mazes']} labyrinthes compilés, {stats['results']} résultats {origin} "
+            f"en {stats['elapsed_ms']} ms: {path}"))
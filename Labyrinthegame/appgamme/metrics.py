@@ -0,0 +1,90 @@
+"""
+Module metrics.py
+Métriques des vues (requêtes, latence, taille des réponses) et de la file d'entraînement
+
+Les vues décorées par instrument_view alimentent :
+    labyrinthe_http_requests_total{view, status}
+    labyrinthe_http_request_duration_seconds{view}   (histogramme)
+    labyrinthe_http_response_bytes{view}             (histogramme)
+Les métriques du moteur (entraînements, épisodes, pas, durée) sont définies
+dans rl_engine/q_learner.py, celles de la file dans appgamme/executor.py.
+Toutes sont servies par views.metrics_view (format texte de Prometheus).
+"""
+
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from rl_engine.metrics import SIZE_BUCKETS, configure_metrics, get_registry
+
+from .admission import get_admission_controller
+from .executor import get_executor
+
+REQUESTS = get_registry().counter(
+    'http_requests', "Requêtes traitées par vue", ('view', 'status'))
+REQUEST_DURATION = get_registry().histogram(
+    'http_request_duration_seconds', "Durée de traitement des requêtes par vue", ('view',))
+RESPONSE_BYTES = get_registry().histogram(
+    'http_response_bytes', "Taille des réponses par vue", ('view',), buckets=SIZE_BUCKETS)
+
+get_registry().gauge('training_in_flight', "Entraînements soumis à l'exécuteur et non terminés",
+                     lambda: get_executor().in_flight)
+get_registry().gauge('training_admitted', "Entraînements admis en cours (contrôle d'admission)",
+                     lambda: get_admission_controller().in_flight)
+
+
+def _observe(name, response, started):
+    REQUEST_DURATION.observe(time.perf_counter() - started, view=name)
+    REQUESTS.inc(view=name, status=response.status_code)
+    # Les réponses en flux n'ont pas de taille connue à la fin de la vue
+    if not response.streaming:
+        RESPONSE_BYTES.observe(len(response.content), view=name)
+
+
+def instrument_view(name):
+    """Décorateur mesurant une vue (synchrone ou asynchrone) sous le nom name"""
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                started = time.perf_counter()
+                response = await view(request, *args, **kwargs)
+                _observe(name, response, started)
+                return response
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            started = time.perf_counter()
+            response = view(request, *args, **kwargs)
+            _observe(name, response, started)
+            return response
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def process_local_metrics():
+    """
+    Métriques propres au processus pendant le bloc (tests, manage.py benchmark)
+
+    Le fichier partagé de TRAINING_METRICS n'est ni lu ni modifié : les
+    processus de l'exécuteur créés pendant le bloc reçoivent aussi path=None.
+    Le bloc part de zéro (les valeurs en attente sont d'abord ajoutées au
+    fichier) et ses valeurs sont abandonnées à la sortie.
+    """
+    from django.test.utils import override_settings
+
+    config = getattr(settings, 'TRAINING_METRICS', {})
+    local_config = dict(config, path=None)
+    with override_settings(TRAINING_METRICS=local_config):
+        registry = configure_metrics(**local_config)
+        registry.reset()
+        try:
+            yield registry
+        finally:
+            registry.reset()
+            configure_metrics(**config)
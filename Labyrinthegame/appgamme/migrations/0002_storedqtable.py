@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appgamme', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredQTable',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('maze_hash', models.CharField(max_length=64)),
+                ('gamma', models.FloatField()),
+                ('rows', models.PositiveIntegerField()),
+                ('cols', models.PositiveIntegerField()),
+                ('q_values', models.BinaryField()),
+                ('policy', models.BinaryField()),
+                ('final_path', models.JSONField(default=list)),
+                ('episodes_trained', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='storedqtable',
+            constraint=models.UniqueConstraint(fields=('maze_hash', 'gamma'), name='unique_qtable_per_maze'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+
+def cancel_duplicate_active_jobs(apps, schema_editor):
+    """Annule les doublons actifs (même clé) créés avant la contrainte, sauf le plus ancien"""
+    TrainingJob = apps.get_model('appgamme', 'TrainingJob')
+    active = TrainingJob.objects.filter(status__in=['queued', 'running']).order_by('created_at')
+    seen = set()
+    for job in active:
+        if job.key in seen:
+            TrainingJob.objects.filter(pk=job.pk).update(status='cancelled')
+        seen.add(job.key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appgamme', '0002_storedqtable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(cancel_duplicate_active_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='trainingjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('key',), name='unique_active_job'),
+        ),
+    ]
@@ -1,3 +1,90 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+
+class TrainingJob(models.Model):
+    """Entraînement exécuté en arrière-plan, suivi par son identifiant"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (QUEUED, 'En attente'),
+        (RUNNING, 'En cours'),
+        (DONE, 'Terminé'),
+        (FAILED, 'Échec'),
+        (CANCELLED, 'Annulé'),
+    ]
+    # Statuts d'un job pas encore terminé (dédupliqué si identique)
+    ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Empreinte canonique (grille + paramètres) pour dédupliquer les jobs identiques
+    key = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    params = models.JSONField()
+    episodes_total = models.PositiveIntegerField()
+    episodes_done = models.PositiveIntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Dernier signe de vie du processus de travail (job en cours, voir jobs.py)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            # Un seul job actif par empreinte : la déduplication ne dépend pas d'une course
+            models.UniqueConstraint(
+                fields=['key'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='unique_active_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.id} ({self.status})'
+
+    @property
+    def progress(self):
+        """Avancement entre 0 et 1"""
+        if self.status == self.DONE:
+            return 1.0
+        if not self.episodes_total:
+            return 0.0
+        return min(1.0, self.episodes_done / self.episodes_total)
+
+
+class StoredQTable(models.Model):
+    """
+    Q-table et politique apprises pour un labyrinthe, réutilisées pour reprendre
+    l'entraînement (warm start) au lieu de repartir de zéro
+
+    Une table par labyrinthe (empreinte de la grille) et par gamma : les
+    récompenses étant fixes, alpha et epsilon ne changent pas la limite apprise.
+    """
+
+    maze_hash = models.CharField(max_length=64)
+    gamma = models.FloatField()
+    rows = models.PositiveIntegerField()
+    cols = models.PositiveIntegerField()
+    # Tableau float64 little-endian de forme (rows * cols, 4), indexé par r * cols + c
+    q_values = models.BinaryField()
+    # Action gloutonne (uint8) de chaque case, 255 pour les murs et cases sans action
+    policy = models.BinaryField()
+    final_path = models.JSONField(default=list)
+    # Épisodes cumulés ayant produit la table (reprises comprises)
+    episodes_trained = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['maze_hash', 'gamma'], name='unique_qtable_per_maze'),
+        ]
+
+    def __str__(self):
+        return f'{self.maze_hash[:12]} {self.rows}x{self.cols} gamma={self.gamma}'
@@ -0,0 +1,161 @@
+"""
+Module qstore.py
+Stockage persistant des Q-tables apprises et reprise d'entraînement (warm start)
+
+Après chaque entraînement des API, la Q-table et la politique gloutonne sont
+enregistrées (modèle StoredQTable) sous l'empreinte de la grille et gamma.
+Une requête avec "warm_start": true initialise l'agent depuis la table
+enregistrée : un labyrinthe déjà vu converge alors en quelques épisodes.
+Une table n'est remplacée que par une table issue d'au moins autant
+d'épisodes cumulés, pour ne pas écraser un apprentissage plus long.
+L'enregistrement est facultatif : une erreur de la base (ex. « database is
+locked » sous SQLite) est journalisée sans faire échouer l'entraînement.
+"""
+
+import logging
+
+import numpy as np
+from django.db import DatabaseError, close_old_connections
+
+from rl_engine.cache import maze_hash
+from rl_engine.maze import CompiledMaze
+from rl_engine.q_learner import stream_live_updates, train_with_live_updates
+from rl_engine.q_table import q_table_to_array
+
+from .models import StoredQTable
+
+# Action de la politique pour les murs, G et les cases sans action valide
+NO_ACTION = 255
+
+logger = logging.getLogger(__name__)
+
+
+def find_q_table(grid, gamma):
+    """Retourne la table enregistrée pour la grille et gamma, ou None"""
+    return StoredQTable.objects.filter(maze_hash=maze_hash(grid), gamma=gamma).first()
+
+
+def stored_values(stored):
+    """Q-valeurs d'une table enregistrée, tableau (rows * cols, 4)"""
+    return np.frombuffer(bytes(stored.q_values), dtype='<f8').reshape(-1, 4).copy()
+
+
+def stored_policy(stored):
+    """Action gloutonne de chaque case (NO_ACTION si aucune), tableau uint8"""
+    return np.frombuffer(bytes(stored.policy), dtype=np.uint8).copy()
+
+
+def save_q_table(grid, gamma, q_table, final_path, episodes, base_episodes=0):
+    """
+    Enregistre une Q-table et sa politique gloutonne
+
+    Args:
+        q_table: dict {(r, c): valeurs}, ArrayQTable ou tableau (rows * cols, 4)
+        final_path: Chemin glouton final
+        episodes: Épisodes de cet entraînement
+        base_episodes: Épisodes cumulés de la table reprise (0 sans reprise)
+
+    Returns:
+        La table enregistrée, ou None si la table existante est issue de plus d'épisodes
+    """
+    env = CompiledMaze(grid)
+    values = q_table_to_array(q_table, env.rows, env.cols).astype('<f8')
+    policy = np.where(env.valid_mask, values, -np.inf).argmax(axis=1).astype(np.uint8)
+    policy[~env.valid_mask.any(axis=1) | env.walls | env.goal_mask] = NO_ACTION
+
+    total = base_episodes + episodes
+    key = maze_hash(grid)
+    existing = StoredQTable.objects.filter(maze_hash=key, gamma=gamma).first()
+    if existing is not None and existing.episodes_trained > total:
+        return None
+
+    stored, _ = StoredQTable.objects.update_or_create(
+        maze_hash=key,
+        gamma=gamma,
+        defaults={
+            'rows': env.rows,
+            'cols': env.cols,
+            'q_values': values.tobytes(),
+            'policy': policy.tobytes(),
+            'final_path': [list(cell) for cell in final_path],
+            'episodes_trained': total,
+        },
+    )
+    return stored
+
+
+def try_save_q_table(grid, gamma, q_table, final_path, episodes, base_episodes=0):
+    """
+    save_q_table sans échec : une erreur de la base est journalisée
+
+    Returns:
+        La table enregistrée, ou None (table existante plus entraînée ou erreur)
+    """
+    try:
+        return save_q_table(grid, gamma, q_table, final_path, episodes, base_episodes)
+    except DatabaseError:
+        logger.warning("Q-table non enregistrée (maze_hash=%s, gamma=%s)",
+                       maze_hash(grid), gamma, exc_info=True)
+        return None
+
+
+def prepare_params(params):
+    """
+    Remplace l'option warm_start (booléen) des paramètres d'API par la Q-table enregistrée
+
+    Returns:
+        Tuple (params pour rl_engine, épisodes cumulés de la table reprise)
+    """
+    params = dict(params)
+    stored = find_q_table(params['grid'], params['gamma']) if params.pop('warm_start', False) else None
+    if stored is None:
+        params['warm_start'] = None
+        return params, 0
+    params['warm_start'] = stored_values(stored)
+    return params, stored.episodes_trained
+
+
+def storing_callback(params, base_episodes):
+    """Callback on_finish de stream_live_updates qui enregistre la Q-table"""
+    def on_finish(agent, final_path, total_episodes):
+        try_save_q_table(params['grid'], params['gamma'], agent.q_table, final_path,
+                         total_episodes, base_episodes)
+    return on_finish
+
+
+def train_and_store(**params):
+    """
+    train_with_live_updates avec reprise et enregistrement de la Q-table
+
+    Exécuté par l'exécuteur (processus du pool) pour train_api. Un résultat
+    lu dans le cache n'est pas enregistré : sa Q-table l'a été lors du calcul.
+    """
+    close_old_connections()
+    try:
+        params, base_episodes = prepare_params(params)
+        result = train_with_live_updates(**params)
+        if result.get('cached'):
+            return result
+        converged_episode = result['converged_episode']
+        episodes = params['episodes'] if converged_episode is None else converged_episode + 1
+        try_save_q_table(params['grid'], params['gamma'], result['q_table'],
+                         result['final_path'], episodes, base_episodes)
+        return result
+    finally:
+        close_old_connections()
+
+
+def stream_and_store(on_episode=None, **params):
+    """
+    stream_live_updates avec reprise et enregistrement de la Q-table
+
+    Générateur exécuté par l'exécuteur (processus du pool) pour train_stream_api ;
+    on_episode est transmis à stream_live_updates (arrêt si le flux est fermé).
+    """
+    close_old_connections()
+    try:
+        params, base_episodes = prepare_params(params)
+        yield from stream_live_updates(**params, on_finish=storing_callback(params, base_episodes),
+                                       on_episode=on_episode)
+    finally:
+        close_old_connections()
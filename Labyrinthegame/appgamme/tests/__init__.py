@@ -0,0 +1,24 @@
+from appgamme import executor
+from appgamme.executor import TrainingExecutor
+
+
+def start_position(grid):
+    """Position de S dans la grille"""
+    for r, row in enumerate(grid):
+        if 'S' in row:
+            return r, row.index('S')
+    raise ValueError("Aucune position de départ (S) trouvée")
+
+
+class InlineExecutorMixin:
+    """Remplace l'exécuteur partagé par un exécuteur synchrone (pas de pool de processus)"""
+
+    def setUp(self):
+        super().setUp()
+        self._previous_executor = executor._executor
+        executor._executor = TrainingExecutor(mode='inline')
+
+    def tearDown(self):
+        executor._executor.shutdown()
+        executor._executor = self._previous_executor
+        super().tearDown()
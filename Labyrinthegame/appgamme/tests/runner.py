@@ -0,0 +1,16 @@
+from django.test.runner import DiscoverRunner
+
+from appgamme.metrics import process_local_metrics
+
+
+class TestRunner(DiscoverRunner):
+    """Exécute les tests sans écrire dans le fichier de métriques partagé (TRAINING_METRICS)"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._metrics = process_local_metrics()
+        self._metrics.__enter__()
+
+    def teardown_test_environment(self, **kwargs):
+        self._metrics.__exit__(None, None, None)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,67 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from rl_engine.maze import MAZES
+
+from appgamme.admission import AdmissionController, BudgetExceeded, Overloaded, estimate_cost
+
+from . import InlineExecutorMixin
+
+
+class AdmissionControllerTests(SimpleTestCase):
+    """Budgets par requête, par client et limite globale"""
+
+    def test_request_budget(self):
+        controller = AdmissionController(max_episodes=100, max_cells=30)
+        self.assertEqual(controller.check_request(MAZES[0], 10), estimate_cost(MAZES[0], 10))
+        for grid, episodes in ((MAZES[0], 0), (MAZES[0], 101), ([['.'] * 6] * 6, 10)):
+            with self.subTest(episodes=episodes, rows=len(grid)):
+                with self.assertRaises(BudgetExceeded):
+                    controller.check_request(grid, episodes)
+
+    def test_concurrency_limit_until_release(self):
+        controller = AdmissionController(max_concurrent=1, retry_after=7)
+        ticket = controller.admit('a', MAZES[0], 10)
+        with self.assertRaises(Overloaded) as raised:
+            controller.admit('b', MAZES[0], 10)
+        self.assertEqual(raised.exception.retry_after, 7)
+        ticket.release()
+        ticket.release()
+        self.assertEqual(controller.in_flight, 0)
+        controller.admit('b', MAZES[0], 10).release()
+
+    def test_client_budget_is_per_client(self):
+        cost = estimate_cost(MAZES[0], 10)
+        controller = AdmissionController(client_budget=cost, client_window=30.0)
+        controller.admit('a', MAZES[0], 10).release()
+        with self.assertRaises(Overloaded) as raised:
+            controller.admit('a', MAZES[0], 10)
+        self.assertTrue(1 <= raised.exception.retry_after <= 30)
+        controller.admit('b', MAZES[0], 10).release()
+
+
+class OverloadedApiTests(InlineExecutorMixin, TestCase):
+    """Une API surchargée répond 429 avec Retry-After"""
+
+    URLS = ('/api/train/', '/api/train/stream/', '/api/jobs/')
+
+    def test_overloaded_returns_429_with_retry_after(self):
+        controller = AdmissionController(max_concurrent=1, retry_after=9)
+        ticket = controller.admit('autre', MAZES[0], 10)
+        body = json.dumps({'maze': MAZES[0], 'episodes': 20, 'seed': 0})
+        with mock.patch('appgamme.admission._controller', controller):
+            for url in self.URLS:
+                with self.subTest(url=url):
+                    response = self.client.post(url, body, content_type='application/json')
+                    self.assertEqual(response.status_code, 429)
+                    self.assertEqual(response['Retry-After'], '9')
+                    self.assertEqual(response['X-Queue-Depth'], '1')
+                    self.assertFalse(response.json()['success'])
+        ticket.release()
+
+    def test_over_budget_request_returns_400(self):
+        body = json.dumps({'maze': MAZES[0], 'episodes': 10 ** 6, 'seed': 0})
+        response = self.client.post('/api/train/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
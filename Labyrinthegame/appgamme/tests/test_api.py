@@ -0,0 +1,59 @@
+import json
+
+from django.test import TestCase
+
+from rl_engine.maze import MAZES
+
+from . import InlineExecutorMixin
+
+
+class TrainApiValidationTests(InlineExecutorMixin, TestCase):
+    """Les API d'entraînement refusent les paramètres invalides (400)"""
+
+    INVALID = [
+        {'episodes': 'beaucoup'},
+        {'episodes': True},
+        {'episodes': 0},
+        {'episodes': '20'},
+        {'episodes': 1.9},
+        {'planning_steps': 1.0},
+        {'history_every': [10]},
+        {'history_every': 0},
+        {'seed': -1},
+        {'seed': 1.5},
+        {'seed': '1'},
+        {'history': 'tout'},
+        {'history': ['full']},
+        {'backend': 'gpu'},
+        {'scheduler': ['uniform']},
+        {'planning_steps': -1},
+        {'warm_start': 'oui'},
+        {'convergence': {'patience': 0}},
+        {'convergence': {'max_delta': -1}},
+        {'convergence': {'inconnu': 1}},
+        {'convergence': [1]},
+        {'maze': [['S', '#'], ['#', 'G']]},
+        {'maze': 'SG'},
+    ]
+    URLS = ('/api/train/', '/api/train/stream/', '/api/jobs/')
+
+    def _post(self, url, body):
+        return self.client.post(url, json.dumps(body), content_type='application/json')
+
+    def test_invalid_params_return_400(self):
+        for url in self.URLS:
+            for change in self.INVALID:
+                with self.subTest(url=url, params=change):
+                    body = dict({'maze': MAZES[0], 'episodes': 20, 'seed': 0}, **change)
+                    response = self._post(url, body)
+                    self.assertEqual(response.status_code, 400)
+
+    def test_non_object_body_returns_400(self):
+        for url in self.URLS:
+            with self.subTest(url=url):
+                self.assertEqual(self._post(url, [MAZES[0]]).status_code, 400)
+
+    def test_valid_params_are_accepted(self):
+        response = self._post('/api/train/', {'maze': MAZES[0], 'episodes': 20, 'seed': 0})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['success'])
@@ -0,0 +1,56 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from rl_engine.maze import MAZES
+from rl_engine.q_learner import BATCH_MIN_AGENTS, train_batch
+from rl_engine.q_table import ArrayQTable
+
+
+class TrainBatchTests(SimpleTestCase):
+    """train_batch : lot vectorisé et petits lots entraînés l'un après l'autre"""
+
+    SIZES = (2, BATCH_MIN_AGENTS)
+
+    def _results(self, n_agents, **kwargs):
+        grids = [MAZES[i % len(MAZES)] for i in range(n_agents)]
+        return grids, train_batch(grids, episodes=kwargs.pop('episodes', 300), seed=0, **kwargs)
+
+    def test_result_format(self):
+        for n_agents in self.SIZES:
+            with self.subTest(agents=n_agents):
+                grids, results = self._results(n_agents, episodes=[20 + i for i in range(n_agents)])
+                self.assertEqual(len(results), n_agents)
+                for i, (grid, result) in enumerate(zip(grids, results)):
+                    self.assertIsInstance(result['q_table'], ArrayQTable)
+                    self.assertEqual(len(result['rewards']), 20 + i)
+                    self.assertEqual(len(result['steps']), 20 + i)
+                    self.assertEqual(len(result['reached_goal']), 20 + i)
+                    r, c = result['final_path'][0]
+                    self.assertEqual(grid[r][c], 'S')
+
+    def test_agents_learn_the_path(self):
+        for n_agents in self.SIZES:
+            with self.subTest(agents=n_agents):
+                grids, results = self._results(n_agents)
+                ends = [result['final_path'][-1] for result in results]
+                reached = sum(grid[r][c] == 'G' for grid, (r, c) in zip(grids, ends))
+                self.assertGreater(reached, n_agents // 2)
+                self.assertTrue(all(result['reached_goal'][-1] for result in results))
+
+    def test_max_steps_limits_episodes(self):
+        for n_agents in self.SIZES:
+            with self.subTest(agents=n_agents):
+                _, results = self._results(n_agents, episodes=30, max_steps=5)
+                self.assertEqual(max(max(result['steps']) for result in results), 5)
+
+    def test_seed_is_reproducible(self):
+        for n_agents in self.SIZES:
+            with self.subTest(agents=n_agents):
+                _, first = self._results(n_agents, episodes=50)
+                _, second = self._results(n_agents, episodes=50)
+                for a, b in zip(first, second):
+                    self.assertEqual(a['steps'], b['steps'])
+                    np.testing.assert_array_equal(a['q_table'].values, b['q_table'].values)
+
+    def test_empty_batch(self):
+        self.assertEqual(train_batch([]), [])
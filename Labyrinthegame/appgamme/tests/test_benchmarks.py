@@ -0,0 +1,99 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from rl_engine.maze import MAZES
+
+from appgamme import benchmarks
+from appgamme.benchmarks import METRICS, benchmark_mazes, compare, run_benchmarks
+from appgamme.management.commands.benchmark import DEFAULT_BASELINE
+
+
+def _results(**scenarios):
+    return {'meta': {'quick': True}, 'results': scenarios}
+
+
+class CompareTests(SimpleTestCase):
+    """compare : régressions au-delà de la tolérance, dans le sens de chaque métrique"""
+
+    BASELINE = _results(a={'episodes_per_sec': 100.0, 'latency_p50_ms': 10.0})
+
+    def test_within_tolerance(self):
+        results = _results(a={'episodes_per_sec': 75.0, 'latency_p50_ms': 12.5})
+        self.assertEqual(compare(results, self.BASELINE, tolerance=0.3), [])
+
+    def test_regressions_follow_metric_direction(self):
+        results = _results(a={'episodes_per_sec': 60.0, 'latency_p50_ms': 14.0})
+        regressions = compare(results, self.BASELINE, tolerance=0.3)
+        self.assertEqual([(name, metric) for name, metric, *_ in regressions],
+                         [('a', 'episodes_per_sec'), ('a', 'latency_p50_ms')])
+        self.assertAlmostEqual(regressions[0][4], -0.4)
+        # Une amélioration n'est jamais une régression
+        improved = _results(a={'episodes_per_sec': 1000.0, 'latency_p50_ms': 1.0})
+        self.assertEqual(compare(improved, self.BASELINE, tolerance=0.0), [])
+
+    def test_unknown_scenarios_and_metrics_are_ignored(self):
+        results = _results(a={'inconnue': 0.0}, b={'episodes_per_sec': 1.0})
+        self.assertEqual(compare(results, self.BASELINE), [])
+
+
+class HarnessTests(SimpleTestCase):
+    """Scénarios, tours et commande manage.py benchmark"""
+
+    def test_benchmark_mazes(self):
+        mazes = benchmark_mazes()
+        self.assertEqual(len(mazes), len(MAZES) + len(benchmarks.GENERATED))
+        self.assertEqual(mazes['prim-51x51'], benchmark_mazes()['prim-51x51'])
+        self.assertEqual(list(mazes.values())[:len(MAZES)], list(MAZES))
+
+    def test_baseline_covers_current_scenarios(self):
+        with open(DEFAULT_BASELINE, encoding='utf-8') as f:
+            baseline = json.load(f)
+        names = {name for name, _, _ in benchmarks._scenarios(baseline['meta']['quick'], True)}
+        self.assertEqual(set(baseline['results']), names)
+        for metrics in baseline['results'].values():
+            self.assertLessEqual(set(metrics), set(METRICS))
+
+    def test_rounds_keep_the_best_value_of_each_metric(self):
+        values = iter([{'steps_per_sec': 10, 'serialize_ms': 5},
+                       {'steps_per_sec': 30, 'serialize_ms': 7},
+                       {'steps_per_sec': 20, 'serialize_ms': 3}])
+        scenarios = [('s', lambda: next(values), ())]
+        with mock.patch.object(benchmarks, '_scenarios', return_value=scenarios):
+            results = run_benchmarks(rounds=3)
+        self.assertEqual(results['results'], {'s': {'steps_per_sec': 30, 'serialize_ms': 3}})
+        self.assertEqual(results['meta']['rounds'], 3)
+
+    def test_scenario_measures(self):
+        grid = MAZES[0]
+        training = benchmarks.bench_training(grid, 20, 1)
+        self.assertEqual(set(training), {'episodes_per_sec', 'steps_per_sec', 'peak_memory_kb'})
+        self.assertGreater(training['steps_per_sec'], training['episodes_per_sec'])
+        for encoding in ('json', 'packed'):
+            serialization = benchmarks.bench_serialization(grid, 50, encoding, 1)
+            self.assertGreater(serialization['payload_bytes'], 0)
+
+    def test_command_fails_on_regression(self):
+        baseline = _results(s={'steps_per_sec': 100.0})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(baseline, f)
+            for measured, failed in ((90.0, False), (10.0, True)):
+                with self.subTest(steps_per_sec=measured):
+                    results = _results(s={'steps_per_sec': measured})
+                    with mock.patch('appgamme.management.commands.benchmark.run_benchmarks',
+                                    return_value=results):
+                        args = ('benchmark', '--quick', '--no-endpoints', '--baseline', path)
+                        out = io.StringIO()
+                        if failed:
+                            with self.assertRaises(CommandError):
+                                call_command(*args, stdout=out, stderr=io.StringIO())
+                        else:
+                            call_command(*args, stdout=out, stderr=io.StringIO())
+                            self.assertIn("Aucune régression", out.getvalue())
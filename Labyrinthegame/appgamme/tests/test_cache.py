@@ -0,0 +1,79 @@
+import tempfile
+
+from django.test import SimpleTestCase
+
+from rl_engine.cache import ResultCache, isolated_cache, make_key
+from rl_engine.maze import MAZES
+from rl_engine.q_learner import train_with_live_updates
+
+
+class CacheKeyTests(SimpleTestCase):
+    """La clé de cache dépend de chaque entrée de l'entraînement"""
+
+    PARAMS = {
+        'alpha': 0.1, 'gamma': 0.9, 'epsilon': 0.1, 'episodes': 30, 'backend': 'dict',
+        'seed': 0, 'history': 'summary', 'history_every': 10, 'convergence': None,
+        'planning_steps': 0, 'scheduler': 'uniform',
+    }
+    CHANGES = {
+        'alpha': 0.2, 'gamma': 0.8, 'epsilon': 0.2, 'episodes': 31, 'backend': 'array',
+        'seed': 1, 'history': 'full', 'history_every': 5, 'convergence': {'patience': 5},
+        'planning_steps': 2, 'scheduler': 'prioritized',
+    }
+
+    def test_make_key_covers_grid_and_params(self):
+        key = make_key('live_updates', MAZES[0], **self.PARAMS)
+        reordered = dict(reversed(self.PARAMS.items()))
+        self.assertEqual(key, make_key('live_updates', MAZES[0], **reordered))
+        self.assertNotEqual(key, make_key('optimal_path', MAZES[0], **self.PARAMS))
+        self.assertNotEqual(key, make_key('live_updates', MAZES[1], **self.PARAMS))
+        for name, value in self.CHANGES.items():
+            with self.subTest(param=name):
+                params = dict(self.PARAMS, **{name: value})
+                self.assertNotEqual(key, make_key('live_updates', MAZES[0], **params))
+
+    def test_each_input_gets_its_own_result(self):
+        self.assertEqual(set(self.CHANGES), set(self.PARAMS))
+        with isolated_cache() as cache:
+            train_with_live_updates(MAZES[0], **self.PARAMS)
+            self.assertTrue(train_with_live_updates(MAZES[0], **self.PARAMS).get('cached'))
+            for name, value in self.CHANGES.items():
+                with self.subTest(param=name):
+                    result = train_with_live_updates(MAZES[0], **dict(self.PARAMS, **{name: value}))
+                    self.assertNotIn('cached', result)
+            self.assertEqual(len(cache), 1 + len(self.CHANGES))
+
+    def test_unseeded_results_are_not_cached(self):
+        with isolated_cache() as cache:
+            train_with_live_updates(MAZES[0], **dict(self.PARAMS, seed=None))
+            self.assertEqual(len(cache), 0)
+
+
+class ResultCacheTests(SimpleTestCase):
+    """Cache LRU : copies indépendantes, éviction et persistance disque"""
+
+    def test_get_returns_independent_copies(self):
+        cache = ResultCache()
+        cache.set('k', {'path': [[0, 0]]})
+        cache.get('k')['path'].append([0, 1])
+        self.assertEqual(cache.get('k'), {'path': [[0, 0]]})
+        self.assertEqual((cache.hits, cache.misses), (2, 0))
+        self.assertIsNone(cache.get('absent'))
+        self.assertEqual(cache.misses, 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResultCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual([key for key, _ in cache.items()], ['a', 'c'])
+        self.assertIsNone(cache.get('b'))
+
+    def test_directory_survives_eviction_and_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(maxsize=1, directory=directory)
+            cache.set('a', 1)
+            cache.set('b', 2)
+            self.assertEqual(cache.get('a'), 1)
+            self.assertEqual(ResultCache(directory=directory).get('b'), 2)
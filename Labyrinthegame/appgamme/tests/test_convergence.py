@@ -0,0 +1,45 @@
+from django.test import SimpleTestCase
+
+from rl_engine.maze import MAZES
+from rl_engine.planner import shortest_path_length
+from rl_engine.q_learner import QLearnerWithVisualization
+
+from . import start_position
+
+
+class ConvergenceTests(SimpleTestCase):
+    """Arrêt anticipé : l'entraînement s'arrête au premier critère atteint"""
+
+    EPISODES = 2000
+
+    def _train(self, convergence, grid=MAZES[0]):
+        agent = QLearnerWithVisualization(seed=0)
+        history = list(agent.iter_training(grid, start_position(grid), self.EPISODES,
+                                           'summary', convergence=convergence))
+        return agent, history
+
+    def test_optimal_stops_on_a_shortest_path(self):
+        grid = MAZES[0]
+        agent, history = self._train({'optimal': True}, grid)
+        self.assertIsNotNone(agent.converged_episode)
+        self.assertLess(agent.converged_episode, self.EPISODES - 1)
+        self.assertEqual(history[-1]['episode'], agent.converged_episode)
+        self.assertTrue(history[-1]['converged'])
+        path = agent.get_current_best_path(grid, start_position(grid))
+        self.assertEqual(len(path) - 1, shortest_path_length(grid))
+
+    def test_patience_stops_after_a_stable_path(self):
+        agent, history = self._train({'patience': 5})
+        self.assertIsNotNone(agent.converged_episode)
+        self.assertEqual(len(history), agent.converged_episode + 1)
+        self.assertGreaterEqual(agent.converged_episode, 4)
+
+    def test_max_delta_stops_when_updates_are_small(self):
+        agent, history = self._train({'max_delta': 1000.0})
+        self.assertEqual(agent.converged_episode, 0)
+        self.assertEqual(len(history), 1)
+
+    def test_without_criteria_all_episodes_run(self):
+        agent, history = self._train(None)
+        self.assertIsNone(agent.converged_episode)
+        self.assertEqual(len(history), self.EPISODES)
@@ -0,0 +1,62 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from rl_engine.dyna import DynaModel
+from rl_engine.generator import generate_maze
+from rl_engine.maze import MAZES, compile_maze
+from rl_engine.q_learner import QLearnerWithVisualization
+from rl_engine.q_table import q_table_to_array
+
+from . import start_position
+
+
+def train_until_optimal(grid, **kwargs):
+    """Entraîne jusqu'au plus court chemin ; retourne (agent, historique)"""
+    agent = QLearnerWithVisualization(seed=0, **kwargs)
+    history = agent.train_with_callback(grid, start_position(grid), 2000, history='summary',
+                                        convergence={'optimal': True})
+    return agent, history
+
+
+class DynaQTests(SimpleTestCase):
+    """Dyna-Q : K mises à jour simulées par pas réel, moins d'épisodes pour converger"""
+
+    GRIDS = (MAZES[3], generate_maze(15, 15, 'prim', seed=0))
+
+    def test_planning_updates_per_step(self):
+        for planning_steps in (0, 5):
+            with self.subTest(planning_steps=planning_steps):
+                agent, history = train_until_optimal(MAZES[3], planning_steps=planning_steps)
+                steps = sum(item['steps'] for item in history)
+                self.assertEqual(agent.planning_updates_run, planning_steps * steps)
+
+    def test_planning_converges_in_fewer_episodes(self):
+        for i, grid in enumerate(self.GRIDS):
+            with self.subTest(maze=i):
+                plain, _ = train_until_optimal(grid)
+                dyna, _ = train_until_optimal(grid, planning_steps=5)
+                self.assertIsNotNone(dyna.converged_episode)
+                self.assertLess(dyna.converged_episode, plain.converged_episode)
+
+    def test_planning_is_reproducible_on_every_backend(self):
+        for backend in QLearnerWithVisualization.BACKENDS:
+            with self.subTest(backend=backend):
+                first, history = train_until_optimal(MAZES[3], planning_steps=3, backend=backend)
+                second, again = train_until_optimal(MAZES[3], planning_steps=3, backend=backend)
+                self.assertEqual(history, again)
+                rows, cols = len(MAZES[3]), len(MAZES[3][0])
+                np.testing.assert_array_equal(q_table_to_array(first.q_table, rows, cols),
+                                              q_table_to_array(second.q_table, rows, cols))
+
+    def test_model_records_each_pair_once(self):
+        env = compile_maze(MAZES[0])
+        model = DynaModel(env, np.random.default_rng(0))
+        for sid, action in ((0, 1), (0, 1), (0, 3)):
+            model.record(sid, action)
+        self.assertEqual(model.size, 2)
+        values = np.zeros((env.n_states, 4))
+        states, max_delta = model.plan(values, None, alpha=0.5, gamma=0.9, n_updates=8)
+        self.assertEqual(set(states.tolist()), {0})
+        # Q initialisée à 0 : la variation est alpha * r pour l'une des deux transitions
+        rewards = {abs(0.5 * env.rewards[0, action]) for action in (1, 3)}
+        self.assertIn(max_delta, rewards)
@@ -0,0 +1,51 @@
+import json
+
+from django.test import SimpleTestCase
+
+from rl_engine.encoding import PACKED_FORMAT, decode_history, encode_history
+from rl_engine.maze import MAZES
+from rl_engine.q_learner import QLearnerWithVisualization
+
+from . import start_position
+
+
+def _normalized(history):
+    """Historique comparable après un passage par JSON (chemins en listes de tuples)"""
+    return [
+        {name: [tuple(cell) for cell in value] if name in ('path', 'best_path') else value
+         for name, value in json.loads(json.dumps(episode)).items()}
+        for episode in history
+    ]
+
+
+class PackedHistoryTests(SimpleTestCase):
+    """Format 'packed-v1' : decode_history(encode_history(h)) == h"""
+
+    def _history(self, history='every_n'):
+        agent = QLearnerWithVisualization(seed=0)
+        grid = MAZES[0]
+        return grid, list(agent.iter_training(grid, start_position(grid), 30, history, 7))
+
+    def test_round_trip_through_json(self):
+        for policy in ('full', 'every_n', 'summary'):
+            with self.subTest(history=policy):
+                grid, history = self._history(policy)
+                packed = json.loads(json.dumps(encode_history(history, grid)))
+                self.assertEqual(packed['format'], PACKED_FORMAT)
+                self.assertEqual(_normalized(decode_history(packed)), _normalized(history))
+
+    def test_large_grid_uses_uint32_cells(self):
+        grid = [['.'] * 300 for _ in range(300)]
+        history = [{'episode': 0, 'reward': -5, 'steps': 2, 'explorations': 1,
+                    'reached_goal': False, 'path': [(0, 0), (299, 299)],
+                    'best_path': [(299, 299)], 'errors': [{'type': 'wall'}]}]
+        packed = encode_history(history, grid)
+        self.assertEqual(packed['cell_dtype'], 'uint32')
+        self.assertEqual(_normalized(decode_history(packed)), _normalized(history))
+
+    def test_empty_history(self):
+        self.assertEqual(decode_history(encode_history([], MAZES[0])), [])
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            decode_history({'format': 'packed-v0'})
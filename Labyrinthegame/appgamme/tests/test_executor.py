@@ -0,0 +1,46 @@
+import queue
+import threading
+
+from django.test import SimpleTestCase
+
+from rl_engine.maze import MAZES
+from rl_engine.q_learner import stream_live_updates
+
+from appgamme.executor import TrainingExecutor, _run_stream
+
+
+class StreamCancellationTests(SimpleTestCase):
+    """Un flux fermé arrête l'entraînement, même sans événement produit"""
+
+    PARAMS = {'grid': MAZES[0], 'episodes': 500, 'seed': 0, 'history': 'best_changes'}
+
+    def _run(self, cancelled):
+        episodes = []
+
+        def training(on_episode, **params):
+            def counting(episode):
+                episodes.append(episode)
+                on_episode(episode)
+            return stream_live_updates(**params, on_episode=counting)
+
+        events = queue.Queue()
+        _run_stream(training, events, cancelled, (), dict(self.PARAMS))
+        return episodes, [events.get_nowait() for _ in range(events.qsize())]
+
+    def test_closed_stream_stops_at_first_episode(self):
+        cancelled = threading.Event()
+        cancelled.set()
+        episodes, events = self._run(cancelled)
+        self.assertLessEqual(len(episodes), 1)
+        self.assertIsNone(events[-1])
+        self.assertNotIn('done', [event['type'] for event in events[:-1]])
+
+    def test_open_stream_runs_to_the_end(self):
+        episodes, events = self._run(threading.Event())
+        self.assertEqual(len(episodes), self.PARAMS['episodes'])
+        self.assertEqual(events[-2]['type'], 'done')
+
+    def test_inline_submit_stream(self):
+        executor = TrainingExecutor(mode='inline')
+        stream = executor.submit_stream(stream_live_updates, **dict(self.PARAMS, episodes=20))
+        self.assertEqual([event['type'] for event in stream][-1], 'done')
@@ -0,0 +1,54 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from rl_engine.generator import GENERATORS, generate_maze
+from rl_engine.maze import compile_maze, to_grid
+from rl_engine.planner import goal_distances
+
+
+class GeneratorTests(SimpleTestCase):
+    """Labyrinthes générés : reproductibles, résolubles et connexes"""
+
+    SIZES = ((3, 2), (7, 7), (20, 31), (41, 40))
+
+    def test_same_seed_same_maze(self):
+        for algorithm in GENERATORS:
+            with self.subTest(algorithm=algorithm):
+                first = generate_maze(31, 31, algorithm, seed=3)
+                self.assertEqual(first, generate_maze(31, 31, algorithm, seed=3))
+                self.assertNotEqual(first, generate_maze(31, 31, algorithm, seed=4))
+
+    def test_as_array_matches_grid(self):
+        for algorithm in GENERATORS:
+            with self.subTest(algorithm=algorithm):
+                array = generate_maze(15, 21, algorithm, seed=0, as_array=True)
+                self.assertEqual(array.dtype, np.uint8)
+                self.assertEqual(to_grid(array), generate_maze(15, 21, algorithm, seed=0))
+
+    def test_mazes_are_solvable(self):
+        for algorithm in GENERATORS:
+            for rows, cols in self.SIZES:
+                with self.subTest(algorithm=algorithm, size=(rows, cols)):
+                    grid = generate_maze(rows, cols, algorithm, seed=1)
+                    self.assertEqual((len(grid), len(grid[0])), (rows, cols))
+                    self.assertEqual(sum(row.count('S') for row in grid), 1)
+                    self.assertEqual(sum(row.count('G') for row in grid), 1)
+                    env = compile_maze(grid)
+                    self.assertGreater(goal_distances(env)[env.start], 0)
+
+    def test_perfect_mazes_are_spanning_trees(self):
+        for algorithm in ('backtracker', 'prim'):
+            with self.subTest(algorithm=algorithm):
+                free = np.array(generate_maze(41, 41, algorithm, seed=2)) != '#'
+                env = compile_maze(generate_maze(41, 41, algorithm, seed=2))
+                # Toutes les cases libres sont reliées à G, sans cycle (arêtes = cases - 1)
+                self.assertTrue((goal_distances(env)[free.ravel()] >= 0).all())
+                edges = (free[:, 1:] & free[:, :-1]).sum() + (free[1:, :] & free[:-1, :]).sum()
+                self.assertEqual(edges, free.sum() - 1)
+
+    def test_invalid_parameters(self):
+        for kwargs in ({'rows': 1, 'cols': 5}, {'rows': 5, 'cols': 5, 'algorithm': 'kruskal'},
+                       {'rows': 5, 'cols': 5, 'algorithm': 'obstacles', 'density': 1.5}):
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    generate_maze(**kwargs)
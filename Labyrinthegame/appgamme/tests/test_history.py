@@ -0,0 +1,51 @@
+import json
+
+from django.test import SimpleTestCase
+
+from rl_engine.maze import MAZES
+from rl_engine.q_learner import QLearnerWithVisualization
+
+from . import start_position
+
+
+class HistoryPolicyTests(SimpleTestCase):
+    """Granularité de l'historique : épisodes produits et épisodes détaillés"""
+
+    EPISODES = 25
+
+    def _history(self, history, history_every=10):
+        agent = QLearnerWithVisualization(seed=0)
+        grid = MAZES[0]
+        return list(agent.iter_training(grid, start_position(grid), self.EPISODES,
+                                        history, history_every))
+
+    @staticmethod
+    def _detailed(history):
+        return [item['episode'] for item in history if 'path' in item]
+
+    def test_every_n_details_every_n_episodes_and_the_last(self):
+        history = self._history('every_n', history_every=10)
+        self.assertEqual([item['episode'] for item in history], list(range(self.EPISODES)))
+        self.assertEqual(self._detailed(history), [0, 10, 20, 24])
+
+    def test_full_and_summary(self):
+        self.assertEqual(self._detailed(self._history('full')), list(range(self.EPISODES)))
+        summary = self._history('summary')
+        self.assertEqual(len(summary), self.EPISODES)
+        self.assertEqual(self._detailed(summary), [])
+        self.assertEqual(self._history('none'), [])
+
+    def test_best_changes_ends_with_the_last_episode(self):
+        history = self._history('best_changes')
+        episodes = [item['episode'] for item in history]
+        self.assertEqual(episodes, sorted(set(episodes)))
+        self.assertEqual(episodes[-1], self.EPISODES - 1)
+        self.assertEqual(self._detailed(history), episodes)
+
+    def test_api_rejects_history_every_below_one(self):
+        for value in (0, -5):
+            with self.subTest(history_every=value):
+                body = {'maze': MAZES[0], 'episodes': 20, 'seed': 0, 'history_every': value}
+                response = self.client.post('/api/train/', json.dumps(body),
+                                            content_type='application/json')
+                self.assertEqual(response.status_code, 400)
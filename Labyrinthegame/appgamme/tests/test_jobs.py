@@ -0,0 +1,106 @@
+import json
+import uuid
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from rl_engine.cache import make_key
+from rl_engine.encoding import decode_history
+from rl_engine.maze import MAZES
+
+from appgamme import jobs
+from appgamme.models import TrainingJob
+
+from . import InlineExecutorMixin
+
+
+class JobTests(InlineExecutorMixin, TransactionTestCase):
+    """Déduplication et annulation des jobs (run_job ferme les connexions : pas de TestCase)"""
+
+    def setUp(self):
+        super().setUp()
+        self.params = {
+            'grid': MAZES[0], 'alpha': 0.1, 'gamma': 0.9, 'epsilon': 0.1, 'episodes': 50,
+            'backend': 'dict', 'seed': 0, 'history': 'summary', 'history_every': 10,
+            'convergence': None, 'warm_start': False, 'planning_steps': 0, 'scheduler': 'uniform',
+        }
+        self.key = make_key('job', self.params['grid'],
+                            **{k: v for k, v in self.params.items() if k != 'grid'})
+
+    def test_active_job_is_deduplicated(self):
+        active = TrainingJob.objects.create(key=self.key, params=self.params, episodes_total=50)
+        job, deduplicated = jobs.submit_job(self.params)
+        self.assertTrue(deduplicated)
+        self.assertEqual(job.pk, active.pk)
+        self.assertEqual(TrainingJob.objects.count(), 1)
+
+    def test_finished_job_is_not_deduplicated(self):
+        first, deduplicated = jobs.submit_job(self.params)
+        self.assertFalse(deduplicated)
+        first.refresh_from_db()
+        self.assertEqual(first.status, TrainingJob.DONE)
+        second, deduplicated = jobs.submit_job(self.params)
+        self.assertFalse(deduplicated)
+        self.assertNotEqual(second.pk, first.pk)
+
+    def test_api_deduplicates_active_job(self):
+        active = TrainingJob.objects.create(key=self.key, params=self.params, episodes_total=50)
+        body = json.dumps({'maze': MAZES[0], 'episodes': 50, 'seed': 0, 'history': 'summary'})
+        response = self.client.post('/api/jobs/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.json()['deduplicated'])
+        self.assertEqual(response.json()['job_id'], str(active.pk))
+
+    def test_cancel_queued_job(self):
+        job = TrainingJob.objects.create(key=self.key, params=self.params, episodes_total=50)
+        response = self.client.post(f'/api/jobs/{job.pk}/cancel/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], TrainingJob.CANCELLED)
+        # Un job annulé n'est pas démarré
+        jobs.run_job(str(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, TrainingJob.CANCELLED)
+        self.assertIsNone(job.result)
+        self.assertEqual(self.client.post(f'/api/jobs/{job.pk}/cancel/').status_code, 409)
+
+    def test_cancel_running_job(self):
+        job = TrainingJob.objects.create(key=self.key, params=dict(self.params, episodes=500),
+                                         episodes_total=500)
+        stream_live_updates = jobs.stream_live_updates
+        events = []
+
+        def cancelled_after_first_episode(**params):
+            for event in stream_live_updates(**params):
+                events.append(event)
+                yield event
+                jobs.cancel_job(job)
+
+        with mock.patch.object(jobs, 'PROGRESS_INTERVAL', 0), \
+                mock.patch.object(jobs, 'stream_live_updates', cancelled_after_first_episode):
+            jobs.run_job(str(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, TrainingJob.CANCELLED)
+        self.assertIsNone(job.result)
+        self.assertLess(job.episodes_done, 500)
+        # L'entraînement est interrompu à l'épisode suivant
+        self.assertLessEqual(len(events), 2)
+
+    def test_submit_then_poll_status_and_result(self):
+        body = json.dumps({'maze': MAZES[0], 'episodes': 30, 'seed': 0, 'history': 'summary'})
+        response = self.client.post('/api/jobs/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['job_id']
+        status = self.client.get(f'/api/jobs/{job_id}/').json()
+        self.assertEqual(status['status'], TrainingJob.DONE)
+        self.assertEqual(status['episodes_done'], 30)
+        result = self.client.get(f'/api/jobs/{job_id}/result/').json()
+        self.assertTrue(result['success'])
+        self.assertEqual(len(result['history']), 30)
+        packed = self.client.get(f'/api/jobs/{job_id}/result/?encoding=packed').json()
+        self.assertEqual([ep['episode'] for ep in decode_history(packed['history_packed'])],
+                         list(range(30)))
+
+    def test_result_of_active_or_unknown_job(self):
+        job = TrainingJob.objects.create(key=self.key, params=self.params, episodes_total=50)
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/result/').status_code, 202)
+        self.assertEqual(self.client.get(f'/api/jobs/{uuid.uuid4()}/').status_code, 404)
@@ -0,0 +1,56 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from rl_engine.generator import generate_maze
+from rl_engine.maze import MAZES, Maze
+
+
+def _grid(text):
+    return [list(line) for line in text.split()]
+
+
+class MazeValidationTests(SimpleTestCase):
+    """Maze.validate : cases, départ et arrivée uniques, chemin S -> G"""
+
+    def test_bundled_and_generated_mazes_are_valid(self):
+        grids = list(MAZES) + [generate_maze(61, 61, 'prim', seed=0, as_array=True)]
+        for i, grid in enumerate(grids):
+            with self.subTest(maze=i):
+                self.assertEqual(Maze(grid).validate(), (True, "Labyrinthe valide"))
+
+    def test_invalid_mazes(self):
+        cases = {
+            'S#G': "Aucun chemin",
+            'S.G .#. #.G': "exactement 1 arrivée",
+            'S.S ..G': "exactement 1 départ",
+            '..G ...': "Pas de point de départ",
+            'S.. ...': "Pas de point d'arrivée",
+            'S.G ..x': "Case invalide en (1, 2)",
+        }
+        for text, message in cases.items():
+            with self.subTest(maze=text):
+                valid, error = Maze(_grid(text)).validate()
+                self.assertFalse(valid)
+                self.assertIn(message, error)
+
+    def test_reachability_follows_components(self):
+        maze = Maze(_grid('S.#. ..#G ###. ...#'))
+        labels = maze.components()
+        self.assertEqual(labels[0, 0], labels[1, 1])
+        self.assertEqual(labels[0, 3], labels[2, 3])
+        self.assertNotEqual(labels[0, 0], labels[1, 3])
+        self.assertEqual(labels[0, 2], -1)
+        self.assertFalse(maze.is_solvable())
+
+    def test_list_and_array_grids_agree(self):
+        array = generate_maze(21, 21, 'backtracker', seed=0, as_array=True)
+        from_array, from_list = Maze(array), Maze(Maze(array).grid)
+        np.testing.assert_array_equal(from_array.cells, from_list.cells)
+        self.assertEqual((from_array.start, from_array.goal), (from_list.start, from_list.goal))
+        self.assertEqual(from_list.get_neighbors(0, 0), from_array.get_neighbors(0, 0))
+        self.assertTrue(from_list.is_wall(-1, 0))
+        self.assertEqual(from_list.get_reward(*from_list.goal), 100)
+
+    def test_ragged_grid_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Maze([['S', '.'], ['G']])
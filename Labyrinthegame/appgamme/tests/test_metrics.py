@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+
+from rl_engine.maze import MAZES
+from rl_engine.metrics import MetricsRegistry, MetricsStore, get_registry
+
+from appgamme.metrics import process_local_metrics
+
+from . import InlineExecutorMixin
+
+
+class MetricsRegistryTests(SimpleTestCase):
+    """Compteurs et histogrammes, cumulés entre processus par le fichier partagé"""
+
+    def test_processes_add_up_in_the_shared_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'metrics.sqlite3')
+            registries = [MetricsRegistry(MetricsStore(path), prefix='t_') for _ in range(2)]
+            for registry in registries:
+                registry.counter('runs', "Exécutions", ('kind',)).inc(kind='a')
+                registry.flush()
+            self.assertEqual(registries[0].values()[('t_runs_total', 'kind="a"')], 2.0)
+
+    def test_exposition_format(self):
+        registry = MetricsRegistry(prefix='t_')
+        registry.counter('runs', "Exécutions").inc(3)
+        registry.histogram('duration_seconds', "Durée", buckets=(0.1, 1.0)).observe(0.5)
+        registry.gauge('queue', "File", lambda: 4)
+        lines = registry.exposition().splitlines()
+        self.assertIn('# TYPE t_runs_total counter', lines)
+        self.assertIn('t_runs_total 3', lines)
+        buckets = [line for line in lines if line.startswith('t_duration_seconds_bucket')]
+        self.assertEqual(buckets, ['t_duration_seconds_bucket{le="0.1"} 0',
+                                   't_duration_seconds_bucket{le="1"} 1',
+                                   't_duration_seconds_bucket{le="+Inf"} 1'])
+        self.assertIn('t_duration_seconds_count 1', lines)
+        self.assertIn('t_queue 4', lines)
+
+    def test_tests_do_not_write_the_shared_file(self):
+        self.assertIsNone(settings.TRAINING_METRICS['path'])
+        self.assertIsNone(get_registry().store)
+
+
+class MetricsViewTests(InlineExecutorMixin, TestCase):
+    """/metrics/ expose les requêtes et les entraînements au format Prometheus"""
+
+    def test_training_shows_in_metrics(self):
+        with process_local_metrics() as registry:
+            body = json.dumps({'maze': MAZES[0], 'episodes': 25, 'seed': 0})
+            self.client.post('/api/train/', body, content_type='application/json')
+            response = self.client.get('/metrics/')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+            lines = response.content.decode().splitlines()
+            self.assertIn('labyrinthe_training_episodes_total 25', lines)
+            self.assertIn('labyrinthe_http_requests_total{view="train_api",status="200"} 1', lines)
+            self.assertIn('labyrinthe_training_in_flight 0', lines)
+        # Les valeurs du bloc sont abandonnées à la sortie
+        self.assertEqual(registry.values(), {})
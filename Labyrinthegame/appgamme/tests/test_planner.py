@@ -0,0 +1,51 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from rl_engine.maze import MAZES, compile_maze
+from rl_engine.planner import SOLVERS, goal_distances, shortest_path_length, solve
+
+
+class PlannerTests(SimpleTestCase):
+    """Les planificateurs trouvent des plus courts chemins valides et concordants"""
+
+    def _assert_valid_path(self, grid, path):
+        self.assertEqual(grid[path[0][0]][path[0][1]], 'S')
+        self.assertEqual(grid[path[-1][0]][path[-1][1]], 'G')
+        for (r, c), (nr, nc) in zip(path, path[1:]):
+            self.assertEqual(abs(r - nr) + abs(c - nc), 1)
+            self.assertNotEqual(grid[nr][nc], '#')
+
+    def test_solvers_agree_on_shortest_paths(self):
+        for i, grid in enumerate(MAZES):
+            length = shortest_path_length(grid)
+            for solver in SOLVERS:
+                with self.subTest(maze=i, solver=solver):
+                    path = solve(grid, solver)['path']
+                    self._assert_valid_path(grid, path)
+                    self.assertEqual(len(path) - 1, length)
+
+    def test_bfs_q_table_is_the_value_iteration_limit(self):
+        for i, grid in enumerate(MAZES):
+            with self.subTest(maze=i):
+                exact = solve(grid, 'bfs')['q_table'].to_array()
+                iterated = solve(grid, 'value_iteration')['q_table'].to_array()
+                np.testing.assert_allclose(exact, iterated, atol=1e-6)
+
+    def test_goal_distances(self):
+        grid = MAZES[0]
+        env = compile_maze(grid)
+        distances = goal_distances(env)
+        self.assertEqual(distances[env.goal], 0)
+        self.assertTrue((distances[env.walls] == -1).all())
+        self.assertEqual(distances[env.start], shortest_path_length(grid))
+
+    def test_unreachable_goal(self):
+        grid = [list('S#G')]
+        self.assertEqual(shortest_path_length(grid), -1)
+        for solver in SOLVERS:
+            with self.subTest(solver=solver):
+                self.assertEqual(solve(grid, solver)['path'], [(0, 0)])
+
+    def test_unknown_solver(self):
+        with self.assertRaises(ValueError):
+            solve(MAZES[0], 'dijkstra')
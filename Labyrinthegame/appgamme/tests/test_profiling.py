@@ -0,0 +1,72 @@
+import json
+
+from django.test import SimpleTestCase, TestCase
+
+from rl_engine.maze import MAZES
+from rl_engine.profiling import INSTRUMENTED_METHODS, PHASES, TrainingProfiler
+from rl_engine.q_learner import QLearnerWithVisualization
+
+from . import InlineExecutorMixin, start_position
+
+
+class TrainingProfilerTests(SimpleTestCase):
+    """Profilage de la boucle d'entraînement : phases, appels et méthodes restaurées"""
+
+    EPISODES = 40
+
+    def _train(self, profiler=None, backend='dict', **kwargs):
+        grid = MAZES[1]
+        agent = QLearnerWithVisualization(seed=0, backend=backend, **kwargs)
+        history = agent.train_with_callback(grid, start_position(grid), self.EPISODES,
+                                            history='every_n', profiler=profiler)
+        return agent, history
+
+    def test_summary_counts_phases(self):
+        profiler = TrainingProfiler()
+        _, history = self._train(profiler)
+        summary = profiler.summary()
+        self.assertEqual(set(summary['phases']), set(PHASES) | {'instrumentation', 'other'})
+        self.assertEqual(summary['episodes'], self.EPISODES)
+        self.assertEqual(summary['steps'], sum(item['steps'] for item in history))
+        self.assertEqual(summary['phases']['choose_action']['calls'], summary['steps'])
+        self.assertEqual(summary['phases']['history']['calls'],
+                         sum('path' in item for item in history))
+        self.assertEqual(summary['phases']['planning']['calls'], 0)
+        self.assertLessEqual(sum(phase['share'] for phase in summary['phases'].values()), 1.01)
+        json.dumps(summary)
+
+    def test_planning_phase_and_hooks(self):
+        calls = []
+        profiler = TrainingProfiler(hooks=[lambda phase, elapsed, blocks: calls.append(phase)])
+        self._train(profiler, planning_steps=3)
+        summary = profiler.summary()
+        self.assertGreater(summary['phases']['planning']['calls'], 0)
+        self.assertEqual(calls.count('update_q_value'), summary['steps'])
+
+    def test_profiling_does_not_change_training(self):
+        for backend in QLearnerWithVisualization.BACKENDS:
+            with self.subTest(backend=backend):
+                agent, plain = self._train(backend=backend)
+                methods = dict(agent.__dict__)
+                profiled_agent, profiled = self._train(TrainingProfiler(), backend=backend)
+                self.assertEqual(plain, profiled)
+                # Les méthodes mesurées sont retirées, les variantes propres à l'instance remises
+                for method in INSTRUMENTED_METHODS:
+                    self.assertEqual(method in profiled_agent.__dict__, method in methods)
+                    if method in methods:
+                        self.assertEqual(getattr(profiled_agent, method).__func__,
+                                         methods[method].__func__)
+
+
+class DebugProfileApiTests(InlineExecutorMixin, TestCase):
+    """"debug": true ajoute le profilage à la réponse de /api/train/"""
+
+    def test_debug_adds_profile(self):
+        body = {'maze': MAZES[0], 'episodes': 20, 'seed': 0}
+        for debug in (False, True):
+            with self.subTest(debug=debug):
+                response = self.client.post('/api/train/', json.dumps(dict(body, debug=debug)),
+                                            content_type='application/json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual('profile' in response.json(), debug)
+        self.assertEqual(response.json()['profile']['episodes'], 20)
@@ -0,0 +1,90 @@
+import pickle
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from rl_engine.generator import generate_maze
+from rl_engine.maze import MAZES
+from rl_engine.q_learner import QLearnerWithVisualization
+from rl_engine.q_table import ArrayQTable, MemmapQTable, q_table_to_array
+
+from . import start_position
+
+
+class BackendTests(SimpleTestCase):
+    """Les backends de Q-table donnent le même entraînement"""
+
+    def _q_values(self, backend, grid, **kwargs):
+        agent = QLearnerWithVisualization(backend=backend, seed=0, **kwargs)
+        agent.train_with_callback(grid, start_position(grid), 200, history='none')
+        return q_table_to_array(agent.q_table, len(grid), len(grid[0]))
+
+    def test_backends_give_equal_q_tables(self):
+        for grid in MAZES[:3]:
+            expected = self._q_values('dict', grid)
+            self.assertTrue(expected.any())
+            for backend in ('array', 'memmap'):
+                with self.subTest(maze=len(grid), backend=backend):
+                    np.testing.assert_array_equal(self._q_values(backend, grid), expected)
+
+    def test_warm_start_is_loaded_in_every_backend(self):
+        grid = MAZES[1]
+        initial = self._q_values('dict', grid)
+        expected = self._q_values('dict', grid, warm_start=initial)
+        for backend in ('array', 'memmap'):
+            with self.subTest(backend=backend):
+                np.testing.assert_array_equal(
+                    self._q_values(backend, grid, warm_start=initial), expected)
+
+
+class CompactQTableTests(SimpleTestCase):
+    """ArrayQTable et MemmapQTable ne stockent que les cases libres"""
+
+    def setUp(self):
+        self.grid = generate_maze(21, 21, algorithm='prim', seed=0)
+        self.n_valid = sum(cell != '#' for row in self.grid for cell in row)
+        self.wall = next((r, c) for r, row in enumerate(self.grid)
+                         for c, cell in enumerate(row) if cell == '#')
+        values = np.random.default_rng(0).random((21 * 21, 4))
+        values[[cell == '#' for row in self.grid for cell in row]] = 0.0
+        self.values = values
+
+    def test_only_free_cells_are_stored(self):
+        for table in (ArrayQTable(self.grid), MemmapQTable(self.grid)):
+            with self.subTest(table=type(table).__name__):
+                self.assertEqual(table.values.shape, (self.n_valid, 4))
+                self.assertEqual(len(table), self.n_valid)
+                self.assertNotIn(self.wall, table)
+
+    def test_load_and_to_array_round_trip(self):
+        for table in (ArrayQTable(self.grid), MemmapQTable(self.grid)):
+            with self.subTest(table=type(table).__name__):
+                table.load(self.values)
+                np.testing.assert_array_equal(table.to_array(), self.values)
+                np.testing.assert_array_equal(q_table_to_array(table, 21, 21), self.values)
+                state = next(iter(table))
+                np.testing.assert_array_equal(table[state], self.values[table.state_id(state)])
+
+    def test_flat_offsets_address_each_state(self):
+        table = ArrayQTable(self.grid)
+        table.load(self.values)
+        flat, offsets = table.flat_offsets()
+        for state in table:
+            sid = table.state_id(state)
+            self.assertEqual([flat[offsets[sid] + a] for a in range(4)],
+                             self.values[sid].tolist())
+        self.assertEqual(offsets[table.state_id(self.wall)], -1)
+
+    def test_writes_go_to_the_table(self):
+        table = ArrayQTable(self.grid)
+        state = next(iter(table))
+        table[state][2] = 1.5
+        flat, offsets = table.flat_offsets()
+        self.assertEqual(flat[offsets[table.state_id(state)] + 2], 1.5)
+        self.assertEqual(table.row_views()[table.state_id(state)][2], 1.5)
+
+    def test_pickle_keeps_values(self):
+        table = ArrayQTable(self.grid)
+        table.load(self.values)
+        restored = pickle.loads(pickle.dumps(table))
+        np.testing.assert_array_equal(restored.to_array(), self.values)
@@ -0,0 +1,48 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from rl_engine.generator import generate_maze
+from rl_engine.maze import MAZES, compile_maze
+from rl_engine.planner import bfs
+from rl_engine.sweeping import PrioritizedSweeping
+
+from .test_dyna import train_until_optimal
+
+
+class PrioritizedSweepingTests(SimpleTestCase):
+    """Balayage prioritaire : la récompense de G remonte en un balayage"""
+
+    def test_one_sweep_propagates_the_goal_reward(self):
+        grid = [list('S...G')]
+        env = compile_maze(grid)
+        model = PrioritizedSweeping(env, np.random.default_rng(0))
+        right = [int(np.flatnonzero(env.next_state[sid] == sid + 1)[0]) for sid in range(4)]
+        # Transitions observées depuis S, dans l'ordre d'un épisode
+        for sid in range(4):
+            model.record(sid, right[sid])
+        values = np.zeros((env.n_states, 4))
+        states, _ = model.plan(values, None, alpha=0.1, gamma=0.9, n_updates=100)
+        self.assertEqual(sorted(states.tolist()), [0, 1, 2, 3])
+        optimal = bfs(grid, gamma=0.9)['q_table']
+        for sid in range(4):
+            self.assertAlmostEqual(values[sid, right[sid]], optimal[(0, sid)][right[sid]])
+
+    def test_sweep_stops_below_theta(self):
+        env = compile_maze(MAZES[0])
+        model = PrioritizedSweeping(env, np.random.default_rng(0))
+        model.record(env.start, int(np.flatnonzero(env.valid_mask[env.start])[0]))
+        values = np.zeros((env.n_states, 4))
+        self.assertEqual(len(model.plan(values, None, 0.1, 0.9, 10)[0]), 1)
+        # Valeur déjà à jour : plus rien à balayer
+        self.assertEqual(len(model.plan(values, None, 0.1, 0.9, 10)[0]), 0)
+
+    def test_converges_before_uniform_dyna(self):
+        for i, grid in enumerate((MAZES[3], generate_maze(15, 15, 'prim', seed=0))):
+            with self.subTest(maze=i):
+                uniform, _ = train_until_optimal(grid, planning_steps=5)
+                swept, history = train_until_optimal(grid, planning_steps=5,
+                                                     scheduler='prioritized')
+                self.assertLess(swept.converged_episode, uniform.converged_episode)
+                steps = sum(item['steps'] for item in history)
+                self.assertLessEqual(swept.planning_updates_run, 5 * steps)
+                self.assertGreater(swept.planning_updates_run, 0)
@@ -0,0 +1,60 @@
+import os
+import pickle
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from rl_engine.cache import isolated_cache
+from rl_engine.q_learner import get_optimal_path, train_with_live_updates
+
+from appgamme import warmup
+from appgamme.views import DEMO_MAZE, DEMO_PARAMS, TRAINING_PAGE_HISTORY
+
+
+class WarmupTests(SimpleTestCase):
+    """Résultats précalculés : enregistrés, rechargés et servis depuis le cache"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = warmup.presolve()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'warmup.pkl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_only_page_calls_are_presolved(self):
+        self.assertEqual([params['grid'] for _, params in warmup.warmup_calls()],
+                         [DEMO_MAZE, DEMO_MAZE])
+        self.assertEqual(len(self.results), 2)
+
+    def test_loaded_artifact_serves_the_views_calls(self):
+        warmup.save_artifact(self.path, self.results)
+        with isolated_cache() as cache:
+            self.assertEqual(warmup.load_warmup(self.path), 2)
+            get_optimal_path(grid=DEMO_MAZE, **DEMO_PARAMS)
+            train_with_live_updates(grid=DEMO_MAZE, **DEMO_PARAMS, **TRAINING_PAGE_HISTORY)
+            self.assertEqual((cache.hits, cache.misses), (2, 0))
+
+    def test_stale_or_unreadable_artifact_is_ignored(self):
+        warmup.save_artifact(self.path, self.results)
+        with mock.patch.object(warmup, 'engine_fingerprint', return_value='autre moteur'):
+            self.assertIsNone(warmup.load_artifact(self.path))
+            self.assertEqual(warmup.load_warmup(self.path), 0)
+        with open(self.path, 'wb') as f:
+            f.write(b'pas un pickle')
+        self.assertIsNone(warmup.load_artifact(self.path))
+        self.assertIsNone(warmup.load_artifact(os.path.join(self.directory.name, 'absent.pkl')))
+
+    def test_warm_up_saves_then_loads(self):
+        with isolated_cache(), mock.patch.object(warmup, 'presolve', return_value=self.results):
+            first = warmup.warm_up(self.path)
+            second = warmup.warm_up(self.path)
+        self.assertEqual((first['loaded'], first['saved']), (False, True))
+        self.assertEqual((second['loaded'], second['saved']), (True, False))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(pickle.load(f)['engine'], warmup.engine_fingerprint())
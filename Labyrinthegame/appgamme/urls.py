@@ -1,12 +1,17 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, async_views
+
+# Sous ASGI, les vues d'entraînement attendent l'exécuteur sans occuper de thread
+# et les réponses en flux sont des itérateurs asynchrones (synchrones sous WSGI)
+training_views = async_views if getattr(settings, 'TRAINING_ASYNC_VIEWS', False) else views
 
 urlpatterns = [
     # Page d'accueil
     path('', views.home_view, name='home'),
     
     # Page de démonstration avec un labyrinthe exemple
-    path('demo/', views.demo_view, name='demo'),
+    path('demo/', training_views.demo_view, name='demo'),
     
     # Page pour choisir parmi les labyrinthes prédéfinis
     path('choose/', views.choose_maze_view, name='choose_maze'),
@@ -24,8 +29,26 @@ urlpatterns = [
     path('solve-custom/', views.solve_custom_maze_view, name='solve_custom_maze'),
     
     # Page de visualisation d'entraînement
-    path('training/', views.training_view, name='training'),
+    path('training/', training_views.training_view, name='training'),
     
     # API pour l'entraînement en temps réel (NOUVELLE ROUTE)
-    path('api/train/', views.train_api, name='train_api'),
+    path('api/train/', training_views.train_api, name='train_api'),
+    
+    # API d'entraînement en flux (NDJSON, un épisode par ligne)
+    path('api/train/stream/', training_views.train_stream_api, name='train_stream_api'),
+    
+    # État de la file d'entraînement (profondeur, limites)
+    path('api/train/status/', views.train_status_api, name='train_status_api'),
+    
+    # Entraînements asynchrones : soumission, état, résultat, annulation
+    path('api/jobs/', views.job_submit_api, name='job_submit_api'),
+    path('api/jobs/<uuid:job_id>/', views.job_status_api, name='job_status_api'),
+    path('api/jobs/<uuid:job_id>/result/', views.job_result_api, name='job_result_api'),
+    path('api/jobs/<uuid:job_id>/cancel/', views.job_cancel_api, name='job_cancel_api'),
+    
+    # Avancement d'un job en flux Server-Sent Events
+    path('api/jobs/<uuid:job_id>/events/', training_views.job_events_api, name='job_events_api'),
+    
+    # Métriques opérationnelles (format texte de Prometheus)
+    path('metrics/', views.metrics_view, name='metrics'),
 ]
\ No newline at end of file
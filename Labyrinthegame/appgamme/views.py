@@ -1,9 +1,25 @@
-from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from rl_engine.q_learner import get_optimal_path, train_with_live_updates
-from rl_engine.maze import MAZES
+from rl_engine.q_learner import (
+    get_optimal_path, train_with_live_updates, HISTORY_POLICIES,
+    QLearnerWithVisualization, validate_convergence
+)
+from rl_engine.maze import MAZES, Maze
+from rl_engine.generator import GENERATORS, generate_maze
+from rl_engine.encoding import encode_history
+from rl_engine.metrics import get_registry
+from .executor import get_executor, ExecutorBusy, TrainingTimeout
+from .metrics import instrument_view
+from .jobs import submit_job, cancel_job, expire_stale_jobs
+from .models import TrainingJob
+from .qstore import stream_and_store, train_and_store
+from .admission import (
+    get_admission_controller, client_id_for, BudgetExceeded, Overloaded
+)
 import json
+import random
+import time
 
 
 def home_view(request):
@@ -11,111 +27,172 @@ def home_view(request):
     return render(request, 'home.html')
 
 
+# Labyrinthe des pages de démonstration et d'entraînement
+DEMO_MAZE = [
+    ['S', '.', '#', '.', '.'],
+    ['.', '#', '#', '.', '#'],
+    ['.', '.', '.', '.', '.'],
+    ['#', '#', '.', '#', '.'],
+    ['.', '.', '.', '.', 'G']
+]
+
+# Paramètres d'entraînement des pages de démonstration et d'entraînement
+DEMO_PARAMS = {
+    'alpha': 0.1,
+    'gamma': 0.9,
+    'epsilon': 0.1,
+    'episodes': 1000,
+    'seed': 0,
+}
+
+
+def _demo_context(maze_grid, path):
+    """Contexte du template demo.html à partir du chemin trouvé"""
+    if not path or len(path) <= 1:
+        return {
+            'maze': maze_grid,
+            'path_str': [],
+            'error': 'Aucun chemin trouvé',
+            'success': False
+        }
+    
+    # Convertir en format JSON pour JavaScript
+    path_str = [f"{r},{c}" for r, c in path]
+    return {
+        'maze': maze_grid,
+        'path_str': json.dumps(path_str),  # JSON pour JavaScript
+        'error': None,
+        'success': True
+    }
+
+
+def _demo_error_context(maze_grid, error):
+    """Contexte du template demo.html en cas d'erreur"""
+    return {
+        'maze': maze_grid,
+        'path_str': json.dumps([]),
+        'error': str(error),
+        'success': False
+    }
+
+
+@instrument_view('demo_view')
 def demo_view(request):
     """
     Démonstration avec animation progressive (Option 1)
     """
-    maze_grid = [
-        ['S', '.', '#', '.', '.'],
-        ['.', '#', '#', '.', '#'],
-        ['.', '.', '.', '.', '.'],
-        ['#', '#', '.', '#', '.'],
-        ['.', '.', '.', '.', 'G']
-    ]
+    maze_grid = DEMO_MAZE
+    
+    # ?solver=bfs|value_iteration|astar pour une résolution directe sans apprentissage
+    solver = request.GET.get('solver', 'qlearning')
     
     try:
-        path = get_optimal_path(
-            grid=maze_grid,
-            alpha=0.1,
-            gamma=0.9,
-            epsilon=0.1,
-            episodes=1000
-        )
-        
-        if not path or len(path) <= 1:
-            context = {
-                'maze': maze_grid,
-                'path_str': [],
-                'error': 'Aucun chemin trouvé',
-                'success': False
-            }
+        if solver == 'qlearning':
+            path = get_executor().run(get_optimal_path, grid=maze_grid, **DEMO_PARAMS)
         else:
-            # Convertir en format JSON pour JavaScript
-            path_str = [f"{r},{c}" for r, c in path]
-            context = {
-                'maze': maze_grid,
-                'path_str': json.dumps(path_str),  # JSON pour JavaScript
-                'error': None,
-                'success': True
-            }
+            # Les planificateurs sont assez rapides pour s'exécuter dans la requête
+            path = get_optimal_path(grid=maze_grid, gamma=DEMO_PARAMS['gamma'], solver=solver)
+        context = _demo_context(maze_grid, path)
     except Exception as e:
-        context = {
-            'maze': maze_grid,
-            'path_str': json.dumps([]),
-            'error': str(e),
-            'success': False
-        }
+        context = _demo_error_context(maze_grid, e)
     
     return render(request, 'demo.html', context)
 
 
+def _training_context(maze_grid, training_result):
+    """Contexte du template training.html à partir du résultat d'entraînement"""
+    # Historique au format compact, décodé par le template
+    history_packed = encode_history(training_result['history'], maze_grid)
+    
+    final_path = [f"{r},{c}" for r, c in training_result['final_path']]
+    
+    return {
+        'maze': maze_grid,
+        'training_data': json.dumps({
+            'history_packed': history_packed,
+            'final_path': final_path
+        })
+    }
+
+
+def _training_error_context(maze_grid, error):
+    """Contexte du template training.html en cas d'erreur"""
+    return {
+        'maze': maze_grid,
+        'training_data': json.dumps({
+            'history': [],
+            'final_path': []
+        }),
+        'error': str(error)
+    }
+
+
+# Le template n'affiche le chemin que tous les 50 épisodes
+TRAINING_PAGE_HISTORY = {'history': 'every_n', 'history_every': 50}
+
+# Mises à jour Dyna-Q simulées par pas réel acceptées par les API
+MAX_PLANNING_STEPS = 50
+
+# Intervalle entre deux lectures de l'avancement d'un job (secondes)
+EVENTS_POLL_INTERVAL = 0.5
+
+# Commentaire SSE envoyé périodiquement pour garder la connexion ouverte (secondes)
+EVENTS_KEEPALIVE = 15.0
+
+
+@instrument_view('training_view')
 def training_view(request):
     """
     Visualisation de l'entraînement en direct (Option 2)
     """
-    maze_grid = [
-        ['S', '.', '#', '.', '.'],
-        ['.', '#', '#', '.', '#'],
-        ['.', '.', '.', '.', '.'],
-        ['#', '#', '.', '#', '.'],
-        ['.', '.', '.', '.', 'G']
-    ]
+    maze_grid = DEMO_MAZE
     
     try:
         # Entraîner et récupérer l'historique
-        training_result = train_with_live_updates(
+        training_result = get_executor().run(
+            train_with_live_updates,
             grid=maze_grid,
-            alpha=0.1,
-            gamma=0.9,
-            epsilon=0.1,
-            episodes=1000
+            **DEMO_PARAMS,
+            **TRAINING_PAGE_HISTORY
         )
-        
-        # Préparer les données pour le template
-        history_simplified = []
-        for episode_data in training_result['history']:
-            history_simplified.append({
-                'episode': episode_data['episode'],
-                'reward': episode_data['reward'],
-                'steps': episode_data['steps'],
-                'path': [f"{r},{c}" for r, c in episode_data['path']]
-            })
-        
-        final_path = [f"{r},{c}" for r, c in training_result['final_path']]
-        
-        context = {
-            'maze': maze_grid,
-            'training_data': json.dumps({
-                'history': history_simplified,
-                'final_path': final_path
-            })
-        }
-        
+        context = _training_context(maze_grid, training_result)
     except Exception as e:
-        context = {
-            'maze': maze_grid,
-            'training_data': json.dumps({
-                'history': [],
-                'final_path': []
-            }),
-            'error': str(e)
-        }
+        context = _training_error_context(maze_grid, e)
     
     return render(request, 'training.html', context)
 
 
+def _random_maze(params):
+    """
+    Génère le labyrinthe aléatoire demandé par choose_maze_view
+    
+    Paramètres GET : rows, cols (3 à 20, comme create_maze_view), algorithm,
+    density (obstacles) et seed (tirée au hasard si absente, puis affichée
+    pour pouvoir reproduire le labyrinthe).
+    
+    Raises:
+        ValueError: si un paramètre est invalide
+    """
+    rows = max(3, min(20, int(params.get('rows', 10))))
+    cols = max(3, min(20, int(params.get('cols', 10))))
+    algorithm = params.get('algorithm', 'backtracker')
+    density = max(0.0, min(0.6, float(params.get('density', 0.3))))
+    seed = params.get('seed')
+    seed = int(seed) if seed else random.randrange(2 ** 31)
+    
+    grid = generate_maze(rows, cols, algorithm=algorithm, seed=seed, density=density)
+    return {
+        'grid': grid,
+        'rows': rows,
+        'cols': cols,
+        'algorithm': algorithm,
+        'density': density,
+        'seed': seed
+    }
+
+
 def choose_maze_view(request):
-    """Affiche la liste des labyrinthes prédéfinis"""
+    """Affiche la liste des labyrinthes prédéfinis (et un labyrinthe aléatoire sur demande)"""
     mazes_data = []
     
     for idx, maze in enumerate(MAZES):
@@ -126,7 +203,15 @@ def choose_maze_view(request):
             'index': idx
         })
     
-    context = {'mazes': mazes_data}
+    context = {'mazes': mazes_data, 'generators': GENERATORS}
+    
+    # ?random=1 : labyrinthe généré, résolu comme un labyrinthe personnalisé
+    if 'random' in request.GET:
+        try:
+            context['random_maze'] = _random_maze(request.GET)
+        except ValueError as e:
+            context['random_error'] = f'Paramètres invalides: {str(e)}'
+    
     return render(request, 'choose_maze.html', context)
 
 
@@ -243,9 +328,10 @@ def solve_custom_maze_view(request):
                 row.append(cell_value)
             maze_grid.append(row)
         
-        # Validation
-        s_count = sum(row.count('S') for row in maze_grid)
-        g_count = sum(row.count('G') for row in maze_grid)
+        # Validation (tableau compact, comptages et accessibilité vectorisés)
+        maze = Maze(maze_grid)
+        s_count = maze.start_count
+        g_count = maze.goal_count
         
         if s_count == 0:
             context = {
@@ -287,6 +373,16 @@ def solve_custom_maze_view(request):
             }
             return render(request, 'solved_maze.html', context)
         
+        if not maze.is_solvable():
+            context = {
+                'error': 'Aucun chemin possible entre le départ (S) et l\'arrivée (G)',
+                'maze': maze_grid,
+                'maze_json': json.dumps(maze_grid),
+                'path_str': json.dumps([]),
+                'success': False
+            }
+            return render(request, 'solved_maze.html', context)
+        
         context = {
             'maze': maze_grid,
             'maze_json': json.dumps(maze_grid),
@@ -315,73 +411,506 @@ def solve_custom_maze_view(request):
     return render(request, 'solved_maze.html', context)
 
 
+def _check_train_budget(params):
+    """
+    Vérifie le budget par requête (épisodes, nombre de cases, coût estimé)
+
+    Appelé avant _validate_train_maze : une grille trop grande est refusée
+    sans être convertie ni parcourue (retourne une réponse d'erreur ou None).
+    """
+    grid = params['grid']
+    if not isinstance(grid, list) or not all(isinstance(row, (list, str)) for row in grid):
+        # Grille mal formée : refusée par _validate_train_maze
+        return None
+    try:
+        get_admission_controller().check_request(grid, params['episodes'])
+    except BudgetExceeded as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    return None
+
+
+def _validate_train_maze(maze_grid):
+    """Valide la grille reçue par les API d'entraînement (retourne une réponse d'erreur ou None)"""
+    if not maze_grid:
+        return JsonResponse({'error': 'Grille invalide'}, status=400)
+    
+    try:
+        maze = Maze(maze_grid)
+    except ValueError as e:
+        return JsonResponse({'error': f'Grille invalide: {str(e)}', 'success': False}, status=400)
+    
+    s_count = maze.start_count
+    g_count = maze.goal_count
+    
+    if s_count != 1:
+        return JsonResponse({
+            'error': f'Le labyrinthe doit contenir exactement un point de départ (S). Trouvé: {s_count}',
+            'success': False
+        }, status=400)
+    
+    if g_count != 1:
+        return JsonResponse({
+            'error': f'Le labyrinthe doit contenir exactement un point d\'arrivée (G). Trouvé: {g_count}',
+            'success': False
+        }, status=400)
+    
+    # Cases inconnues, G inaccessible depuis S
+    valid, message = maze.validate()
+    if not valid:
+        return JsonResponse({'error': message, 'success': False}, status=400)
+    
+    return None
+
+
+def _int_param(data, name, default):
+    """Paramètre entier d'une requête JSON (ValueError si ce n'est pas un entier JSON)"""
+    value = data.get(name, default)
+    # Ni booléen, ni chaîne, ni nombre à virgule (pas de conversion silencieuse)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} doit être un entier")
+    return value
+
+
+def _bool_param(data, name):
+    """Paramètre booléen d'une requête JSON (faux par défaut)"""
+    value = data.get(name, False)
+    if not isinstance(value, bool):
+        raise ValueError(f"{name} doit être un booléen")
+    return value
+
+
+def _choice_param(data, name, default, choices, message):
+    """Paramètre d'une requête JSON parmi des noms autorisés (ValueError avec message sinon)"""
+    value = data.get(name, default)
+    if not isinstance(value, str) or value not in choices:
+        raise ValueError(f"{message}: {value}")
+    return value
+
+
+def _seed_param(data):
+    """Graine d'une requête JSON : entier positif ou nul, ou null (tirage non reproductible)"""
+    seed = data.get('seed')
+    if seed is None:
+        return None
+    if isinstance(seed, bool) or not isinstance(seed, int) or seed < 0:
+        raise ValueError("seed doit être un entier positif ou nul, ou null")
+    return seed
+
+
+def _training_params(data):
+    """
+    Extrait et valide les paramètres d'entraînement d'une requête JSON
+    
+    Returns:
+        Dict de paramètres pour train_with_live_updates / stream_live_updates
+    
+    Raises:
+        ValueError: si un paramètre est invalide
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Le corps de la requête doit être un objet JSON")
+    history = _choice_param(data, 'history', 'every_n', HISTORY_POLICIES,
+                            "Politique d'historique inconnue")
+    history_every = _int_param(data, 'history_every', 10)
+    if history_every < 1:
+        raise ValueError("history_every doit être supérieur ou égal à 1")
+    planning_steps = _int_param(data, 'planning_steps', 0)
+    if not 0 <= planning_steps <= MAX_PLANNING_STEPS:
+        raise ValueError(f"planning_steps doit être compris entre 0 et {MAX_PLANNING_STEPS}")
+    scheduler = _choice_param(data, 'scheduler', 'uniform', QLearnerWithVisualization.SCHEDULERS,
+                              "Ordonnanceur de planification inconnu")
+    backend = _choice_param(data, 'backend', 'dict', QLearnerWithVisualization.BACKENDS,
+                            "Backend de Q-table inconnu")
+    return {
+        'grid': data.get('maze', []),
+        'alpha': 0.1,
+        'gamma': 0.9,
+        'epsilon': 0.1,
+        'episodes': _int_param(data, 'episodes', 1000),
+        # 'dict' : backend le plus rapide pour la boucle pas à pas (voir QLearnerWithVisualization.BACKENDS)
+        'backend': backend,
+        'seed': _seed_param(data),
+        # Par défaut : résumé de chaque épisode, détails tous les 10 épisodes
+        'history': history,
+        'history_every': history_every,
+        # Arrêt anticipé, ex. {"patience": 20} ou {"optimal": true}
+        'convergence': validate_convergence(data.get('convergence')),
+        # Reprise depuis la Q-table enregistrée pour ce labyrinthe (voir qstore.py)
+        'warm_start': _bool_param(data, 'warm_start'),
+        # Mises à jour Dyna-Q simulées par pas réel (0 : Q-learning seul)
+        'planning_steps': planning_steps,
+        # 'uniform' (Dyna-Q) ou 'prioritized' (balayage prioritaire depuis G)
+        'scheduler': scheduler,
+    }
+
+
+def _overloaded_response(message, retry_after):
+    """Réponse 429 avec l'en-tête Retry-After"""
+    response = JsonResponse({'error': message, 'success': False}, status=429)
+    response['Retry-After'] = str(retry_after)
+    return _with_queue_depth(response)
+
+
+def _with_queue_depth(response):
+    """Ajoute le nombre d'entraînements en cours (X-Queue-Depth) à une réponse"""
+    response['X-Queue-Depth'] = str(get_admission_controller().in_flight)
+    return response
+
+
+def _parse_train_request(request):
+    """
+    Lit le corps JSON d'une requête train_api
+    
+    Returns:
+        Tuple (params, encoding)
+    
+    Raises:
+        ValueError: si le corps ou un paramètre est invalide
+    """
+    data = json.loads(request.body)
+    params = _training_params(data)
+    # "debug": true ajoute à la réponse le profilage de l'entraînement
+    params['profile'] = _bool_param(data, 'debug')
+    encoding = _choice_param(data, 'encoding', 'json', ('json', 'packed'), "Encodage inconnu")
+    return params, encoding
+
+
+def _train_response(result, params, encoding):
+    """Réponse JSON de train_api à partir du résultat d'entraînement"""
+    converged_episode = result['converged_episode']
+    episodes = params['episodes']
+    response_data = {
+        'success': True,
+        'final_path': result['final_path'],
+        'total_episodes': episodes if converged_episode is None else converged_episode + 1,
+        'converged_episode': converged_episode
+    }
+    # Les épisodes ne contiennent que les champs retenus par la politique d'historique
+    if encoding == 'packed':
+        response_data['history_packed'] = encode_history(result['history'], params['grid'])
+    else:
+        response_data['history'] = result['history']
+    if 'profile' in result:
+        response_data['profile'] = result['profile']
+    return _with_queue_depth(JsonResponse(response_data))
+
+
+def _train_error_response(error):
+    """Réponse d'erreur de train_api selon le type d'exception"""
+    if isinstance(error, BudgetExceeded):
+        return JsonResponse({'error': str(error), 'success': False}, status=400)
+    if isinstance(error, Overloaded):
+        return _overloaded_response(str(error), error.retry_after)
+    if isinstance(error, ExecutorBusy):
+        return _overloaded_response(str(error), get_admission_controller().config['retry_after'])
+    if isinstance(error, TrainingTimeout):
+        return JsonResponse({'error': str(error), 'success': False}, status=504)
+    if isinstance(error, ValueError):
+        return JsonResponse({
+            'error': f'Erreur de validation: {str(error)}',
+            'success': False
+        }, status=400)
+    return JsonResponse({
+        'error': f'Erreur lors de l\'entraînement: {str(error)}',
+        'success': False
+    }, status=500)
+
+
+@instrument_view('train_api')
 def train_api(request):
     """API pour l'entraînement en temps réel"""
     if request.method != 'POST':
         return JsonResponse({'error': 'Méthode non autorisée'}, status=405)
     
     try:
-        data = json.loads(request.body)
-        maze_grid = data.get('maze', [])
-        episodes = data.get('episodes', 1000)
+        params, encoding = _parse_train_request(request)
+        maze_grid = params['grid']
         
-        # Validation
-        if not maze_grid:
-            return JsonResponse({'error': 'Grille invalide'}, status=400)
+        error_response = _check_train_budget(params) or _validate_train_maze(maze_grid)
+        if error_response:
+            return error_response
         
-        # Validation du labyrinthe
-        s_count = sum(row.count('S') for row in maze_grid)
-        g_count = sum(row.count('G') for row in maze_grid)
+        ticket = get_admission_controller().admit(client_id_for(request), maze_grid, params['episodes'])
+        executor = get_executor()
+        try:
+            # Entraîner l'agent (la Q-table apprise est enregistrée)
+            future = executor.submit_with_timeout(train_and_store, **params)
+        except Exception:
+            ticket.release()
+            raise
+        ticket.release_when_done(future)
+        result = executor.wait(future)
         
-        if s_count != 1:
-            return JsonResponse({
-                'error': f'Le labyrinthe doit contenir exactement un point de départ (S). Trouvé: {s_count}',
-                'success': False
-            }, status=400)
+        return _train_response(result, params, encoding)
         
-        if g_count != 1:
-            return JsonResponse({
-                'error': f'Le labyrinthe doit contenir exactement un point d\'arrivée (G). Trouvé: {g_count}',
-                'success': False
-            }, status=400)
+    except Exception as e:
+        return _train_error_response(e)
+
+
+class EventLines:
+    """
+    Lignes NDJSON des événements d'un EventStream (voir executor.submit_stream)
+
+    Django appelle close() sur le contenu d'une StreamingHttpResponse à la fin
+    de la réponse, même si le client s'est déconnecté avant la première ligne :
+    le job est alors arrêté.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def __iter__(self):
+        try:
+            for event in self.stream:
+                yield json.dumps(event) + '\n'
+        except Exception as e:
+            yield _stream_error_line(e)
+    
+    def close(self):
+        self.stream.close()
+
+
+def _stream_error_line(error):
+    """Ligne NDJSON d'un entraînement en flux qui a échoué"""
+    return json.dumps({'type': 'error', 'error': f'Erreur lors de l\'entraînement: {str(error)}'}) + '\n'
+
+
+def _start_train_stream(request):
+    """
+    Valide une requête de train_stream_api et soumet l'entraînement en flux
+
+    Returns:
+        Tuple (EventStream, None), ou (None, réponse d'erreur)
+    """
+    if request.method != 'POST':
+        return None, JsonResponse({'error': 'Méthode non autorisée'}, status=405)
+    
+    try:
+        data = json.loads(request.body)
+        params = _training_params(data)
+        maze_grid = params['grid']
+        episodes = params['episodes']
+    except ValueError as e:
+        return None, JsonResponse({
+            'error': f'Erreur de validation: {str(e)}',
+            'success': False
+        }, status=400)
+    
+    error_response = _check_train_budget(params) or _validate_train_maze(maze_grid)
+    if error_response:
+        return None, error_response
+    
+    try:
+        ticket = get_admission_controller().admit(client_id_for(request), maze_grid, episodes)
+        try:
+            # L'entraînement s'exécute dans le pool, les épisodes arrivent au fil de l'eau
+            stream = get_executor().submit_stream(stream_and_store, **params)
+        except Exception:
+            ticket.release()
+            raise
+        ticket.release_when_done(stream.future)
+    except BudgetExceeded as e:
+        return None, JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Overloaded as e:
+        return None, _overloaded_response(str(e), e.retry_after)
+    except ExecutorBusy as e:
+        return None, _overloaded_response(str(e), get_admission_controller().config['retry_after'])
+    return stream, None
+
+
+def _stream_response(content, content_type):
+    """Réponse en flux envoyée sans mise en tampon"""
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Cache-Control'] = 'no-cache'
+    # Désactive la mise en tampon des proxys (nginx) pour envoyer chaque événement immédiatement
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def train_stream_api(request):
+    """
+    API d'entraînement en flux (NDJSON)
+    
+    Chaque ligne est un objet JSON envoyé dès que l'épisode est terminé :
+    {"type": "episode", "data": {...}}, puis {"type": "done", ...}, ou
+    {"type": "error", "error": "..."} si l'entraînement échoue en cours de route.
+    Version WSGI (générateur synchrone) ; sous ASGI, voir async_views.train_stream_api.
+    """
+    stream, error_response = _start_train_stream(request)
+    if error_response:
+        return error_response
+    # La fermeture de la réponse (fin ou client déconnecté) arrête le job
+    return _with_queue_depth(_stream_response(EventLines(stream), 'application/x-ndjson'))
+
+
+def train_status_api(request):
+    """État de la file d'entraînement (profondeur et limites)"""
+    controller = get_admission_controller()
+    return JsonResponse({
+        'queue_depth': controller.in_flight,
+        'max_concurrent': controller.config['max_concurrent'],
+        'executor_in_flight': get_executor().in_flight,
+        'max_episodes': controller.config['max_episodes'],
+        'max_cells': controller.config['max_cells'],
+    })
+
+
+def metrics_view(request):
+    """Métriques de tous les processus au format texte de Prometheus"""
+    return HttpResponse(get_registry().exposition(),
+                        content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def _job_status(job):
+    """Représentation JSON de l'état d'un job"""
+    return {
+        'job_id': str(job.id),
+        'status': job.status,
+        'progress': job.progress,
+        'episodes_done': job.episodes_done,
+        'episodes_total': job.episodes_total,
+        'error': job.error or None,
+        'created_at': job.created_at.isoformat(),
+    }
+
+
+def job_submit_api(request):
+    """
+    Soumet un entraînement asynchrone (mêmes paramètres que train_api)
+    
+    Répond 202 avec l'identifiant du job ; un job identique déjà en attente ou
+    en cours est réutilisé ('deduplicated': true).
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Méthode non autorisée'}, status=405)
+    
+    try:
+        params = _training_params(json.loads(request.body))
+        error_response = _check_train_budget(params) or _validate_train_maze(params['grid'])
+        if error_response:
+            return error_response
         
-        # Entraîner l'agent
-        result = train_with_live_updates(
-            grid=maze_grid,
-            alpha=0.1,
-            gamma=0.9,
-            epsilon=0.1,
-            episodes=episodes
+        ticket = get_admission_controller().admit(
+            client_id_for(request), params['grid'], params['episodes']
         )
+        try:
+            job, deduplicated = submit_job(params, on_finish=ticket.release)
+        except Exception:
+            ticket.release()
+            raise
+        if deduplicated:
+            # Aucun nouveau calcul : la place n'est pas consommée
+            ticket.release()
         
-        # Simplifier l'historique pour le JSON
-        history_simplified = []
-        for episode_data in result['history']:
-            history_simplified.append({
-                'episode': episode_data['episode'],
-                'reward': episode_data['reward'],
-                'steps': episode_data['steps'],
-                'path': episode_data['path'],
-                'best_path': episode_data.get('best_path', []),
-                'errors': episode_data.get('errors', []),
-                'explorations': episode_data.get('explorations', 0),
-                'reached_goal': episode_data.get('reached_goal', False)
-            })
-        
-        return JsonResponse({
-            'success': True,
-            'history': history_simplified,
-            'final_path': result['final_path'],
-            'total_episodes': len(history_simplified)
-        })
-        
+        data = _job_status(job)
+        data['deduplicated'] = deduplicated
+        return _with_queue_depth(JsonResponse(data, status=202))
+    
+    except BudgetExceeded as e:
+        return JsonResponse({'error': str(e), 'success': False}, status=400)
+    except Overloaded as e:
+        return _overloaded_response(str(e), e.retry_after)
+    except ExecutorBusy as e:
+        return _overloaded_response(str(e), get_admission_controller().config['retry_after'])
     except ValueError as e:
         return JsonResponse({
             'error': f'Erreur de validation: {str(e)}',
             'success': False
         }, status=400)
-    except Exception as e:
-        return JsonResponse({
-            'error': f'Erreur lors de l\'entraînement: {str(e)}',
-            'success': False
-        }, status=500)
\ No newline at end of file
+
+
+def _get_job(job_id):
+    """Job demandé (404 s'il n'existe pas), en échec si son processus ne répond plus"""
+    expire_stale_jobs(pk=job_id)
+    return get_object_or_404(TrainingJob, pk=job_id)
+
+
+def job_status_api(request, job_id):
+    """État et avancement d'un job"""
+    job = _get_job(job_id)
+    return JsonResponse(_job_status(job))
+
+
+def job_result_api(request, job_id):
+    """Résultat d'un job terminé (?encoding=packed pour l'historique compact)"""
+    job = _get_job(job_id)
+    
+    if job.status in TrainingJob.ACTIVE_STATUSES:
+        return JsonResponse(_job_status(job), status=202)
+    if job.status != TrainingJob.DONE:
+        data = _job_status(job)
+        data['success'] = False
+        return JsonResponse(data, status=409)
+    
+    result = job.result
+    response_data = {
+        'success': True,
+        'job_id': str(job.id),
+        'final_path': result['final_path'],
+        'total_episodes': result['total_episodes'],
+        'converged_episode': result['converged_episode'],
+    }
+    if request.GET.get('encoding') == 'packed':
+        response_data['history_packed'] = encode_history(result['history'], job.params['grid'])
+    else:
+        response_data['history'] = result['history']
+    return JsonResponse(response_data)
+
+
+def job_cancel_api(request, job_id):
+    """Annule un job en attente ou en cours"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Méthode non autorisée'}, status=405)
+    
+    job = _get_job(job_id)
+    cancelled = cancel_job(job)
+    job.refresh_from_db()
+    data = _job_status(job)
+    data['cancelled'] = cancelled
+    return JsonResponse(data, status=200 if cancelled else 409)
+
+
+def _sse(event, data):
+    """Formate un événement Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _job_events(job_id):
+    """Événements 'progress' à chaque changement d'état du job, puis 'end'"""
+    last_status = None
+    last_sent = time.monotonic()
+    while True:
+        expire_stale_jobs(pk=job_id)
+        job = TrainingJob.objects.filter(pk=job_id).first()
+        if job is None:
+            yield _sse('error', {'error': 'Job introuvable'})
+            return
+        
+        status = _job_status(job)
+        now = time.monotonic()
+        if status != last_status:
+            yield _sse('progress', status)
+            last_status = status
+            last_sent = now
+        elif now - last_sent >= EVENTS_KEEPALIVE:
+            yield ": keepalive\n\n"
+            last_sent = now
+        
+        if job.status not in TrainingJob.ACTIVE_STATUSES:
+            yield _sse('end', status)
+            return
+        time.sleep(EVENTS_POLL_INTERVAL)
+
+
+def job_events_api(request, job_id):
+    """
+    Avancement d'un job en flux Server-Sent Events (text/event-stream)
+    
+    Utilisable directement avec EventSource côté navigateur : un événement
+    'progress' (même contenu que job_status_api) à chaque changement, puis un
+    événement 'end' quand le job est terminé, annulé ou en échec.
+    Version WSGI (générateur synchrone) ; sous ASGI, voir async_views.job_events_api.
+    """
+    if not TrainingJob.objects.filter(pk=job_id).exists():
+        raise Http404("Job introuvable")
+    return _stream_response(_job_events(job_id), 'text/event-stream')
@@ -0,0 +1,166 @@
+"""
+Module warmup.py
+Préchauffage des processus : environnements compilés et résultats précalculés
+
+Au démarrage des serveurs (Labyrinthegame.wsgi, utilisé aussi par runserver, et
+Labyrinthegame.asgi, voir warm_up_server) ou avec « manage.py warmup » :
+    - les labyrinthes prédéfinis (MAZES) et DEMO_MAZE sont compilés
+      (rl_engine.maze.compile_maze), ainsi que les templates des pages ;
+    - les résultats des pages demo_view et training_view sont calculés avec
+      les appels exacts des vues : ils sont ajoutés au cache de résultats
+      sous les clés que les vues utiliseront. La page d'un labyrinthe
+      prédéfini (solve_maze_view) entraîne sans graine via /api/train/stream/ :
+      ses résultats ne sont pas mis en cache, rien n'est précalculé pour elle.
+Les résultats sont enregistrés dans un fichier (TRAINING_WARMUP['path']) :
+les autres processus (serveurs web, processus de l'exécuteur) les chargent au
+lieu de les recalculer. Le fichier porte une empreinte du code du moteur et
+est recalculé si le moteur a changé. Les autres commandes manage.py
+(migrate, shell, test...) ne préchauffent rien.
+"""
+
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Dict
+
+from django.conf import settings
+from django.template.loader import get_template
+
+from rl_engine import q_learner
+from rl_engine.cache import get_cache, isolated_cache
+from rl_engine.maze import MAZES, compile_maze
+from rl_engine.q_learner import get_optimal_path, train_with_live_updates
+
+from .views import DEMO_MAZE, DEMO_PARAMS, TRAINING_PAGE_HISTORY
+
+# Format du fichier de préchauffage
+WARMUP_VERSION = 1
+
+# Templates des pages servies juste après le démarrage
+WARMUP_TEMPLATES = ('demo.html', 'training.html', 'solved_maze.html')
+
+
+def warmup_calls():
+    """Appels précalculés (fonction, paramètres), identiques à ceux de demo_view et training_view"""
+    return [
+        (get_optimal_path, dict(grid=DEMO_MAZE, **DEMO_PARAMS)),
+        (train_with_live_updates, dict(grid=DEMO_MAZE, **DEMO_PARAMS, **TRAINING_PAGE_HISTORY)),
+    ]
+
+
+def engine_fingerprint() -> str:
+    """Empreinte du code du moteur (rl_engine) : les résultats en dépendent"""
+    digest = hashlib.sha256(str(WARMUP_VERSION).encode())
+    for path in sorted(Path(q_learner.__file__).parent.glob('*.py')):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def presolve() -> Dict[str, object]:
+    """Calcule les résultats précalculés et retourne {clé de cache: résultat}"""
+    calls = warmup_calls()
+    # Cache vide pendant le calcul : il ne contient ensuite que les résultats précalculés
+    with isolated_cache(maxsize=len(calls)) as cache:
+        for func, params in calls:
+            func(**params)
+        return dict(cache.items())
+
+
+def load_artifact(path) -> Dict[str, object]:
+    """Résultats enregistrés dans path, ou None (absent, illisible ou moteur modifié)"""
+    try:
+        with open(path, 'rb') as f:
+            artifact = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if not isinstance(artifact, dict) or artifact.get('engine') != engine_fingerprint():
+        return None
+    return artifact['results']
+
+
+def save_artifact(path, results: Dict[str, object]):
+    """Enregistre les résultats précalculés (remplacement atomique du fichier)"""
+    path = str(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'engine': engine_fingerprint(), 'results': results}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_warmup(path) -> int:
+    """
+    Ajoute au cache du processus les résultats enregistrés, sans rien calculer
+
+    Utilisé par les processus de l'exécuteur (voir executor.init_worker).
+
+    Returns:
+        Nombre de résultats chargés
+    """
+    results = load_artifact(path) if path else None
+    if not results:
+        return 0
+    get_cache().update(results)
+    return len(results)
+
+
+def warm_up(path=None, rebuild: bool = False) -> Dict:
+    """
+    Préchauffe le processus
+
+    Args:
+        path: Fichier des résultats précalculés (None : calculés en mémoire seulement)
+        rebuild: Recalcule les résultats même si le fichier est à jour
+
+    Returns:
+        Dict {'mazes', 'templates', 'results', 'loaded', 'saved', 'elapsed_ms'}
+    """
+    started = time.perf_counter()
+    grids = [DEMO_MAZE, *MAZES]
+    for grid in grids:
+        compile_maze(grid)
+    for name in WARMUP_TEMPLATES:
+        get_template(name)
+
+    results = None if rebuild or not path else load_artifact(path)
+    loaded = results is not None
+    saved = False
+    if not loaded:
+        results = presolve()
+        if path:
+            try:
+                save_artifact(path, results)
+                saved = True
+            except OSError:
+                # Fichier non inscriptible : les résultats restent propres au processus
+                pass
+    get_cache().update(results)
+
+    return {
+        'mazes': len(grids),
+        'templates': len(WARMUP_TEMPLATES),
+        'results': len(results),
+        'loaded': loaded,
+        'saved': saved,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def warm_up_server():
+    """
+    Préchauffe un processus serveur selon settings.TRAINING_WARMUP
+
+    Appelé par les points d'entrée WSGI et ASGI, et non par AppgammeConfig.ready :
+    les commandes manage.py ne calculent rien au démarrage.
+
+    Returns:
+        Statistiques de warm_up, ou None si le préchauffage est désactivé
+    """
+    warmup_config = getattr(settings, 'TRAINING_WARMUP', {})
+    if not warmup_config.get('enabled', False):
+        return None
+    return warm_up(warmup_config.get('path'))
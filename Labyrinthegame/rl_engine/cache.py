@@ -0,0 +1,164 @@
+"""
+Module cache.py
+Cache des résultats d'entraînement (LRU en mémoire, persistance disque optionnelle)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+def _grid_text(grid: List[List[str]]) -> str:
+    return '\n'.join(''.join(row) for row in grid)
+
+
+def maze_hash(grid: List[List[str]]) -> str:
+    """Empreinte SHA-256 d'une grille (identifie un labyrinthe indépendamment des paramètres)"""
+    return hashlib.sha256(_grid_text(grid).encode('utf-8')).hexdigest()
+
+
+def make_key(kind: str, grid: List[List[str]], **params) -> str:
+    """
+    Calcule une clé canonique pour un résultat d'entraînement
+
+    Args:
+        kind: Type de résultat ('optimal_path', 'live_updates', ...)
+        grid: Grille du labyrinthe
+        **params: Hyperparamètres (alpha, gamma, epsilon, episodes, seed, ...)
+
+    Returns:
+        Empreinte SHA-256 hexadécimale
+    """
+    payload = json.dumps({
+        'kind': kind,
+        'grid': _grid_text(grid),
+        'params': params,
+    }, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache LRU thread-safe des résultats d'entraînement
+
+    Si directory est fourni, chaque résultat est aussi écrit dans
+    directory/<clé>.pkl et relu après une éviction ou un redémarrage.
+    Les résultats sont conservés sérialisés (pickle) : chaque lecture retourne
+    une copie indépendante, qu'un appelant peut modifier sans altérer le cache.
+    """
+
+    def __init__(self, maxsize: int = 128, directory: str = None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.pkl')
+
+    def get(self, key: str, default=None):
+        """Retourne le résultat associé à key, ou default"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if data is not None:
+            return pickle.loads(data)
+
+        if self.directory:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    data = f.read()
+                value = pickle.loads(data)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                self._store(key, data)
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def _store(self, key: str, data: bytes):
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def set(self, key: str, value):
+        """Enregistre un résultat (et l'écrit sur disque si configuré)"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._store(key, data)
+        if self.directory:
+            tmp_path = f'{self._path(key)}.{os.getpid()}.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                pass
+
+    def items(self) -> List[Tuple[str, object]]:
+        """Entrées du cache mémoire (clé, résultat), de la plus ancienne à la plus récente"""
+        with self._lock:
+            entries = list(self._entries.items())
+        return [(key, pickle.loads(data)) for key, data in entries]
+
+    def update(self, entries: Dict[str, object]):
+        """Ajoute des résultats au cache mémoire seulement (ex. préchauffage)"""
+        for key, value in entries.items():
+            self._store(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def clear(self):
+        """Vide le cache mémoire (les fichiers sur disque sont conservés)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_cache = ResultCache()
+
+
+def configure_cache(maxsize: int = 128, directory: str = None) -> ResultCache:
+    """Remplace le cache du processus par un nouveau cache configuré"""
+    global _cache
+    _cache = ResultCache(maxsize=maxsize, directory=directory)
+    return _cache
+
+
+def get_cache() -> ResultCache:
+    """Retourne le cache du processus"""
+    return _cache
+
+
+@contextmanager
+def isolated_cache(maxsize: int = 128):
+    """
+    Remplace temporairement le cache du processus par un cache mémoire vide
+
+    Le cache temporaire est retourné : il ne contient que les résultats
+    calculés pendant le bloc (ex. pour les enregistrer, voir appgamme/warmup.py).
+    """
+    global _cache
+    previous = _cache
+    _cache = ResultCache(maxsize=maxsize)
+    try:
+        yield _cache
+    finally:
+        _cache = previous
@@ -0,0 +1,77 @@
+"""
+Module dyna.py
+Modèle des transitions observées et mises à jour de planification (Dyna-Q)
+
+Après chaque pas réel, l'agent Dyna-Q rejoue K transitions déjà observées,
+tirées au hasard dans son modèle, comme s'il les vivait à nouveau : la
+récompense de G se propage ainsi en arrière sans nouveaux épisodes.
+
+Le labyrinthe est déterministe : une transition (état, action) observée une
+fois donne toujours le même état suivant et la même récompense. Le modèle ne
+stocke donc que les couples observés (un identifiant entier s * 4 + a) ; leur
+résultat est lu dans les tableaux de transitions de l'environnement compilé.
+Les K mises à jour d'un pas sont calculées ensemble avec NumPy (mise à jour
+par lot : en cas de doublon dans le lot, la dernière écriture l'emporte).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from rl_engine.maze import CompiledMaze
+
+
+class DynaModel:
+    """Couples (état, action) observés et planification vectorisée"""
+
+    def __init__(self, env: CompiledMaze, generator: np.random.Generator):
+        self.env = env
+        self.generator = generator
+        n_pairs = env.n_states * 4
+        # Couples observés, dans l'ordre de leur première observation
+        self._seen = bytearray(n_pairs)
+        self.pairs = np.empty(n_pairs, dtype=np.int32)
+        self.size = 0
+        # Transitions à plat, indexées par s * 4 + a
+        self._next_state = env.next_state.reshape(-1)
+        self._rewards = env.rewards.reshape(-1).astype(np.float64)
+        self._valid_mask = env.valid_mask
+        self._has_action = env.valid_mask.any(axis=1)
+
+    def record(self, sid: int, action: int):
+        """Enregistre une transition observée"""
+        key = sid * 4 + action
+        if not self._seen[key]:
+            self._seen[key] = 1
+            self.pairs[self.size] = key
+            self.size += 1
+
+    def plan(self, values: np.ndarray, row_index: np.ndarray, alpha: float, gamma: float,
+             n_updates: int) -> Tuple[np.ndarray, float]:
+        """
+        Effectue n_updates mises à jour Q-learning sur des transitions observées
+
+        Args:
+            values: Q-valeurs (lignes, 4), modifiées sur place
+            row_index: Ligne de values de chaque état (None : ligne = identifiant d'état)
+
+        Returns:
+            Tuple (états mis à jour, plus grande variation absolue)
+        """
+        keys = self.pairs[self.generator.integers(self.size, size=n_updates)]
+        states = keys >> 2
+        actions = keys & 3
+        next_states = self._next_state[keys]
+        rewards = self._rewards[keys]
+
+        if row_index is None:
+            rows, next_rows = states, next_states
+        else:
+            rows, next_rows = row_index[states], row_index[next_states]
+        next_q = np.where(self._valid_mask[next_states], values[next_rows], -np.inf).max(axis=1)
+        next_q = np.where(self._has_action[next_states], next_q, 0.0)
+
+        current = values[rows, actions]
+        delta = alpha * (rewards + gamma * next_q - current)
+        values[rows, actions] = current + delta
+        return states, float(np.abs(delta).max())
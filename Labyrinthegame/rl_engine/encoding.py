@@ -0,0 +1,110 @@
+"""
+Module encoding.py
+Encodage compact des historiques d'entraînement (format 'packed-v1')
+
+Chaque chemin est converti en indices de cases (r * cols + c) et tous les
+chemins sont concaténés dans un seul tableau uint16 (uint32 pour les très
+grandes grilles), accompagné d'une table d'offsets uint32 : le chemin de
+l'épisode i est cells[offsets[i]:offsets[i + 1]] (vide si non détaillé).
+Les colonnes numériques des épisodes sont aussi des tableaux typés. Tous les
+tableaux sont en little-endian et encodés en base64 pour le transport JSON.
+"""
+
+import base64
+from itertools import chain
+from typing import Dict, List
+
+import numpy as np
+
+PACKED_FORMAT = 'packed-v1'
+
+# Colonnes scalaires des épisodes et leur type
+_COLUMNS = (
+    ('episode', '<i4'),
+    ('reward', '<i4'),
+    ('steps', '<i4'),
+    ('explorations', '<i4'),
+    ('reached_goal', '<u1'),
+)
+
+
+def _b64(array: np.ndarray) -> str:
+    return base64.b64encode(array.tobytes()).decode('ascii')
+
+
+def _unb64(data: str, dtype) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=dtype)
+
+
+def _pack_paths(paths: List[List], cols: int, cell_dtype: str):
+    lengths = np.fromiter((len(path) for path in paths), dtype=np.int64, count=len(paths))
+    offsets = np.zeros(len(paths) + 1, dtype='<u4')
+    offsets[1:] = np.cumsum(lengths)
+    # Coordonnées (r, c) aplaties en une seule passe puis converties en indices
+    coords = np.fromiter(chain.from_iterable(chain.from_iterable(paths)),
+                         dtype=np.int64, count=2 * int(lengths.sum())).reshape(-1, 2)
+    cells = (coords[:, 0] * cols + coords[:, 1]).astype(cell_dtype)
+    return cells, offsets
+
+
+def encode_history(history: List[Dict], grid: List[List[str]]) -> Dict:
+    """
+    Encode un historique d'entraînement au format compact
+
+    Args:
+        history: Liste d'épisodes (format de iter_training)
+        grid: Grille du labyrinthe (pour le nombre de colonnes)
+
+    Returns:
+        Dict sérialisable en JSON
+    """
+    rows = len(grid)
+    cols = len(grid[0]) if rows > 0 else 0
+    cell_dtype = '<u2' if rows * cols <= 0xFFFF else '<u4'
+
+    paths, path_offsets = _pack_paths([ep.get('path', []) for ep in history], cols, cell_dtype)
+    best, best_offsets = _pack_paths([ep.get('best_path', []) for ep in history], cols, cell_dtype)
+
+    packed = {
+        'format': PACKED_FORMAT,
+        'cols': cols,
+        'count': len(history),
+        'cell_dtype': 'uint16' if cell_dtype == '<u2' else 'uint32',
+        'paths': _b64(paths),
+        'path_offsets': _b64(path_offsets),
+        'best_paths': _b64(best),
+        'best_path_offsets': _b64(best_offsets),
+        # Les erreurs sont rares : stockées seulement pour les épisodes concernés
+        'errors': {str(i): ep['errors'] for i, ep in enumerate(history) if ep.get('errors')},
+    }
+    for name, dtype in _COLUMNS:
+        packed[name] = _b64(np.array([ep.get(name, 0) for ep in history], dtype=dtype))
+    return packed
+
+
+def decode_history(packed: Dict) -> List[Dict]:
+    """Décode un historique compact (inverse de encode_history)"""
+    if packed.get('format') != PACKED_FORMAT:
+        raise ValueError(f"Format d'historique inconnu: {packed.get('format')}")
+
+    cols = packed['cols']
+    cell_dtype = '<u2' if packed['cell_dtype'] == 'uint16' else '<u4'
+    columns = {name: _unb64(packed[name], dtype).tolist() for name, dtype in _COLUMNS}
+    paths = _unb64(packed['paths'], cell_dtype).tolist()
+    path_offsets = _unb64(packed['path_offsets'], '<u4').tolist()
+    best = _unb64(packed['best_paths'], cell_dtype).tolist()
+    best_offsets = _unb64(packed['best_path_offsets'], '<u4').tolist()
+
+    history = []
+    for i in range(packed['count']):
+        episode = {name: columns[name][i] for name, _ in _COLUMNS}
+        episode['reached_goal'] = bool(episode['reached_goal'])
+        start, end = path_offsets[i], path_offsets[i + 1]
+        if end > start:
+            episode['path'] = [divmod(cell, cols) for cell in paths[start:end]]
+            episode['best_path'] = [
+                divmod(cell, cols) for cell in best[best_offsets[i]:best_offsets[i + 1]]
+            ]
+            episode['errors'] = packed['errors'].get(str(i), [])
+        history.append(episode)
+    return history
@@ -0,0 +1,181 @@
+"""
+Module generator.py
+Génération procédurale de labyrinthes résolubles de taille quelconque
+
+Algorithmes disponibles (voir GENERATORS) :
+    - backtracker : parcours en profondeur aléatoire (longs couloirs, peu
+                    d'embranchements), boucle séquentielle sur des tableaux plats
+    - prim        : arbre couvrant minimal sur des poids aléatoires (le
+                    labyrinthe que produit Prim), calculé par Borůvka vectorisé
+    - obstacles   : murs aléatoires avec une densité donnée, le long d'un
+                    chemin S -> G garanti
+
+Les labyrinthes parfaits (backtracker, prim) placent les cellules sur les
+coordonnées paires et les murs entre elles ; S est en (0, 0) et G sur la
+cellule la plus proche du coin opposé. Tous les générateurs sont
+reproductibles avec seed et peuvent retourner un tableau uint8 de codes ASCII
+(as_array=True) pour éviter la conversion en listes sur les grandes grilles.
+"""
+
+from typing import List, Union
+
+import numpy as np
+
+from rl_engine.maze import EMPTY, GOAL, START, WALL, spanning_forest, to_grid
+
+GENERATORS = ('backtracker', 'prim', 'obstacles')
+
+
+def _perfect_maze_array(rows: int, cols: int, right: np.ndarray, down: np.ndarray) -> np.ndarray:
+    """
+    Construit la grille d'un labyrinthe parfait
+
+    Args:
+        right: Booléens (R, C) : passage ouvert entre la cellule (i, j) et (i, j + 1)
+        down: Booléens (R, C) : passage ouvert entre la cellule (i, j) et (i + 1, j)
+    """
+    grid = np.full((rows, cols), WALL, dtype=np.uint8)
+    grid[0::2, 0::2] = EMPTY
+    n_rows, n_cols = right.shape
+    grid[0::2, 1::2][right[:, :grid[0::2, 1::2].shape[1]]] = EMPTY
+    grid[1::2, 0::2][down[:grid[1::2, 0::2].shape[0], :]] = EMPTY
+    grid[0, 0] = START
+    grid[2 * (n_rows - 1), 2 * (n_cols - 1)] = GOAL
+    return grid
+
+
+def _backtracker(n_rows: int, n_cols: int, rng: np.random.Generator):
+    """Parcours en profondeur aléatoire depuis la cellule (0, 0)"""
+    n = n_rows * n_cols
+    right = bytearray(n)
+    down = bytearray(n)
+    visited = bytearray(n)
+    # Un tirage par cellule creusée, générés en un seul bloc
+    draws = rng.random(n).tolist()
+    last_col = n_cols - 1
+    below = n - n_cols
+
+    visited[0] = 1
+    stack = [0]
+    push = stack.append
+    pop = stack.pop
+    t = 0
+    while stack:
+        k = stack[-1]
+        j = k % n_cols
+        candidates = []
+        if k >= n_cols and not visited[k - n_cols]:
+            candidates.append(k - n_cols)
+        if k < below and not visited[k + n_cols]:
+            candidates.append(k + n_cols)
+        if j and not visited[k - 1]:
+            candidates.append(k - 1)
+        if j < last_col and not visited[k + 1]:
+            candidates.append(k + 1)
+        if not candidates:
+            pop()
+            continue
+
+        nk = candidates[int(draws[t] * len(candidates))]
+        t += 1
+        # Le passage est enregistré sur la cellule du haut ou de gauche
+        if nk == k + n_cols:
+            down[k] = 1
+        elif nk == k - n_cols:
+            down[nk] = 1
+        elif nk > k:
+            right[k] = 1
+        else:
+            right[nk] = 1
+        visited[nk] = 1
+        push(nk)
+
+    shape = (n_rows, n_cols)
+    return (np.frombuffer(right, dtype=np.uint8).reshape(shape).astype(bool),
+            np.frombuffer(down, dtype=np.uint8).reshape(shape).astype(bool))
+
+
+def _prim(n_rows: int, n_cols: int, rng: np.random.Generator):
+    """
+    Arbre couvrant minimal des cellules pour des poids d'arêtes aléatoires
+
+    Prim et Kruskal donnent le même arbre (unique, les poids étant distincts) ;
+    il est calculé par Borůvka vectorisé (voir maze.spanning_forest).
+    """
+    n = n_rows * n_cols
+    cells = np.arange(n, dtype=np.int32).reshape(n_rows, n_cols)
+    # Arêtes horizontales puis verticales
+    u = np.concatenate([cells[:, :-1].ravel(), cells[:-1, :].ravel()])
+    v = np.concatenate([cells[:, 1:].ravel(), cells[1:, :].ravel()])
+    n_edges = len(u)
+    n_horizontal = n_rows * (n_cols - 1)
+    # Clé unique par arête : poids aléatoire (bits de poids fort), indice (bits de poids faible)
+    keys = (rng.integers(0, 2 ** 31, size=n_edges, dtype=np.int64) << 32) | \
+        np.arange(n_edges, dtype=np.int64)
+    selected, _ = spanning_forest(n, u, v, keys)
+
+    chosen_ids = np.flatnonzero(selected)
+    horizontal = chosen_ids[chosen_ids < n_horizontal]
+    vertical = chosen_ids[chosen_ids >= n_horizontal] - n_horizontal
+    right = np.zeros((n_rows, n_cols), dtype=bool)
+    down = np.zeros((n_rows, n_cols), dtype=bool)
+    if n_cols > 1:
+        right[horizontal // (n_cols - 1), horizontal % (n_cols - 1)] = True
+    down[vertical // n_cols, vertical % n_cols] = True
+    return right, down
+
+
+def _obstacles(rows: int, cols: int, density: float, rng: np.random.Generator) -> np.ndarray:
+    """Murs aléatoires hors d'un chemin en escalier aléatoire de S (0, 0) à G (rows-1, cols-1)"""
+    grid = np.where(rng.random((rows, cols)) < density, WALL, EMPTY).astype(np.uint8)
+    # Chemin monotone : rows-1 pas vers le bas et cols-1 vers la droite, dans un ordre aléatoire
+    moves = np.zeros(rows + cols - 2, dtype=bool)
+    moves[:rows - 1] = True
+    rng.shuffle(moves)
+    path_r = np.concatenate([[0], np.cumsum(moves)])
+    path_c = np.concatenate([[0], np.cumsum(~moves)])
+    grid[path_r, path_c] = EMPTY
+    grid[0, 0] = START
+    grid[rows - 1, cols - 1] = GOAL
+    return grid
+
+
+def generate_maze(rows: int, cols: int, algorithm: str = 'backtracker', seed: int = None,
+                  density: float = 0.3,
+                  as_array: bool = False) -> Union[List[List[str]], np.ndarray]:
+    """
+    Génère un labyrinthe résoluble
+
+    Args:
+        rows, cols: Dimensions de la grille (au moins 2x2)
+        algorithm: 'backtracker', 'prim' ou 'obstacles' (voir GENERATORS)
+        seed: Graine du générateur aléatoire (None : aléatoire)
+        density: Proportion de murs pour 'obstacles' (entre 0 et 1)
+        as_array: Retourne un tableau uint8 de codes ASCII au lieu de listes
+
+    Returns:
+        Grille (liste de listes de 'S', 'G', '#', '.') ou tableau (rows, cols)
+
+    Raises:
+        ValueError: si un paramètre est invalide
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Générateur inconnu: {algorithm}")
+    if rows < 2 or cols < 2:
+        raise ValueError("Le labyrinthe doit mesurer au moins 2x2")
+    if not 0 <= density <= 1:
+        raise ValueError("La densité doit être comprise entre 0 et 1")
+
+    rng = np.random.default_rng(seed)
+    if algorithm == 'obstacles':
+        grid = _obstacles(rows, cols, density, rng)
+    else:
+        # Cellules aux coordonnées paires : (rows + 1) // 2 x (cols + 1) // 2
+        n_rows, n_cols = (rows + 1) // 2, (cols + 1) // 2
+        if n_rows * n_cols < 2:
+            raise ValueError("Le labyrinthe doit contenir au moins deux cellules")
+        carve = _backtracker if algorithm == 'backtracker' else _prim
+        right, down = carve(n_rows, n_cols, rng)
+        grid = _perfect_maze_array(rows, cols, right, down)
+
+    return grid if as_array else to_grid(grid)
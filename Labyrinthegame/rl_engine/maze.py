@@ -3,6 +3,12 @@ Module maze.py
 Contient les labyrinthes prédéfinis pour le projet
 """
 
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+
+import numpy as np
+
 # Liste des labyrinthes prédéfinis
 # S = Start (Départ)
 # G = Goal (Arrivée)
@@ -75,26 +81,160 @@ MAZES = [
 ]
 
 
+# Codes ASCII des cases dans les tableaux uint8
+WALL = ord('#')
+EMPTY = ord('.')
+START = ord('S')
+GOAL = ord('G')
+CELL_CODES = np.array([EMPTY, WALL, START, GOAL], dtype=np.uint8)
+
+
+def grid_to_array(grid) -> np.ndarray:
+    """
+    Convertit une grille (liste de listes de caractères) en tableau uint8 de codes ASCII
+    
+    La conversion et les vérifications sont faites par NumPy, sans boucle Python
+    sur les cases. Un tableau uint8 à deux dimensions est retourné tel quel.
+    
+    Raises:
+        ValueError: grille vide, non rectangulaire, ou case qui n'est pas un caractère ASCII
+    """
+    if isinstance(grid, np.ndarray) and grid.dtype == np.uint8:
+        if grid.ndim != 2 or grid.size == 0:
+            raise ValueError("La grille doit être un tableau non vide à deux dimensions")
+        return grid
+    try:
+        chars = np.array(grid, dtype=str)
+    except ValueError:
+        raise ValueError("Grille non rectangulaire")
+    if chars.ndim != 2 or chars.size == 0:
+        raise ValueError("La grille doit être un tableau non vide à deux dimensions")
+    if chars.dtype.itemsize != 4:
+        raise ValueError("Chaque case doit contenir un seul caractère")
+    codes = chars.view(np.uint32)
+    if ((codes == 0) | (codes > 127)).any():
+        raise ValueError("Chaque case doit contenir un seul caractère ASCII")
+    return codes.astype(np.uint8)
+
+
+def to_grid(array: np.ndarray) -> List[List[str]]:
+    """Convertit un tableau uint8 de codes ASCII en grille (liste de listes de caractères)"""
+    cols = array.shape[1]
+    text = array.tobytes().decode('ascii')
+    return [list(text[start:start + cols]) for start in range(0, len(text), cols)]
+
+
+def spanning_forest(n_nodes: int, u: np.ndarray, v: np.ndarray,
+                    keys: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forêt couvrante minimale d'un graphe non orienté (Borůvka vectorisé)
+    
+    À chaque passe, chaque composante choisit son arête sortante de clé
+    minimale ; les composantes reliées sont fusionnées par saut de pointeurs
+    puis renumérotées. Le nombre de composantes (non isolées) diminue au moins
+    de moitié par passe : O(log n) passes, chacune en O(arêtes) dans NumPy.
+    
+    Args:
+        n_nodes: Nombre de sommets
+        u, v: Extrémités des arêtes
+        keys: Clés int64 distinctes des arêtes, avec l'indice de l'arête dans
+              les 32 bits de poids faible (None : l'indice seul)
+    
+    Returns:
+        Tuple (selected, labels) : masque des arêtes de la forêt et numéro de
+        composante connexe de chaque sommet
+    """
+    n_edges = len(u)
+    if keys is None:
+        keys = np.arange(n_edges, dtype=np.int64)
+    no_edge = np.iinfo(np.int64).max
+    
+    selected = np.zeros(n_edges, dtype=bool)
+    # Composante de chaque sommet, et des extrémités des arêtes encore externes
+    comp = np.arange(n_nodes, dtype=np.int32)
+    cu, cv = u, v
+    n_comp = n_nodes
+    while len(cu):
+        best = np.full(n_comp, no_edge, dtype=np.int64)
+        np.minimum.at(best, cu, keys)
+        np.minimum.at(best, cv, keys)
+        comps = np.arange(n_comp, dtype=np.int32)
+        hooked = best != no_edge
+        edges = best[hooked] & 0xFFFFFFFF
+        selected[edges] = True
+        
+        # Chaque composante pointe vers celle de l'autre extrémité de son arête
+        parent = comps.copy()
+        end_u = comp[u[edges]]
+        parent[hooked] = np.where(end_u == comps[hooked], comp[v[edges]], end_u)
+        # Deux composantes qui se choisissent mutuellement : la plus petite devient racine
+        mutual = (parent[parent] == comps) & (comps < parent)
+        parent[mutual] = comps[mutual]
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        
+        # Renumérotation des composantes fusionnées, arêtes internes retirées
+        is_root = parent == comps
+        relabel = (np.cumsum(is_root, dtype=np.int32) - 1)[parent]
+        n_comp = int(is_root.sum())
+        comp = relabel[comp]
+        cu = relabel[cu]
+        cv = relabel[cv]
+        external = cu != cv
+        cu, cv, keys = cu[external], cv[external], keys[external]
+    
+    return selected, comp
+
+
 # Classe Maze (optionnelle, pour des fonctionnalités supplémentaires)
 class Maze:
     """
     Classe représentant un labyrinthe
     Fournit des méthodes utilitaires pour vérifier les propriétés du labyrinthe
+    
+    La grille est stockée dans un tableau uint8 (un octet par case, codes
+    ASCII) avec les masques des murs, du départ et de l'arrivée calculés une
+    seule fois : les recherches et la validation sont vectorisées.
     """
     
+    __slots__ = ('cells', 'rows', 'cols', 'walls', 'start_mask', 'goal_mask', 'start', 'goal')
+    
     def __init__(self, grid):
         """
         Initialise un labyrinthe à partir d'une grille
         
         Args:
-            grid: Liste 2D de caractères (S, G, #, .)
+            grid: Liste 2D de caractères (S, G, #, .) ou tableau uint8 de codes ASCII
+        
+        Raises:
+            ValueError: si la grille n'est pas une grille rectangulaire de caractères
         """
-        self.grid = grid
-        self.rows = len(grid)
-        self.cols = len(grid[0]) if self.rows > 0 else 0
+        self.cells = grid_to_array(grid)
+        self.rows, self.cols = self.cells.shape
+        self.walls = self.cells == WALL
+        self.start_mask = self.cells == START
+        self.goal_mask = self.cells == GOAL
         self.start = self._find_position('S')
         self.goal = self._find_position('G')
     
+    @property
+    def grid(self) -> List[List[str]]:
+        """Grille sous forme de liste 2D de caractères"""
+        return to_grid(self.cells)
+    
+    @property
+    def start_count(self) -> int:
+        """Nombre de cases de départ (S)"""
+        return int(np.count_nonzero(self.start_mask))
+    
+    @property
+    def goal_count(self) -> int:
+        """Nombre de cases d'arrivée (G)"""
+        return int(np.count_nonzero(self.goal_mask))
+    
     def _find_position(self, target):
         """
         Trouve la position d'un caractère dans la grille
@@ -105,11 +245,10 @@ class Maze:
         Returns:
             Tuple (r, c) ou None si non trouvé
         """
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.grid[r][c] == target:
-                    return (r, c)
-        return None
+        found = np.flatnonzero(self.cells.reshape(-1) == ord(target))
+        if len(found) == 0:
+            return None
+        return divmod(int(found[0]), self.cols)
     
     def is_valid_position(self, r, c):
         """
@@ -124,7 +263,7 @@ class Maze:
         """
         if not (0 <= r < self.rows and 0 <= c < self.cols):
             return False
-        return self.grid[r][c] != '#'
+        return not self.walls[r, c]
     
     def is_wall(self, r, c):
         """
@@ -139,7 +278,7 @@ class Maze:
         """
         if not (0 <= r < self.rows and 0 <= c < self.cols):
             return True  # Hors limites = mur
-        return self.grid[r][c] == '#'
+        return bool(self.walls[r, c])
     
     def is_goal(self, r, c):
         """
@@ -154,7 +293,7 @@ class Maze:
         """
         if not (0 <= r < self.rows and 0 <= c < self.cols):
             return False
-        return self.grid[r][c] == 'G'
+        return bool(self.goal_mask[r, c])
     
     def get_reward(self, r, c):
         """
@@ -194,6 +333,33 @@ class Maze:
         
         return neighbors
     
+    def components(self) -> np.ndarray:
+        """
+        Composantes connexes des cases libres
+        
+        Returns:
+            Tableau (rows, cols) : numéro de composante de chaque case libre, -1 pour les murs
+        """
+        open_cells = ~self.walls
+        # Seules les cases libres sont des sommets, numérotés de façon contiguë
+        ids = np.cumsum(open_cells, dtype=np.int32).reshape(self.rows, self.cols) - 1
+        horizontal = open_cells[:, :-1] & open_cells[:, 1:]
+        vertical = open_cells[:-1, :] & open_cells[1:, :]
+        u = np.concatenate([ids[:, :-1][horizontal], ids[:-1, :][vertical]])
+        v = np.concatenate([ids[:, 1:][horizontal], ids[1:, :][vertical]])
+        _, labels = spanning_forest(int(open_cells.sum()), u, v)
+        
+        components = np.full((self.rows, self.cols), -1, dtype=np.int32)
+        components[open_cells] = labels
+        return components
+    
+    def is_solvable(self):
+        """Vérifie qu'un chemin relie le départ (S) à l'arrivée (G)"""
+        if self.start is None or self.goal is None:
+            return False
+        labels = self.components()
+        return bool(labels[self.start] == labels[self.goal])
+    
     def validate(self):
         """
         Valide le labyrinthe (1 S, 1 G, au moins un chemin possible)
@@ -201,6 +367,11 @@ class Maze:
         Returns:
             Tuple (bool, str): (est_valide, message_erreur)
         """
+        invalid = ~np.isin(self.cells, CELL_CODES)
+        if invalid.any():
+            r, c = divmod(int(np.flatnonzero(invalid)[0]), self.cols)
+            return (False, f"Case invalide en ({r}, {c}): {chr(self.cells[r, c])!r}")
+        
         if not self.start:
             return (False, "Pas de point de départ (S)")
         
@@ -208,8 +379,8 @@ class Maze:
             return (False, "Pas de point d'arrivée (G)")
         
         # Vérifier qu'il n'y a qu'un seul S et un seul G
-        s_count = sum(row.count('S') for row in self.grid)
-        g_count = sum(row.count('G') for row in self.grid)
+        s_count = self.start_count
+        g_count = self.goal_count
         
         if s_count != 1:
             return (False, f"Il doit y avoir exactement 1 départ (S), trouvé: {s_count}")
@@ -217,16 +388,16 @@ class Maze:
         if g_count != 1:
             return (False, f"Il doit y avoir exactement 1 arrivée (G), trouvé: {g_count}")
         
+        if not self.is_solvable():
+            return (False, "Aucun chemin entre le départ (S) et l'arrivée (G)")
+        
         return (True, "Labyrinthe valide")
     
     def __str__(self):
         """
         Représentation textuelle du labyrinthe
         """
-        result = []
-        for row in self.grid:
-            result.append(' '.join(row))
-        return '\n'.join(result)
+        return '\n'.join(' '.join(row) for row in self.grid)
 
 
 # Fonction utilitaire pour créer un labyrinthe vide
@@ -241,4 +412,210 @@ def create_empty_maze(rows, cols):
     Returns:
         Liste 2D de '.'
     """
-    return [['.' for _ in range(cols)] for _ in range(rows)]
\ No newline at end of file
+    return [['.' for _ in range(cols)] for _ in range(rows)]
+
+
+# Déplacements (dr, dc) dans l'ordre des actions : haut, bas, gauche, droite
+ACTION_DELTAS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+# Actions valides pour chacun des 16 masques d'actions (bit a : action a valide)
+_MASK_ACTIONS = [[a for a in range(4) if mask >> a & 1] for mask in range(16)]
+
+
+class _StateRows:
+    """Ligne (liste Python) d'un tableau (n_states, 4) par état, calculée à la demande"""
+
+    __slots__ = ('_array',)
+
+    def __init__(self, array: np.ndarray):
+        self._array = array
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __getitem__(self, sid: int) -> List:
+        return self._array[sid].tolist()
+
+
+class _StateFlags:
+    """Booléen Python par état d'un tableau de booléens, calculé à la demande"""
+
+    __slots__ = ('_array',)
+
+    def __init__(self, array: np.ndarray):
+        self._array = array
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __getitem__(self, sid: int) -> bool:
+        return bool(self._array[sid])
+
+
+class _StateActions:
+    """Actions valides par état, lues dans _MASK_ACTIONS (listes partagées, non modifiables)"""
+
+    __slots__ = ('_masks',)
+
+    def __init__(self, masks: np.ndarray):
+        self._masks = masks
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def __getitem__(self, sid: int) -> List[int]:
+        return _MASK_ACTIONS[self._masks[sid]]
+
+
+class _StateCoords:
+    """Position (r, c) par état, calculée à la demande"""
+
+    __slots__ = ('_n_states', '_cols')
+
+    def __init__(self, n_states: int, cols: int):
+        self._n_states = n_states
+        self._cols = cols
+
+    def __len__(self) -> int:
+        return self._n_states
+
+    def __getitem__(self, sid: int) -> Tuple[int, int]:
+        if not 0 <= sid < self._n_states:
+            raise IndexError(sid)
+        return divmod(sid, self._cols)
+
+
+class CompiledMaze:
+    """
+    Environnement précompilé à partir d'une grille
+
+    Toutes les informations nécessaires à la boucle d'entraînement sont
+    calculées une seule fois pour toutes les cases, indexées par l'identifiant
+    d'état entier r * cols + c :
+        - next_state : état atteint par chaque action (-1 si invalide)
+        - valid_mask : actions valides (dans les limites et pas un mur)
+        - rewards    : récompense de chaque action (+100 vers G, -1 sinon,
+                       -10 pour une action invalide)
+    Des copies en listes Python sont conservées pour la boucle chaude, où
+    l'indexation de listes est plus rapide que celle des tableaux NumPy.
+
+    Avec compact=True (très grands labyrinthes, backend 'memmap'), aucune liste
+    par case n'est construite : next_states, rewards_list, valid_actions,
+    goal_flags, wall_flags et coords sont des séquences de même interface
+    calculées à la demande depuis les tableaux NumPy. La boucle est plus lente,
+    mais la mémoire se limite à quelques dizaines d'octets par case.
+    """
+
+    GOAL_REWARD = 100
+    STEP_REWARD = -1
+    WALL_REWARD = -10
+
+    def __init__(self, grid, compact: bool = False):
+        """
+        Compile une grille
+
+        Args:
+            grid: Liste 2D de caractères (S, G, #, .)
+            compact: Séquences calculées à la demande au lieu de listes Python
+        """
+        self.grid = grid
+        self.compact = compact
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if self.rows > 0 else 0
+        self.n_states = self.rows * self.cols
+
+        cells = np.array(grid, dtype='U1').reshape(self.rows, self.cols)
+        self.walls = (cells == '#').reshape(-1)
+        self.goal_mask = (cells == 'G').reshape(-1)
+
+        # Calculs en int32 : les temporaires restent petits pour les très grandes grilles
+        rr, cc = np.divmod(np.arange(self.n_states, dtype=np.int32), np.int32(max(self.cols, 1)))
+        self.next_state = np.full((self.n_states, 4), -1, dtype=np.int32)
+        self.rewards = np.full((self.n_states, 4), self.WALL_REWARD, dtype=np.int32)
+        for action, (dr, dc) in enumerate(ACTION_DELTAS):
+            nr, nc = rr + np.int32(dr), cc + np.int32(dc)
+            inside = (nr >= 0) & (nr < self.rows) & (nc >= 0) & (nc < self.cols)
+            target = np.where(inside, nr * np.int32(self.cols) + nc, np.int32(0))
+            ok = inside & ~self.walls[target]
+            self.next_state[:, action] = np.where(ok, target, np.int32(-1))
+            self.rewards[ok, action] = np.where(
+                self.goal_mask[target[ok]], self.GOAL_REWARD, self.STEP_REWARD)
+        self.valid_mask = self.next_state >= 0
+
+        if compact:
+            masks = (self.valid_mask * np.array([1, 2, 4, 8], dtype=np.uint8)).sum(
+                axis=1, dtype=np.uint8)
+            self.next_states = _StateRows(self.next_state)
+            self.rewards_list = _StateRows(self.rewards)
+            self.valid_actions = _StateActions(masks)
+            self.goal_flags = _StateFlags(self.goal_mask)
+            self.wall_flags = _StateFlags(self.walls)
+            self.coords = _StateCoords(self.n_states, self.cols)
+        else:
+            self._python_views()
+
+        starts = np.flatnonzero(cells.reshape(-1) == 'S')
+        goals = np.flatnonzero(self.goal_mask)
+        self.start = int(starts[0]) if len(starts) else None
+        self.goal = int(goals[0]) if len(goals) else None
+
+    def _python_views(self):
+        """Copies en listes Python pour la boucle chaude"""
+        self.next_states = self.next_state.tolist()
+        self.rewards_list = self.rewards.tolist()
+        self.valid_actions = [
+            [a for a in range(4) if row[a] >= 0] for row in self.next_states
+        ]
+        self.goal_flags = self.goal_mask.tolist()
+        self.wall_flags = self.walls.tolist()
+        self.coords = [divmod(sid, self.cols) for sid in range(self.n_states)]
+
+    def state_id(self, state):
+        """Convertit une position (r, c) en identifiant d'état"""
+        return state[0] * self.cols + state[1]
+
+    def state_of(self, state_id):
+        """Convertit un identifiant d'état en position (r, c)"""
+        return self.coords[state_id]
+
+    @property
+    def start_pos(self):
+        """Position (r, c) du départ, ou None"""
+        return None if self.start is None else self.coords[self.start]
+
+    @property
+    def goal_pos(self):
+        """Position (r, c) de l'arrivée, ou None"""
+        return None if self.goal is None else self.coords[self.goal]
+
+
+# Environnements compilés partagés par les agents d'un processus (voir compile_maze)
+COMPILED_CACHE_SIZE = 64
+_compiled = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def compile_maze(grid, compact: bool = False) -> CompiledMaze:
+    """
+    Retourne l'environnement compilé d'une grille, partagé dans le processus
+
+    Les environnements sont indexés par le contenu de la grille (LRU de
+    COMPILED_CACHE_SIZE entrées) : une grille égale à une grille déjà
+    compilée, ex. un labyrinthe prédéfini préchauffé au démarrage, n'est pas
+    recompilée. Une grille ne doit pas être modifiée après sa compilation.
+    compact : voir CompiledMaze (les deux variantes sont mises en cache séparément).
+    """
+    key = (compact, '\n'.join(''.join(row) for row in grid))
+    with _compiled_lock:
+        env = _compiled.get(key)
+        if env is not None:
+            _compiled.move_to_end(key)
+            return env
+
+    env = CompiledMaze(grid, compact=compact)
+    with _compiled_lock:
+        _compiled[key] = env
+        while len(_compiled) > COMPILED_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return env
@@ -0,0 +1,326 @@
+"""
+Module metrics.py
+Métriques opérationnelles (compteurs, histogrammes) partagées entre processus
+
+Chaque processus (serveur web, processus de l'exécuteur) accumule ses
+observations en mémoire, puis les ajoute périodiquement (flush_interval) à un
+fichier SQLite partagé : les valeurs lues dans ce fichier sont la somme de
+tous les processus, y compris ceux qui se sont arrêtés. Sans fichier
+(path=None), les métriques restent propres au processus.
+
+Le rendu (exposition()) suit le format texte de Prometheus 0.0.4 ; les
+percentiles se calculent à partir des histogrammes (histogram_quantile).
+"""
+
+import atexit
+import bisect
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Bornes par défaut des histogrammes de durée (secondes)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Bornes par défaut des histogrammes de taille (octets)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsStore:
+    """
+    Fichier SQLite où chaque processus ajoute ses incréments
+
+    Une ligne par échantillon (nom, étiquettes) ; les ajouts sont des
+    UPSERT additifs, sûrs avec plusieurs processus écrivains.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        # Une connexion par processus : elle ne doit pas traverser un fork
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False,
+                                         isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS samples ('
+                'name TEXT NOT NULL, labels TEXT NOT NULL, value REAL NOT NULL, '
+                'PRIMARY KEY (name, labels))'
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def add(self, increments: Dict[Tuple[str, str], float]):
+        """Ajoute des incréments {(nom, étiquettes): valeur}"""
+        if not increments:
+            return
+        rows = [(name, labels, value) for (name, labels), value in increments.items()]
+        with self._lock:
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.executemany(
+                    'INSERT INTO samples (name, labels, value) VALUES (?, ?, ?) '
+                    'ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value',
+                    rows
+                )
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+
+    def read(self) -> Dict[Tuple[str, str], float]:
+        """Valeurs cumulées de tous les processus"""
+        with self._lock:
+            rows = self._connect().execute('SELECT name, labels, value FROM samples').fetchall()
+        return {(name, labels): value for name, labels, value in rows}
+
+    def clear(self):
+        """Supprime toutes les valeurs enregistrées"""
+        with self._lock:
+            self._connect().execute('DELETE FROM samples')
+
+
+class Metric:
+    """Famille de métriques (nom, description, noms d'étiquettes)"""
+
+    kind = 'untyped'
+
+    def __init__(self, registry, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _labels(self, labels: Dict) -> Tuple[Tuple[str, str], ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Étiquettes attendues pour {self.name}: {', '.join(self.labelnames)}")
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+    def sample_order(self, sample_name: str, labels: str):
+        """Clé de tri des échantillons dans l'exposition"""
+        return labels
+
+
+class Counter(Metric):
+    """Compteur croissant"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Incrémente le compteur"""
+        key = (f'{self.name}_total', _format_labels(self._labels(labels)))
+        self.registry._add({key: amount})
+
+
+class Histogram(Metric):
+    """Histogramme cumulatif (buckets, somme et nombre d'observations)"""
+
+    kind = 'histogram'
+
+    def __init__(self, registry, name: str, documentation: str,
+                 labelnames: Tuple[str, ...] = (), buckets: Iterable[float] = DURATION_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._bucket_names = [_format_value(bound) for bound in self.buckets]
+        self._keys = {}
+
+    def _sample_keys(self, labels: Tuple[Tuple[str, str], ...]):
+        # Clés des échantillons d'une combinaison d'étiquettes, calculées une seule fois
+        keys = self._keys.get(labels)
+        if keys is None:
+            text = _format_labels(labels)
+            prefix = f'{text},' if text else ''
+            buckets = [(f'{self.name}_bucket', f'{prefix}le="{bound}"')
+                       for bound in self._bucket_names]
+            keys = (buckets, (f'{self.name}_sum', text), (f'{self.name}_count', text))
+            self._keys[labels] = keys
+        return keys
+
+    def observe(self, value: float, **labels):
+        """Enregistre une observation"""
+        buckets, sum_key, count_key = self._sample_keys(self._labels(labels))
+        increments = {sum_key: value, count_key: 1.0}
+        # Buckets cumulatifs : l'observation compte dans toutes les bornes >= value
+        # (les bornes inférieures sont ajoutées à 0 pour que tous les buckets soient exposés)
+        first = bisect.bisect_left(self.buckets, value)
+        for index, key in enumerate(buckets):
+            increments[key] = 1.0 if index >= first else 0.0
+        self.registry._add(increments)
+
+    def sample_order(self, sample_name: str, labels: str):
+        suffix = sample_name[len(self.name) + 1:]
+        if suffix == 'bucket':
+            rest, _, bound = labels.rpartition('le="')
+            return (rest.rstrip(','), 0, float(bound.rstrip('"').replace('+Inf', 'inf')))
+        return (labels, 1 if suffix == 'sum' else 2, 0.0)
+
+
+class MetricsRegistry:
+    """
+    Ensemble des métriques d'un processus
+
+    Les incréments sont accumulés en mémoire et ajoutés au fichier partagé au
+    plus tard flush_interval secondes après la dernière écriture (et à la fin
+    du processus). Les jauges (gauge()) sont calculées à la lecture, dans le
+    processus qui produit l'exposition.
+    """
+
+    def __init__(self, store: MetricsStore = None, flush_interval: float = 1.0, prefix: str = ''):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.prefix = prefix
+        self._metrics = {}
+        self._gauges = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._pid = os.getpid()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Métrique déjà définie différemment: {metric.name}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """Définit (ou retourne) un compteur"""
+        return self._register(Counter(self, self.prefix + name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Iterable[float] = DURATION_BUCKETS) -> Histogram:
+        """Définit (ou retourne) un histogramme"""
+        return self._register(Histogram(self, self.prefix + name, documentation, labelnames,
+                                        buckets))
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float]):
+        """Définit une jauge calculée à la lecture par callback()"""
+        with self._lock:
+            self._gauges[self.prefix + name] = (documentation, callback)
+
+    def _check_fork(self):
+        # Un processus créé par fork hérite des incréments du parent, qui les ajoutera lui-même
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._pending = {}
+
+    def _add(self, increments: Dict[Tuple[str, str], float]):
+        with self._lock:
+            self._check_fork()
+            pending = self._pending
+            for key, value in increments.items():
+                pending[key] = pending.get(key, 0.0) + value
+            due = self.store is not None and \
+                time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Ajoute les incréments en attente au fichier partagé"""
+        if self.store is None:
+            return
+        with self._lock:
+            self._check_fork()
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        try:
+            self.store.add(pending)
+        except sqlite3.Error:
+            # Fichier indisponible : les incréments seront retentés au prochain flush
+            with self._lock:
+                for key, value in pending.items():
+                    self._pending[key] = self._pending.get(key, 0.0) + value
+
+    def values(self) -> Dict[Tuple[str, str], float]:
+        """Valeurs cumulées {(échantillon, étiquettes): valeur}"""
+        if self.store is None:
+            with self._lock:
+                return dict(self._pending)
+        self.flush()
+        return self.store.read()
+
+    def reset(self):
+        """Remet toutes les métriques à zéro (tests, benchmarks)"""
+        with self._lock:
+            self._pending = {}
+        if self.store is not None:
+            self.store.clear()
+
+    def exposition(self) -> str:
+        """Rendu au format texte de Prometheus"""
+        values = self.values()
+        by_metric = {}
+        for (sample_name, labels), value in values.items():
+            for name in (sample_name, sample_name.rpartition('_')[0]):
+                if name in self._metrics:
+                    by_metric.setdefault(name, []).append((sample_name, labels, value))
+                    break
+
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            family = f'{name}_total' if metric.kind == 'counter' else name
+            lines.append(f'# HELP {family} {metric.documentation}')
+            lines.append(f'# TYPE {family} {metric.kind}')
+            samples = sorted(by_metric.get(name, []),
+                             key=lambda sample: metric.sample_order(sample[0], sample[1]))
+            for sample_name, labels, value in samples:
+                label_text = f'{{{labels}}}' if labels else ''
+                lines.append(f'{sample_name}{label_text} {_format_value(value)}')
+
+        for name, (documentation, callback) in sorted(self._gauges.items()):
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {_format_value(callback())}')
+        return '\n'.join(lines) + '\n'
+
+
+_registry = MetricsRegistry(prefix='labyrinthe_')
+atexit.register(lambda: _registry.flush())
+
+
+def configure_metrics(path: str = None, flush_interval: float = 1.0) -> MetricsRegistry:
+    """
+    Configure le stockage partagé des métriques du processus
+
+    Les métriques déjà définies sont conservées ; les incréments en attente
+    sont ajoutés au nouveau fichier.
+    """
+    _registry.flush()
+    _registry.store = MetricsStore(path) if path else None
+    _registry.flush_interval = flush_interval
+    return _registry
+
+
+def get_registry() -> MetricsRegistry:
+    """Retourne le registre de métriques du processus"""
+    return _registry
@@ -0,0 +1,227 @@
+"""
+Module planner.py
+Résolution directe des labyrinthes (le modèle est connu et déterministe)
+
+Les planificateurs travaillent sur un CompiledMaze et produisent le même
+format de chemin que QLearnerWithVisualization (liste de (r, c)) :
+    - value_iteration : itération de valeur vectorisée, Q-table optimale
+    - bfs             : parcours en largeur depuis G, Q-table optimale exacte
+    - astar           : A* (distance de Manhattan), chemin uniquement
+Les Q-tables ont la même forme (récompenses, gamma, G terminal) que celles
+apprises par Q-learning : elles en sont la limite exacte.
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from rl_engine.maze import CompiledMaze, compile_maze
+from rl_engine.q_table import ArrayQTable
+
+SOLVERS = ('value_iteration', 'bfs', 'astar')
+
+
+def _compile(grid) -> CompiledMaze:
+    env = grid if isinstance(grid, CompiledMaze) else compile_maze(grid)
+    if env.start is None:
+        raise ValueError("Pas de position de départ 'S' dans le labyrinthe")
+    if env.goal is None:
+        raise ValueError("Pas de position d'arrivée 'G' dans le labyrinthe")
+    return env
+
+
+def _q_from_values(env: CompiledMaze, values: np.ndarray, gamma: float) -> np.ndarray:
+    """Q(s, a) = r(s, a) + gamma * V(s') pour les actions valides, 0 sinon"""
+    safe_next = np.where(env.valid_mask, env.next_state, 0)
+    q = env.rewards + gamma * values[safe_next]
+    q[~env.valid_mask] = 0.0
+    q[env.walls | env.goal_mask] = 0.0
+    return q
+
+
+def _greedy_path(env: CompiledMaze, q: np.ndarray, max_steps: int = 100) -> List[Tuple[int, int]]:
+    """Chemin glouton depuis S (mêmes règles que get_current_best_path)"""
+    masked = np.where(env.valid_mask, q, -np.inf).argmax(axis=1).tolist()
+    sid = env.start
+    path = [sid]
+    visited = {sid}
+    for _ in range(max_steps):
+        if not env.valid_actions[sid]:
+            break
+        new_sid = env.next_states[sid][masked[sid]]
+        if new_sid in visited:
+            break
+        path.append(new_sid)
+        visited.add(new_sid)
+        sid = new_sid
+        if env.goal_flags[sid]:
+            break
+    return [env.coords[s] for s in path]
+
+
+def _to_q_table(env: CompiledMaze, q: np.ndarray) -> ArrayQTable:
+    table = ArrayQTable(env.grid)
+    table.load(q)
+    return table
+
+
+def goal_distances(env: CompiledMaze) -> np.ndarray:
+    """Distance (en pas) de chaque case à G, -1 si G est inaccessible"""
+    distances = np.full(env.n_states, -1, dtype=np.int64)
+    if env.goal is None:
+        return distances
+    dist = distances.tolist()
+    dist[env.goal] = 0
+    queue = deque([env.goal])
+    # Les déplacements sont réversibles : le BFS depuis G suit les mêmes transitions
+    while queue:
+        sid = queue.popleft()
+        for next_sid in env.next_states[sid]:
+            if next_sid >= 0 and dist[next_sid] < 0:
+                dist[next_sid] = dist[sid] + 1
+                queue.append(next_sid)
+    distances[:] = dist
+    distances[env.walls] = -1
+    return distances
+
+
+def shortest_path_length(grid) -> int:
+    """Nombre de pas du plus court chemin S -> G, -1 s'il n'existe pas"""
+    env = _compile(grid)
+    return int(goal_distances(env)[env.start])
+
+
+def value_iteration(grid, gamma: float = 0.9, tol: float = 1e-9,
+                    max_iterations: int = 10000) -> Dict:
+    """
+    Itération de valeur vectorisée
+
+    Returns:
+        Dict {'path', 'q_table', 'iterations'}
+    """
+    env = _compile(grid)
+    safe_next = np.where(env.valid_mask, env.next_state, 0)
+    rewards = env.rewards.astype(np.float64)
+    # G est terminal, les murs et les cases sans action n'ont pas de valeur future
+    live = env.valid_mask.any(axis=1) & ~env.goal_mask & ~env.walls
+    values = np.zeros(env.n_states)
+
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        q = np.where(env.valid_mask, rewards + gamma * values[safe_next], -np.inf)
+        new_values = np.where(live, q.max(axis=1), 0.0)
+        delta = np.abs(new_values - values).max()
+        values = new_values
+        if delta < tol:
+            break
+
+    q = _q_from_values(env, values, gamma)
+    return {
+        'path': _greedy_path(env, q),
+        'q_table': _to_q_table(env, q),
+        'iterations': iterations,
+    }
+
+
+def bfs(grid, gamma: float = 0.9) -> Dict:
+    """
+    Plus court chemin par parcours en largeur
+
+    La valeur optimale d'une case à d pas de G s'écrit en forme close :
+    V(d) = -(1 - gamma^(d-1)) / (1 - gamma) + 100 * gamma^(d-1), et
+    V = -1 / (1 - gamma) si G est inaccessible (errance sans fin).
+
+    Returns:
+        Dict {'path', 'q_table', 'length'}
+    """
+    env = _compile(grid)
+    distances = goal_distances(env)
+    values = np.zeros(env.n_states)
+    reachable = distances > 0
+    k = distances[reachable] - 1
+    if gamma == 1:
+        values[reachable] = -k + env.GOAL_REWARD
+    else:
+        values[reachable] = (-(1 - gamma ** k) / (1 - gamma)
+                             + env.GOAL_REWARD * gamma ** k)
+    live = env.valid_mask.any(axis=1) & ~env.walls
+    unreachable = (distances < 0) & live
+    values[unreachable] = -1 / (1 - gamma) if gamma < 1 else -np.inf
+
+    q = _q_from_values(env, values, gamma)
+
+    # Chemin : on descend les distances, première action valide en cas d'égalité
+    path = []
+    if distances[env.start] >= 0:
+        dist = distances.tolist()
+        sid = env.start
+        path.append(sid)
+        while dist[sid] > 0:
+            sid = next(n for n in env.next_states[sid] if n >= 0 and dist[n] == dist[sid] - 1)
+            path.append(sid)
+    else:
+        path = [env.start]
+
+    return {
+        'path': [env.coords[s] for s in path],
+        'q_table': _to_q_table(env, q),
+        'length': int(distances[env.start]),
+    }
+
+
+def astar(grid) -> Dict:
+    """
+    A* avec l'heuristique de Manhattan (chemin seulement)
+
+    Returns:
+        Dict {'path', 'q_table': None, 'length'}
+    """
+    env = _compile(grid)
+    goal_r, goal_c = env.coords[env.goal]
+    coords = env.coords
+
+    def heuristic(sid):
+        r, c = coords[sid]
+        return abs(r - goal_r) + abs(c - goal_c)
+
+    came_from = {env.start: None}
+    cost = {env.start: 0}
+    counter = 0
+    heap = [(heuristic(env.start), counter, env.start)]
+    while heap:
+        _, _, sid = heapq.heappop(heap)
+        if sid == env.goal:
+            break
+        for next_sid in env.next_states[sid]:
+            if next_sid < 0:
+                continue
+            new_cost = cost[sid] + 1
+            if new_cost < cost.get(next_sid, new_cost + 1):
+                cost[next_sid] = new_cost
+                came_from[next_sid] = sid
+                counter += 1
+                heapq.heappush(heap, (new_cost + heuristic(next_sid), counter, next_sid))
+
+    if env.goal not in came_from:
+        return {'path': [coords[env.start]], 'q_table': None, 'length': -1}
+
+    path = []
+    sid = env.goal
+    while sid is not None:
+        path.append(coords[sid])
+        sid = came_from[sid]
+    path.reverse()
+    return {'path': path, 'q_table': None, 'length': len(path) - 1}
+
+
+def solve(grid, solver: str = 'bfs', gamma: float = 0.9) -> Dict:
+    """Résout un labyrinthe avec le planificateur demandé (voir SOLVERS)"""
+    if solver == 'value_iteration':
+        return value_iteration(grid, gamma=gamma)
+    if solver == 'bfs':
+        return bfs(grid, gamma=gamma)
+    if solver == 'astar':
+        return astar(grid)
+    raise ValueError(f"Planificateur inconnu: {solver}")
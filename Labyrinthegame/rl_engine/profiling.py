@@ -0,0 +1,221 @@
+"""
+Module profiling.py
+Profilage optionnel de la boucle d'entraînement (temps, appels et allocations par phase)
+
+Un TrainingProfiler passé à iter_training / train_with_callback mesure les
+phases de l'entraînement :
+    choose_action    : choix de l'action (_choose_action_id)
+    update_q_value   : mise à jour de la Q-table (_update_q_id)
+    planning         : mises à jour simulées, Dyna-Q ou balayage prioritaire (_plan)
+    best_path        : meilleur chemin glouton des épisodes détaillés (_tracked_best_path)
+    convergence      : test d'arrêt anticipé
+    episode_summary  : résumé de chaque épisode (_episode_summary)
+    history          : chemins et erreurs des épisodes détaillés (_add_episode_details)
+Le reste du temps (transitions, boucle, consommateur du générateur) est
+reporté dans 'other', le coût estimé des mesures dans 'instrumentation'.
+
+Les méthodes mesurées sont remplacées sur l'instance de l'agent pendant
+l'entraînement seulement : sans profiler, la boucle n'exécute aucun code de
+mesure. Les allocations sont le nombre net de blocs mémoire alloués par
+l'interpréteur pendant chaque phase (sys.getallocatedblocks).
+"""
+
+import gc
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+PHASES = ('choose_action', 'update_q_value', 'planning', 'best_path', 'convergence',
+          'episode_summary', 'history')
+
+# Méthodes de l'agent remplacées par une version mesurée : {méthode: phase}
+INSTRUMENTED_METHODS = {
+    '_choose_action_id': 'choose_action',
+    '_update_q_id': 'update_q_value',
+    '_plan': 'planning',
+    '_tracked_best_path': 'best_path',
+    '_episode_summary': 'episode_summary',
+    '_add_episode_details': 'history',
+}
+
+
+class TrainingProfiler:
+    """
+    Accumule le temps, le nombre d'appels et les allocations de chaque phase
+
+    Les hooks (fonctions hook(phase, elapsed, allocated)) sont appelés à la
+    fin de chaque phase mesurée, ex. pour alimenter des métriques externes.
+    """
+
+    def __init__(self, hooks=None):
+        self.hooks = list(hooks or [])
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.allocations = dict.fromkeys(PHASES, 0)
+        self.total = 0.0
+        self.gc_collections = 0
+        self._started = None
+        self._gc_start = 0
+        # Temps et allocations des phases imbriquées dans la phase en cours
+        self._inner_time = 0.0
+        self._inner_blocks = 0
+        # Coût de la mesure d'un appel, hors du temps attribué à la phase (voir _call_overhead)
+        self._call_overhead = None
+
+    def add_hook(self, hook: Callable):
+        """Ajoute un hook appelé à la fin de chaque phase"""
+        self.hooks.append(hook)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Mesure un bloc de code comme une phase"""
+        for counters, zero in ((self.times, 0.0), (self.calls, 0), (self.allocations, 0)):
+            counters.setdefault(name, zero)
+        outer_time, outer_blocks = self._inner_time, self._inner_blocks
+        self._inner_time, self._inner_blocks = 0.0, 0
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = sys.getallocatedblocks() - blocks
+            self._close_phase(name, elapsed, allocated, outer_time, outer_blocks)
+
+    def _close_phase(self, name, elapsed, allocated, outer_time, outer_blocks):
+        """
+        Enregistre une phase terminée
+
+        Les phases imbriquées (ex. best_path pendant convergence) ne sont
+        comptées que dans la phase la plus interne : le temps et les
+        allocations enregistrés sont exclusifs.
+        """
+        own_time = elapsed - self._inner_time
+        own_blocks = allocated - self._inner_blocks
+        self._inner_time = outer_time + elapsed
+        self._inner_blocks = outer_blocks + allocated
+        self.times[name] += own_time
+        self.calls[name] += 1
+        self.allocations[name] += own_blocks
+        for hook in self.hooks:
+            hook(name, own_time, own_blocks)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Retourne func mesurée comme la phase name"""
+        profiler = self
+        close_phase = self._close_phase
+        perf_counter = time.perf_counter
+        allocated_blocks = sys.getallocatedblocks
+
+        def measured(*args, **kwargs):
+            outer_time = profiler._inner_time
+            outer_blocks = profiler._inner_blocks
+            profiler._inner_time = 0.0
+            profiler._inner_blocks = 0
+            blocks = allocated_blocks()
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                close_phase(name, perf_counter() - start, allocated_blocks() - blocks,
+                            outer_time, outer_blocks)
+        return measured
+
+    @contextmanager
+    def instrument(self, agent):
+        """Remplace les méthodes mesurées de l'agent pendant le bloc"""
+        # Méthodes propres à l'instance (ex. variantes des tables compactes), remises ensuite
+        own_methods = {method: agent.__dict__[method]
+                       for method in INSTRUMENTED_METHODS if method in agent.__dict__}
+        for method, phase in INSTRUMENTED_METHODS.items():
+            setattr(agent, method, self.wrap(phase, getattr(agent, method)))
+        self._gc_start = _gc_collections()
+        self._started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total += time.perf_counter() - self._started
+            self.gc_collections += _gc_collections() - self._gc_start
+            # Calibré en fin d'entraînement : le coût de sys.getallocatedblocks croît avec le tas
+            self._call_overhead = _call_overhead()
+            for method in INSTRUMENTED_METHODS:
+                # Retour aux méthodes de la classe (ou de l'instance)
+                agent.__dict__.pop(method, None)
+            agent.__dict__.update(own_methods)
+
+    def summary(self) -> Dict:
+        """
+        Résumé sérialisable en JSON
+
+        Returns:
+            Dict {'total_ms', 'episodes', 'steps', 'gc_collections',
+                  'phases': {phase: {'calls', 'time_ms', 'share', 'allocated_blocks'}}}
+        """
+        total = self.total
+        # Un résumé par épisode, une mise à jour de la Q-table par pas
+        episodes = self.calls['episode_summary']
+        steps = self.calls['update_q_value']
+        measured = sum(self.times.values())
+        phases = {}
+        for name, elapsed in self.times.items():
+            phases[name] = {
+                'calls': self.calls[name],
+                'time_ms': round(elapsed * 1000, 3),
+                'share': round(elapsed / total, 4) if total else 0.0,
+                'allocated_blocks': self.allocations[name],
+            }
+        # Coût estimé des mesures elles-mêmes, à ne pas confondre avec le reste de la boucle
+        calls = sum(self.calls.values())
+        overhead = min(calls * (self._call_overhead or 0.0), max(total - measured, 0.0))
+        phases['instrumentation'] = {
+            'calls': calls,
+            'time_ms': round(overhead * 1000, 3),
+            'share': round(overhead / total, 4) if total else 0.0,
+            'allocated_blocks': 0,
+        }
+        other = max(total - measured - overhead, 0.0)
+        phases['other'] = {
+            'calls': 0,
+            'time_ms': round(other * 1000, 3),
+            'share': round(other / total, 4) if total else 0.0,
+            'allocated_blocks': 0,
+        }
+        return {
+            'total_ms': round(total * 1000, 3),
+            'episodes': episodes,
+            'steps': steps,
+            'gc_collections': self.gc_collections,
+            'phases': phases,
+        }
+
+
+def _call_overhead(samples: int = 2000) -> float:
+    """
+    Coût moyen (secondes) d'un appel mesuré en plus de l'appel lui-même
+
+    Mesuré une fois par profiler sur une fonction vide : c'est le temps
+    passé hors de la fenêtre chronométrée (lectures de l'horloge et du
+    nombre de blocs, enregistrement), qui apparaîtrait sinon dans 'other'.
+    """
+    profiler = TrainingProfiler()
+    profiler.times['calibration'] = 0.0
+    profiler.calls['calibration'] = 0
+    profiler.allocations['calibration'] = 0
+    plain = lambda: None
+    measured = profiler.wrap('calibration', plain)
+    start = time.perf_counter()
+    for _ in range(samples):
+        plain()
+    plain_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(samples):
+        measured()
+    measured_time = time.perf_counter() - start
+    inside = profiler.times['calibration']
+    return max(measured_time - plain_time - inside, 0.0) / samples
+
+
+def _gc_collections() -> int:
+    """Nombre total de collectes du ramasse-miettes depuis le démarrage"""
+    return sum(stats['collections'] for stats in gc.get_stats())
@@ -1,6 +1,97 @@
-import random
+import time
 import numpy as np
-from typing import List, Tuple, Dict, Callable
+from typing import List, Tuple, Dict, Callable, Iterator
+from rl_engine.cache import get_cache, make_key
+from rl_engine.dyna import DynaModel
+from rl_engine.maze import CompiledMaze, compile_maze
+from rl_engine.metrics import get_registry
+from rl_engine.planner import goal_distances, solve
+from rl_engine.profiling import TrainingProfiler
+from rl_engine.q_table import ArrayQTable, MemmapQTable, q_table_to_array
+from rl_engine.sweeping import PrioritizedSweeping
+
+# Politiques d'historique acceptées par iter_training
+HISTORY_POLICIES = ('none', 'summary', 'every_n', 'best_changes', 'full')
+
+# Critères d'arrêt anticipé acceptés par iter_training (le premier atteint arrête)
+CONVERGENCE_CRITERIA = ('max_delta', 'patience', 'optimal')
+
+# Métriques des entraînements (voir rl_engine/metrics.py)
+TRAININGS_STARTED = get_registry().counter(
+    'trainings_started', "Entraînements démarrés", ('backend',))
+TRAINING_EPISODES = get_registry().counter(
+    'training_episodes', "Épisodes d'entraînement exécutés")
+TRAINING_STEPS = get_registry().counter(
+    'training_steps', "Pas d'agent exécutés")
+TRAINING_PLANNING_UPDATES = get_registry().counter(
+    'training_planning_updates', "Mises à jour simulées (Dyna-Q, balayage prioritaire)")
+TRAINING_DURATION = get_registry().histogram(
+    'training_duration_seconds', "Durée d'un entraînement")
+TRAINING_THROUGHPUT = get_registry().histogram(
+    'training_episodes_per_second', "Épisodes par seconde d'un entraînement",
+    buckets=(100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000))
+
+
+def validate_convergence(convergence: Dict) -> Dict:
+    """
+    Vérifie les critères d'arrêt anticipé (voir CONVERGENCE_CRITERIA)
+    
+    Returns:
+        Les critères (None si aucun)
+    
+    Raises:
+        ValueError: si un critère est inconnu ou d'un type ou d'une valeur invalide
+    """
+    if convergence is None:
+        return None
+    if not isinstance(convergence, dict):
+        raise ValueError("Les critères de convergence doivent être un dictionnaire")
+    unknown = set(convergence) - set(CONVERGENCE_CRITERIA)
+    if unknown:
+        raise ValueError(f"Critères de convergence inconnus: {', '.join(sorted(unknown))}")
+    
+    max_delta = convergence.get('max_delta')
+    if max_delta is not None and (isinstance(max_delta, bool)
+                                  or not isinstance(max_delta, (int, float))
+                                  or not max_delta >= 0):
+        raise ValueError("max_delta doit être un nombre positif ou nul")
+    patience = convergence.get('patience')
+    if patience is not None and (isinstance(patience, bool) or not isinstance(patience, int)
+                                 or patience < 1):
+        raise ValueError("patience doit être un entier supérieur ou égal à 1")
+    optimal = convergence.get('optimal')
+    if optimal is not None and not isinstance(optimal, bool):
+        raise ValueError("optimal doit être un booléen")
+    return convergence
+
+
+class BatchedRandom:
+    """
+    Générateur aléatoire privé, basé sur numpy.random.Generator
+
+    Les tirages uniformes sont générés par blocs et consommés un par un, ce
+    qui garde le coût d'un tirage proche de celui du module random tout en
+    offrant des résultats reproductibles pour une graine donnée. Expose la
+    même interface que le module random pour random() et choice().
+    """
+    
+    BLOCK_SIZE = 4096
+    
+    def __init__(self, seed: int = None):
+        self.generator = np.random.default_rng(seed)
+        self._block = []
+    
+    def random(self) -> float:
+        """Tire un flottant uniforme dans [0, 1)"""
+        if not self._block:
+            # Inversé pour consommer les tirages dans l'ordre avec pop()
+            self._block = self.generator.random(self.BLOCK_SIZE)[::-1].tolist()
+        return self._block.pop()
+    
+    def choice(self, seq):
+        """Choisit un élément uniformément dans une séquence non vide"""
+        return seq[int(self.random() * len(seq))]
+
 
 class QLearnerWithVisualization:
     """Version améliorée avec visualisation complète de l'entraînement"""
@@ -12,11 +103,76 @@ class QLearnerWithVisualization:
         3: (0, 1)    # Droite
     }
     
-    def __init__(self, alpha: float = 0.1, gamma: float = 0.9, epsilon: float = 0.1):
+    # Backends de stockage de la Q-table :
+    #   'dict'   : listes Python, le plus rapide pour la boucle pas à pas (défaut)
+    #   'array'  : tableau NumPy compact (cases libres seulement, voir CompactQTable),
+    #              pour les calculs vectorisés (Dyna-Q, enregistrement) et la mémoire :
+    #              Q-table environ 3 fois plus petite qu'avec 'dict', mais boucle pas à
+    #              pas environ 25 % plus lente (chaque lecture convertit un float du tampon)
+    #   'memmap' : même disposition projetée depuis un fichier, très grands labyrinthes
+    # Ce n'est pas un backend de performance : 'dict' reste le plus rapide.
+    BACKENDS = ('dict', 'array', 'memmap')
+    
+    # Nombre maximum de pas par épisode
+    MAX_STEPS = 100
+    
+    # Dyna-Q : mises à jour simulées regroupées en un calcul NumPy (et en fin d'épisode)
+    PLANNING_BATCH = 256
+    
+    # Choix des mises à jour simulées : tirage uniforme (Dyna-Q) ou balayage prioritaire
+    SCHEDULERS = {'uniform': DynaModel, 'prioritized': PrioritizedSweeping}
+    
+    def __init__(self, alpha: float = 0.1, gamma: float = 0.9, epsilon: float = 0.1,
+                 backend: str = 'dict', dtype=np.float64, seed: int = None,
+                 warm_start=None, q_table_path: str = None, planning_steps: int = 0,
+                 scheduler: str = 'uniform'):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend de Q-table inconnu: {backend}")
+        if planning_steps < 0:
+            raise ValueError("planning_steps doit être positif ou nul")
+        if scheduler not in self.SCHEDULERS:
+            raise ValueError(f"Ordonnanceur de planification inconnu: {scheduler}")
+        # Dyna-Q : mises à jour vectorisées, la Q-table doit être un tableau NumPy
+        if planning_steps and backend == 'dict':
+            backend = 'array'
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        self.backend = backend
+        self.dtype = dtype
+        # Générateur privé : résultats reproductibles et pas d'état partagé entre threads
+        self.seed = seed
+        self.rng = BatchedRandom(seed)
+        # Q-table initiale (dict, ArrayQTable ou tableau (rows * cols, 4)) au lieu de zéros
+        self.warm_start = warm_start
+        # Fichier de la Q-table du backend 'memmap' (None : fichier temporaire)
+        self.q_table_path = q_table_path
+        # Dyna-Q : mises à jour simulées par pas réel (0 : Q-learning seul, voir rl_engine/dyna.py)
+        self.planning_steps = planning_steps
+        # 'prioritized' : balayage prioritaire depuis G (voir rl_engine/sweeping.py)
+        self.scheduler = scheduler
+        if backend != 'dict':
+            # Tables compactes : variantes sans vue par état (voir init_q_table)
+            self._greedy_action = self._greedy_action_flat
+            self._update_q_id = self._update_q_id_flat
         self.q_table = {}
+        self._q_rows = None
+        # Tables compactes : valeurs à plat et position des Q-valeurs de chaque état
+        self._q_flat = None
+        self._q_offsets = None
+        self.env = None
+        self._env_grid = None
+        # Suivi incrémental du chemin glouton (voir _tracked_best_path)
+        self._best_path = None
+        self._best_start = None
+        self._best_actions = {}
+        # Plus grande variation de Q de l'épisode en cours et épisode de convergence
+        self._episode_max_delta = 0.0
+        self.converged_episode = None
+        # Épisodes, pas et mises à jour simulées du dernier entraînement
+        self.episodes_run = 0
+        self.steps_run = 0
+        self.planning_updates_run = 0
         self.training_stats = {
             'errors': [],
             'explorations': [],
@@ -25,134 +181,418 @@ class QLearnerWithVisualization:
         }
     
     def init_q_table(self, grid: List[List[str]]):
-        """Initialise la Q-table"""
-        self.q_table = {}
-        rows = len(grid)
-        cols = len(grid[0])
+        """Initialise la Q-table (à zéro, ou depuis warm_start)"""
+        env = self._env_for(grid)
+        self._invalidate_best_path()
+        initial = None
+        if self.warm_start is not None:
+            initial = q_table_to_array(self.warm_start, env.rows, env.cols, dtype=self.dtype)
+            initial[env.walls] = 0.0
+        
+        if self.backend in ('array', 'memmap'):
+            # Seules les cases libres sont stockées, sans objet Python par case
+            if self.backend == 'array':
+                self.q_table = ArrayQTable(grid, dtype=self.dtype)
+            else:
+                self.q_table = MemmapQTable(grid, path=self.q_table_path, dtype=self.dtype)
+            if initial is not None:
+                self.q_table.load(initial)
+            self._q_rows = self.q_table.row_views()
+            self._q_flat, self._q_offsets = self.q_table.flat_offsets()
+            return
         
-        for r in range(rows):
-            for c in range(cols):
-                if grid[r][c] != '#':
-                    self.q_table[(r, c)] = [0.0, 0.0, 0.0, 0.0]
+        self.q_table = {}
+        initial_rows = initial.tolist() if initial is not None else None
+        # Les listes sont partagées entre le dict et l'index par identifiant d'état
+        self._q_rows = [None] * env.n_states
+        for sid in range(env.n_states):
+            if not env.wall_flags[sid]:
+                q_values = initial_rows[sid] if initial_rows else [0.0, 0.0, 0.0, 0.0]
+                self.q_table[env.coords[sid]] = q_values
+                self._q_rows[sid] = q_values
+    
+    def _env_for(self, grid: List[List[str]]) -> CompiledMaze:
+        """Retourne l'environnement compilé de la grille (compilé une seule fois)"""
+        if self.env is None or self._env_grid is not grid:
+            # Backend 'memmap' (très grands labyrinthes) : pas de liste Python par case
+            self.env = compile_maze(grid, compact=self.backend == 'memmap')
+            self._env_grid = grid
+        return self.env
+    
+    def _q_values(self, state: Tuple[int, int]):
+        """Retourne les Q-valeurs d'un état, sans hachage"""
+        return self._q_rows[state[0] * self.env.cols + state[1]]
     
     def get_valid_actions(self, state: Tuple[int, int], grid: List[List[str]]) -> List[int]:
         """Retourne les actions valides depuis un état"""
-        r, c = state
-        rows = len(grid)
-        cols = len(grid[0])
-        valid_actions = []
-        
-        for action in range(4):
-            dr, dc = self.DIRECTIONS[action]
-            new_r, new_c = r + dr, c + dc
-            
-            if 0 <= new_r < rows and 0 <= new_c < cols:
-                if grid[new_r][new_c] != '#':
-                    valid_actions.append(action)
+        env = self._env_for(grid)
+        return list(env.valid_actions[env.state_id(state)])
+    
+    def _greedy_action(self, sid: int, valid_actions: List[int]) -> int:
+        """Meilleure action parmi les actions valides (la première en cas d'égalité)"""
+        q_values = self._q_rows[sid]
+        best_action = valid_actions[0]
+        best_value = q_values[best_action]
         
-        return valid_actions
+        for action in valid_actions[1:]:
+            if q_values[action] > best_value:
+                best_value = q_values[action]
+                best_action = action
+        
+        return best_action
     
-    def choose_action(self, state: Tuple[int, int], grid: List[List[str]]) -> Tuple[int, str]:
-        """Choisit une action (retourne aussi le type: 'explore' ou 'exploit')"""
-        valid_actions = self.get_valid_actions(state, grid)
+    def _greedy_action_flat(self, sid: int, valid_actions: List[int]) -> int:
+        """_greedy_action d'une table compacte : lecture directe dans le tampon"""
+        q_flat = self._q_flat
+        base = self._q_offsets[sid]
+        best_action = valid_actions[0]
+        best_value = q_flat[base + best_action]
+        
+        for action in valid_actions[1:]:
+            if q_flat[base + action] > best_value:
+                best_value = q_flat[base + action]
+                best_action = action
+        
+        return best_action
+    
+    def _choose_action_id(self, sid: int) -> Tuple[int, str]:
+        """Choisit une action depuis un identifiant d'état"""
+        valid_actions = self.env.valid_actions[sid]
         
         if not valid_actions:
             return None, 'blocked'
         
         # EXPLORATION
-        if random.random() < self.epsilon:
-            return random.choice(valid_actions), 'explore'
+        if self.rng.random() < self.epsilon:
+            return self.rng.choice(valid_actions), 'explore'
         
         # EXPLOITATION
-        q_values = self.q_table[state]
-        best_action = valid_actions[0]
-        best_value = q_values[best_action]
+        return self._greedy_action(sid, valid_actions), 'exploit'
+    
+    def choose_action(self, state: Tuple[int, int], grid: List[List[str]]) -> Tuple[int, str]:
+        """Choisit une action (retourne aussi le type: 'explore' ou 'exploit')"""
+        env = self._env_for(grid)
+        return self._choose_action_id(env.state_id(state))
+    
+    def _q_array(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Tableau des Q-valeurs (cases libres) et ligne de chaque état"""
+        return self.q_table.values, self.q_table.index
+    
+    def _plan(self, model: DynaModel, values: np.ndarray, row_index: np.ndarray,
+              n_updates: int):
+        """Mises à jour Dyna-Q simulées (planning_steps par pas réel, regroupées en lots)"""
+        states, max_delta = model.plan(values, row_index, self.alpha, self.gamma, n_updates)
+        self.planning_updates_run += len(states)
+        if max_delta > self._episode_max_delta:
+            self._episode_max_delta = max_delta
         
-        for action in valid_actions[1:]:
-            if q_values[action] > best_value:
-                best_value = q_values[action]
-                best_action = action
+        # Même invalidation que _update_q_id pour les états du chemin glouton mémorisé
+        best_actions = self._best_actions
+        if best_actions:
+            valid_actions = self.env.valid_actions
+            for sid in best_actions.keys() & set(states.tolist()):
+                if self._greedy_action(sid, valid_actions[sid]) != best_actions[sid]:
+                    self._invalidate_best_path()
+                    break
+    
+    def _update_q_id(self, sid: int, action: int, reward: float, next_sid: int):
+        """Met à jour la Q-table à partir d'identifiants d'état"""
+        q_values = self._q_rows[sid]
+        current_q = q_values[action]
+        
+        valid_next_actions = self.env.valid_actions[next_sid]
+        if valid_next_actions:
+            next_q_values = self._q_rows[next_sid]
+            max_next_q = max([next_q_values[a] for a in valid_next_actions])
+        else:
+            max_next_q = 0
+        
+        delta = self.alpha * (reward + self.gamma * max_next_q - current_q)
+        q_values[action] = current_q + delta
+        if delta < 0:
+            delta = -delta
+        if delta > self._episode_max_delta:
+            self._episode_max_delta = delta
+        
+        # Le chemin glouton ne change que si l'argmax d'un état du chemin change
+        best_action = self._best_actions.get(sid)
+        if best_action is not None and \
+                self._greedy_action(sid, self.env.valid_actions[sid]) != best_action:
+            self._invalidate_best_path()
+    
+    def _update_q_id_flat(self, sid: int, action: int, reward: float, next_sid: int):
+        """_update_q_id d'une table compacte : lecture et écriture directes dans le tampon"""
+        q_flat = self._q_flat
+        position = self._q_offsets[sid] + action
+        current_q = q_flat[position]
+        
+        valid_next_actions = self.env.valid_actions[next_sid]
+        if valid_next_actions:
+            base = self._q_offsets[next_sid]
+            max_next_q = max([q_flat[base + a] for a in valid_next_actions])
+        else:
+            max_next_q = 0
+        
+        delta = self.alpha * (reward + self.gamma * max_next_q - current_q)
+        q_flat[position] = current_q + delta
+        if delta < 0:
+            delta = -delta
+        if delta > self._episode_max_delta:
+            self._episode_max_delta = delta
         
-        return best_action, 'exploit'
+        # Le chemin glouton ne change que si l'argmax d'un état du chemin change
+        best_action = self._best_actions.get(sid)
+        if best_action is not None and \
+                self._greedy_action(sid, self.env.valid_actions[sid]) != best_action:
+            self._invalidate_best_path()
     
     def update_q_value(self, state: Tuple[int, int], action: int, 
                       reward: float, next_state: Tuple[int, int], grid: List[List[str]]):
         """Met à jour la Q-table"""
-        current_q = self.q_table[state][action]
-        
+        env = self._env_for(grid)
         if next_state in self.q_table:
-            valid_next_actions = self.get_valid_actions(next_state, grid)
-            if valid_next_actions:
-                next_q_values = [self.q_table[next_state][a] for a in valid_next_actions]
-                max_next_q = max(next_q_values)
-            else:
-                max_next_q = 0
+            self._update_q_id(env.state_id(state), action, reward, env.state_id(next_state))
         else:
-            max_next_q = 0
-        
-        new_q = current_q + self.alpha * (reward + self.gamma * max_next_q - current_q)
-        self.q_table[state][action] = new_q
+            # État suivant hors de la table (mur ou hors limites) : pas de valeur future
+            q_values = self._q_values(state)
+            q_values[action] = q_values[action] + self.alpha * (reward - q_values[action])
+            self._invalidate_best_path()
     
     def get_current_best_path(self, grid: List[List[str]], start_pos: Tuple[int, int]) -> List[Tuple[int, int]]:
         """Extrait le meilleur chemin actuel selon la Q-table"""
-        path = [start_pos]
-        state = start_pos
-        visited = set([state])
-        max_steps = 100
+        env = self._env_for(grid)
+        return [env.coords[sid] for sid in self._best_path_ids(env.state_id(start_pos))]
+    
+    def _best_path_ids(self, start: int, max_steps: int = 100,
+                       actions: Dict[int, int] = None) -> List[int]:
+        """
+        Suit la politique gloutonne depuis start (identifiants d'état)
+        
+        Si actions est fourni, y enregistre l'action gloutonne évaluée pour
+        chaque état du chemin.
+        """
+        env = self.env
+        path = [start]
+        sid = start
+        visited = {sid}
         
         for _ in range(max_steps):
-            valid_actions = self.get_valid_actions(state, grid)
+            valid_actions = env.valid_actions[sid]
             if not valid_actions:
                 break
             
-            q_values = self.q_table[state]
-            best_action = valid_actions[0]
-            best_value = q_values[best_action]
-            
-            for action in valid_actions[1:]:
-                if q_values[action] > best_value:
-                    best_value = q_values[action]
-                    best_action = action
+            best_action = self._greedy_action(sid, valid_actions)
+            if actions is not None:
+                actions[sid] = best_action
+            new_sid = env.next_states[sid][best_action]
             
-            dr, dc = self.DIRECTIONS[best_action]
-            new_state = (state[0] + dr, state[1] + dc)
-            
-            if new_state in visited:
+            if new_sid in visited:
                 break
             
-            path.append(new_state)
-            visited.add(new_state)
-            state = new_state
+            path.append(new_sid)
+            visited.add(new_sid)
+            sid = new_sid
             
-            if grid[new_state[0]][new_state[1]] == 'G':
+            if env.goal_flags[new_sid]:
                 break
         
         return path
     
+    def _invalidate_best_path(self):
+        """Oublie le chemin glouton mémorisé"""
+        self._best_path = None
+        self._best_actions = {}
+    
+    def _tracked_best_path(self, start: int) -> List[int]:
+        """
+        Chemin glouton depuis start, recalculé seulement s'il a pu changer
+        
+        Le chemin ne dépend que de l'action gloutonne des états qu'il traverse :
+        _update_q_id l'invalide dès qu'une mise à jour change l'une d'elles.
+        La liste retournée est partagée et ne doit pas être modifiée.
+        """
+        if self._best_path is None or self._best_start != start:
+            self._best_actions = {}
+            self._best_path = self._best_path_ids(start, actions=self._best_actions)
+            self._best_start = start
+        return self._best_path
+    
+    def _convergence_check(self, start: int, convergence: Dict) -> Callable[[], bool]:
+        """
+        Prépare le test d'arrêt anticipé, appelé à la fin de chaque épisode
+        
+        Critères (voir CONVERGENCE_CRITERIA), le premier atteint arrête :
+            'max_delta' : plus grande variation de Q de l'épisode sous ce seuil
+            'patience'  : chemin glouton inchangé (et atteignant G) pendant K épisodes
+            'optimal'   : chemin glouton aussi court que le plus court chemin (BFS)
+        """
+        validate_convergence(convergence)
+        
+        env = self.env
+        max_delta = convergence.get('max_delta')
+        patience = convergence.get('patience')
+        optimum = None
+        if convergence.get('optimal'):
+            optimum = int(goal_distances(env)[start])
+        stable = {'path': None, 'count': 0}
+        
+        def converged() -> bool:
+            if max_delta is not None and self._episode_max_delta < max_delta:
+                return True
+            if patience is None and optimum is None:
+                return False
+            
+            path = self._tracked_best_path(start)
+            if not env.goal_flags[path[-1]]:
+                stable['path'], stable['count'] = None, 0
+                return False
+            if optimum is not None and len(path) - 1 == optimum:
+                return True
+            if patience is not None:
+                if path is stable['path'] or path == stable['path']:
+                    stable['count'] += 1
+                else:
+                    stable['path'], stable['count'] = path, 1
+                return stable['count'] >= patience
+            return False
+        
+        return converged
+    
     def train_with_callback(self, grid: List[List[str]], start_pos: Tuple[int, int], 
-                           episodes: int = 1000) -> List[Dict]:
+                           episodes: int = 1000, history: str = 'full',
+                           history_every: int = 10, convergence: Dict = None,
+                           profiler: TrainingProfiler = None) -> List[Dict]:
         """Entraîne avec callback pour visualisation"""
+        return list(self.iter_training(grid, start_pos, episodes, history, history_every,
+                                       convergence, profiler))
+    
+    def iter_training(self, grid: List[List[str]], start_pos: Tuple[int, int],
+                      episodes: int = 1000, history: str = 'full',
+                      history_every: int = 10, convergence: Dict = None,
+                      profiler: TrainingProfiler = None,
+                      on_episode: Callable[[int], None] = None) -> Iterator[Dict]:
+        """
+        Entraîne épisode par épisode (générateur, rien n'est accumulé)
+        
+        Le paramètre history contrôle les épisodes produits et leur contenu :
+            'full'         : tous les épisodes, avec chemins et erreurs
+            'every_n'      : tous les épisodes résumés, détaillés toutes les
+                             history_every (et le dernier)
+            'best_changes' : les épisodes complets où le meilleur chemin change,
+                             et le dernier (ou celui de la convergence)
+            'summary'      : tous les épisodes, sans chemins ni erreurs
+            'none'         : aucun épisode
+        Les chemins (et le déroulé glouton du meilleur chemin) ne sont calculés
+        que pour les épisodes qui les exposent.
+        
+        convergence (voir _convergence_check) arrête l'entraînement dès qu'un
+        critère est atteint ; l'épisode concerné est alors produit avec
+        'converged': True et mémorisé dans self.converged_episode.
+        
+        profiler (voir rl_engine/profiling.py) mesure le temps, les appels et
+        les allocations de chaque phase ; sans profiler, rien n'est mesuré.
+        
+        on_episode(episode) est appelé à la fin de chaque épisode, quelle que
+        soit la politique history (ex. avancement, annulation en levant une
+        exception).
+        """
+        if history not in HISTORY_POLICIES:
+            raise ValueError(f"Politique d'historique inconnue: {history}")
+        if history == 'every_n' and history_every < 1:
+            raise ValueError("history_every doit être supérieur ou égal à 1")
+        
         self.init_q_table(grid)
-        history = []
-        rows = len(grid)
-        cols = len(grid[0])
+        TRAININGS_STARTED.inc(backend=self.backend)
+        self.episodes_run = 0
+        self.steps_run = 0
+        self.planning_updates_run = 0
+        started = time.perf_counter()
+        try:
+            if profiler is None:
+                yield from self._training_episodes(start_pos, episodes, history, history_every,
+                                                   convergence, on_episode=on_episode)
+            else:
+                with profiler.instrument(self):
+                    yield from self._training_episodes(start_pos, episodes, history,
+                                                       history_every, convergence, profiler,
+                                                       on_episode)
+        finally:
+            self._record_training(time.perf_counter() - started)
+    
+    def _record_training(self, elapsed: float):
+        """Enregistre les métriques d'un entraînement terminé (ou interrompu)"""
+        TRAINING_EPISODES.inc(self.episodes_run)
+        TRAINING_STEPS.inc(self.steps_run)
+        TRAINING_PLANNING_UPDATES.inc(self.planning_updates_run)
+        TRAINING_DURATION.observe(elapsed)
+        if elapsed > 0 and self.episodes_run:
+            TRAINING_THROUGHPUT.observe(self.episodes_run / elapsed)
+    
+    def _episode_summary(self, episode: int, reward: float, steps: int,
+                         explorations: int, reached_goal: bool) -> Dict:
+        """Résumé d'un épisode dans l'historique"""
+        return {
+            'episode': episode,
+            'reward': reward,
+            'steps': steps,
+            'explorations': explorations,
+            'reached_goal': reached_goal
+        }
+    
+    def _add_episode_details(self, summary: Dict, episode_path: List[int],
+                             episode_errors: List[Dict], best_ids: List[int]):
+        """Ajoute le chemin, le meilleur chemin et les erreurs à un résumé d'épisode"""
+        coords = self.env.coords
+        summary['path'] = [coords[s] for s in episode_path]
+        summary['best_path'] = [coords[s] for s in best_ids]
+        summary['errors'] = episode_errors
+    
+    def _training_episodes(self, start_pos: Tuple[int, int], episodes: int, history: str,
+                           history_every: int, convergence: Dict,
+                           profiler: TrainingProfiler = None,
+                           on_episode: Callable[[int], None] = None) -> Iterator[Dict]:
+        """Boucle d'entraînement de iter_training (Q-table déjà initialisée)"""
+        env = self.env
+        coords = env.coords
+        next_states = env.next_states
+        rewards = env.rewards_list
+        goal_flags = env.goal_flags
+        start = env.state_id(start_pos)
+        previous_best = None
+        self.converged_episode = None
+        converged = self._convergence_check(start, convergence) if convergence else None
+        if profiler is not None and converged is not None:
+            converged = profiler.wrap('convergence', converged)
+        model = None
+        planning_steps = self.planning_steps
+        planning_batch = max(self.PLANNING_BATCH, planning_steps)
+        if planning_steps:
+            model = self.SCHEDULERS[self.scheduler](env, self.rng.generator)
+            q_values, row_index = self._q_array()
         
         for episode in range(episodes):
-            state = start_pos
+            self._episode_max_delta = 0.0
+            if history == 'every_n':
+                detailed = episode % history_every == 0 or episode == episodes - 1
+            else:
+                detailed = history in ('full', 'best_changes')
+            
+            sid = start
             total_reward = 0
             steps = 0
-            max_steps = 100
-            episode_path = [state]
+            max_steps = self.MAX_STEPS
+            planned = 0
+            episode_path = [sid]
             episode_errors = []
             episode_explorations = 0
             
             while steps < max_steps:
-                action, action_type = self.choose_action(state, grid)
+                action, action_type = self._choose_action_id(sid)
                 
                 if action is None:
                     episode_errors.append({
                         'step': steps,
-                        'state': state,
+                        'state': coords[sid],
                         'error': 'blocked',
                         'message': 'Aucune action valide disponible'
                     })
@@ -161,67 +601,79 @@ class QLearnerWithVisualization:
                 if action_type == 'explore':
                     episode_explorations += 1
                 
-                dr, dc = self.DIRECTIONS[action]
-                new_r, new_c = state[0] + dr, state[1] + dc
-                
-                if not (0 <= new_r < rows and 0 <= new_c < cols):
-                    episode_errors.append({
-                        'step': steps,
-                        'state': state,
-                        'action': action,
-                        'error': 'out_of_bounds',
-                        'message': f'Action mène hors limites: ({new_r}, {new_c})'
-                    })
-                    break
+                # Les actions valides mènent toujours dans la grille hors murs
+                new_sid = next_states[sid][action]
+                reward = rewards[sid][action]
                 
-                cell = grid[new_r][new_c]
+                self._update_q_id(sid, action, reward, new_sid)
+                if model is not None:
+                    model.record(sid, action)
+                    planned += planning_steps
+                    if planned >= planning_batch:
+                        self._plan(model, q_values, row_index, planned)
+                        planned = 0
                 
-                if cell == 'G':
-                    reward = 100
-                elif cell == '#':
-                    reward = -10
-                    episode_errors.append({
-                        'step': steps,
-                        'state': state,
-                        'action': action,
-                        'error': 'hit_wall',
-                        'message': f'Collision avec un mur à ({new_r}, {new_c})'
-                    })
-                else:
-                    reward = -1
-                
-                self.update_q_value(state, action, reward, (new_r, new_c), grid)
-                
-                state = (new_r, new_c)
-                episode_path.append(state)
+                sid = new_sid
+                if detailed:
+                    episode_path.append(sid)
                 total_reward += reward
                 steps += 1
                 
-                if cell == 'G':
+                if goal_flags[sid]:
                     break
             
-            # Obtenir le meilleur chemin actuel
-            best_path = self.get_current_best_path(grid, start_pos)
+            if planned:
+                self._plan(model, q_values, row_index, planned)
+            self.episodes_run += 1
+            self.steps_run += steps
+            summary = self._episode_summary(episode, total_reward, steps,
+                                            episode_explorations, goal_flags[sid])
+            
+            if converged is not None and converged():
+                self.converged_episode = episode
+                summary['converged'] = True
             
-            # Sauvegarder l'historique
-            history.append({
-                'episode': episode,
-                'reward': total_reward,
-                'steps': steps,
-                'path': episode_path,
-                'best_path': best_path,
-                'errors': episode_errors,
-                'explorations': episode_explorations,
-                'reached_goal': grid[state[0]][state[1]] == 'G'
-            })
-        
-        return history
+            if detailed:
+                # Obtenir le meilleur chemin actuel (mémorisé tant qu'il ne change pas)
+                best_ids = self._tracked_best_path(start)
+                changed = not (best_ids is previous_best or best_ids == previous_best)
+                previous_best = best_ids
+                last = episode == episodes - 1 or self.converged_episode is not None
+                if history != 'best_changes' or changed or last:
+                    self._add_episode_details(summary, episode_path, episode_errors, best_ids)
+                    yield summary
+            elif history in ('summary', 'every_n'):
+                yield summary
+            
+            if on_episode is not None:
+                on_episode(episode)
+            if self.converged_episode is not None:
+                break
 
 
 def get_optimal_path(grid: List[List[str]], alpha: float = 0.1, 
                     gamma: float = 0.9, epsilon: float = 0.1, 
-                    episodes: int = 1000) -> List[Tuple[int, int]]:
-    """Fonction principale pour obtenir le chemin optimal"""
+                    episodes: int = 1000, backend: str = 'dict', seed: int = None,
+                    use_cache: bool = True, solver: str = 'qlearning') -> List[Tuple[int, int]]:
+    """
+    Fonction principale pour obtenir le chemin optimal
+    
+    solver='qlearning' entraîne un agent ; les autres valeurs ('value_iteration',
+    'bfs', 'astar') résolvent directement le labyrinthe (voir rl_engine/planner.py).
+    Sans graine (seed=None), l'entraînement n'est pas reproductible : le
+    résultat n'est pas mis en cache.
+    """
+    if solver != 'qlearning':
+        return solve(grid, solver=solver, gamma=gamma)['path']
+    
+    use_cache = use_cache and seed is not None
+    cache_key = make_key('optimal_path', grid, alpha=alpha, gamma=gamma, epsilon=epsilon,
+                         episodes=episodes, backend=backend, seed=seed)
+    if use_cache:
+        cached = get_cache().get(cache_key)
+        if cached is not None:
+            return cached
+    
     start_pos = None
     for r in range(len(grid)):
         for c in range(len(grid[0])):
@@ -234,17 +686,49 @@ def get_optimal_path(grid: List[List[str]], alpha: float = 0.1,
     if not start_pos:
         raise ValueError("Pas de position de départ 'S' dans le labyrinthe")
     
-    agent = QLearnerWithVisualization(alpha=alpha, gamma=gamma, epsilon=epsilon)
-    agent.train_with_callback(grid, start_pos, episodes)
+    agent = QLearnerWithVisualization(alpha=alpha, gamma=gamma, epsilon=epsilon,
+                                      backend=backend, seed=seed)
+    # Seul le chemin final est utile : aucun historique n'est construit
+    agent.train_with_callback(grid, start_pos, episodes, history='none')
     
     path = agent.get_current_best_path(grid, start_pos)
+    if use_cache:
+        get_cache().set(cache_key, path)
     return path
 
 
 def train_with_live_updates(grid: List[List[str]], alpha: float = 0.1, 
                             gamma: float = 0.9, epsilon: float = 0.1, 
-                            episodes: int = 1000):
-    """Entraîne et retourne l'historique complet pour la visualisation"""
+                            episodes: int = 1000, backend: str = 'dict', seed: int = None,
+                            use_cache: bool = True, history: str = 'full',
+                            history_every: int = 10, convergence: Dict = None,
+                            warm_start=None, profile: bool = False, planning_steps: int = 0,
+                            scheduler: str = 'uniform'):
+    """
+    Entraîne et retourne l'historique (voir iter_training pour history et convergence)
+    
+    planning_steps : mises à jour Dyna-Q simulées par pas réel (0 : Q-learning seul),
+    choisies selon scheduler ('uniform' ou 'prioritized', voir QLearnerWithVisualization).
+    
+    warm_start : Q-table initiale (voir QLearnerWithVisualization). Le résultat
+    dépend alors de cette table et n'est pas mis en cache.
+    profile : ajoute au résultat le résumé du profilage de l'entraînement
+    ('profile', voir TrainingProfiler.summary). Le résultat n'est pas mis en cache.
+    Il ne l'est pas non plus sans graine (seed=None) : l'entraînement n'est alors
+    pas reproductible. Un résultat lu dans le cache porte 'cached': True.
+    """
+    use_cache = use_cache and seed is not None and warm_start is None and not profile
+    cache_key = make_key('live_updates', grid, alpha=alpha, gamma=gamma, epsilon=epsilon,
+                         episodes=episodes, backend=backend, seed=seed,
+                         history=history, history_every=history_every,
+                         convergence=convergence, planning_steps=planning_steps,
+                         scheduler=scheduler)
+    if use_cache:
+        cached = get_cache().get(cache_key)
+        if cached is not None:
+            cached['cached'] = True
+            return cached
+    
     start_pos = None
     for r in range(len(grid)):
         for c in range(len(grid[0])):
@@ -257,13 +741,247 @@ def train_with_live_updates(grid: List[List[str]], alpha: float = 0.1,
     if not start_pos:
         raise ValueError("Pas de position de départ 'S'")
     
-    agent = QLearnerWithVisualization(alpha=alpha, gamma=gamma, epsilon=epsilon)
-    history = agent.train_with_callback(grid, start_pos, episodes)
+    agent = QLearnerWithVisualization(alpha=alpha, gamma=gamma, epsilon=epsilon,
+                                      backend=backend, seed=seed, warm_start=warm_start,
+                                      planning_steps=planning_steps, scheduler=scheduler)
+    profiler = TrainingProfiler() if profile else None
+    episode_history = agent.train_with_callback(grid, start_pos, episodes,
+                                                history, history_every, convergence,
+                                                profiler)
     final_path = agent.get_current_best_path(grid, start_pos)
     
-    return {
-        'history': history,
+    result = {
+        'history': episode_history,
         'final_path': final_path,
+        'converged_episode': agent.converged_episode,
         'q_table': agent.q_table,
         'stats': agent.training_stats
-    }
\ No newline at end of file
+    }
+    if profiler is not None:
+        result['profile'] = profiler.summary()
+    if use_cache:
+        get_cache().set(cache_key, result)
+    return result
+
+
+def stream_live_updates(grid: List[List[str]], alpha: float = 0.1,
+                        gamma: float = 0.9, epsilon: float = 0.1,
+                        episodes: int = 1000, backend: str = 'dict',
+                        seed: int = None, history: str = 'full',
+                        history_every: int = 10, convergence: Dict = None,
+                        warm_start=None, planning_steps: int = 0,
+                        scheduler: str = 'uniform', on_finish: Callable = None,
+                        on_episode: Callable[[int], None] = None) -> Iterator[Dict]:
+    """
+    Variante en flux de train_with_live_updates
+    
+    Produit un événement {'type': 'episode', 'data': {...}} par épisode retenu
+    par la politique history au fil de l'entraînement, puis {'type': 'done',
+    'final_path': [...], 'total_episodes': n, 'converged_episode': k ou None}.
+    L'historique n'est jamais accumulé en mémoire.
+    
+    on_finish(agent, final_path, total_episodes) est appelé à la fin de
+    l'entraînement, avant l'événement 'done' (ex. pour enregistrer la Q-table).
+    on_episode(episode) est appelé après chaque épisode (voir iter_training).
+    """
+    start_pos = compile_maze(grid).start_pos
+    if not start_pos:
+        raise ValueError("Pas de position de départ 'S'")
+    
+    agent = QLearnerWithVisualization(alpha=alpha, gamma=gamma, epsilon=epsilon,
+                                      backend=backend, seed=seed, warm_start=warm_start,
+                                      planning_steps=planning_steps, scheduler=scheduler)
+    for episode_data in agent.iter_training(grid, start_pos, episodes,
+                                            history, history_every, convergence,
+                                            on_episode=on_episode):
+        yield {'type': 'episode', 'data': episode_data}
+    
+    converged_episode = agent.converged_episode
+    final_path = agent.get_current_best_path(grid, start_pos)
+    total_episodes = episodes if converged_episode is None else converged_episode + 1
+    if on_finish is not None:
+        on_finish(agent, final_path, total_episodes)
+    yield {
+        'type': 'done',
+        'final_path': final_path,
+        'total_episodes': total_episodes,
+        'converged_episode': converged_episode
+    }
+
+
+# Nombre d'agents à partir duquel train_batch avance tous les agents en même temps
+BATCH_MIN_AGENTS = 16
+
+
+def train_batch(grids: List[List[List[str]]], alpha=0.1, gamma=0.9, epsilon=0.1,
+                episodes=1000, seed=None, max_steps: int = 100) -> List[Dict]:
+    """
+    Entraîne N agents indépendants en parallèle (pas synchronisés, NumPy)
+
+    Chaque agent possède son propre bloc d'états dans une Q-table commune de
+    forme (somme des cases, 4), ce qui permet de traiter le pas de tous les
+    agents avec quelques opérations vectorisées. Les agents peuvent avoir des
+    labyrinthes différents et leurs propres hyperparamètres.
+    
+    Le coût d'un pas synchronisé est presque indépendant de N : le lot n'est
+    plus rapide que des entraînements successifs qu'à partir d'environ 16
+    agents sur des labyrinthes de même taille (environ 32 si les tailles
+    diffèrent : le lot avance au rythme de l'agent le plus lent). En dessous
+    de BATCH_MIN_AGENTS, les agents sont donc entraînés l'un après l'autre
+    avec la boucle pas à pas de QLearnerWithVisualization : le format des
+    résultats est le même, les tirages aléatoires diffèrent de ceux du lot
+    mais restent reproductibles avec seed.
+    
+    Args:
+        grids: Liste de N grilles (une même grille peut apparaître plusieurs fois)
+        alpha, gamma, epsilon, episodes: Scalaire ou séquence de N valeurs
+        seed: Graine du générateur aléatoire du lot
+        max_steps: Nombre maximum de pas par épisode
+        
+    Returns:
+        Liste de N dicts {'final_path', 'q_table', 'rewards', 'steps', 'reached_goal'}
+    """
+    n_agents = len(grids)
+    if n_agents == 0:
+        return []
+    
+    envs = [CompiledMaze(grid) for grid in grids]
+    for env in envs:
+        if env.start is None:
+            raise ValueError("Pas de position de départ 'S'")
+    
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), (n_agents,))
+    gamma = np.broadcast_to(np.asarray(gamma, dtype=np.float64), (n_agents,))
+    epsilon = np.broadcast_to(np.asarray(epsilon, dtype=np.float64), (n_agents,))
+    episodes = np.broadcast_to(np.asarray(episodes, dtype=np.int64), (n_agents,))
+    if n_agents < BATCH_MIN_AGENTS:
+        return _train_one_by_one(grids, envs, alpha, gamma, epsilon, episodes, seed, max_steps)
+    
+    started = time.perf_counter()
+    TRAININGS_STARTED.inc(n_agents, backend='batch')
+    rng = np.random.default_rng(seed)
+    
+    # Concaténation des environnements dans un espace d'états global, à plat (s * 4 + a)
+    offsets = np.cumsum([0] + [env.n_states for env in envs])
+    valid_mask = np.concatenate([env.valid_mask for env in envs])
+    next_flat = np.concatenate([
+        np.where(env.valid_mask, env.next_state + offset, 0)
+        for env, offset in zip(envs, offsets)
+    ]).reshape(-1)
+    rewards_flat = np.concatenate([env.rewards for env in envs]).astype(np.float64).reshape(-1)
+    goal = np.concatenate([env.goal_mask for env in envs])
+    starts = offsets[:-1] + np.array([env.start for env in envs])
+    # Actions invalides à -inf : argmax et max se passent de masque (remises à 0 à la fin)
+    q = np.where(valid_mask, 0.0, -np.inf)
+    q_flat = q.reshape(-1)
+    # Actions valides de chaque état (complétées par la première) et leur nombre
+    n_valid = valid_mask.sum(axis=1)
+    valid_padded = np.argsort(~valid_mask, axis=1, kind='stable')
+    valid_padded = np.where(np.arange(4) < n_valid[:, None], valid_padded, valid_padded[:, :1])
+    
+    max_episodes = int(episodes.max())
+    rewards_log = np.zeros((n_agents, max_episodes), dtype=np.int64)
+    steps_log = np.zeros((n_agents, max_episodes), dtype=np.int64)
+    goal_log = np.zeros((n_agents, max_episodes), dtype=bool)
+    state = starts.copy()
+    episode_reward = np.zeros(n_agents, dtype=np.int64)
+    episode_steps = np.zeros(n_agents, dtype=np.int64)
+    # Départ sans action valide : chaque épisode se termine sans pas (journaux à zéro)
+    done_episodes = np.where(n_valid[starts] == 0, episodes, 0)
+    
+    # Chaque tour de boucle fait un pas pour tous les agents actifs avec une
+    # vingtaine d'opérations NumPy : son coût (~20 µs) dépend peu du nombre
+    # d'agents, celui d'un pas en Python pur est d'environ 1 µs.
+    agents = None
+    while True:
+        if agents is None:
+            # Agents actifs et leurs paramètres, recalculés quand un agent termine
+            agents = np.flatnonzero(done_episodes < episodes)
+            if len(agents) == 0:
+                break
+            agents_alpha = alpha[agents]
+            agents_gamma = gamma[agents]
+            agents_epsilon = epsilon[agents]
+            agents_episodes = episodes[agents]
+        
+        s = state[agents]
+        # Choix epsilon-greedy vectorisé (premier maximum en cas d'égalité)
+        draws = rng.random((2, len(agents)))
+        greedy = q[s].argmax(axis=1)
+        random_action = valid_padded[s, (draws[1] * n_valid[s]).astype(np.intp)]
+        action = np.where(draws[0] < agents_epsilon, random_action, greedy)
+        
+        # Mise à jour de Q (un bloc d'états par agent : aucun indice en double)
+        sa = s * 4 + action
+        ns = next_flat[sa]
+        r = rewards_flat[sa]
+        current = q_flat[sa]
+        q_flat[sa] = current + agents_alpha * (r + agents_gamma * q[ns].max(axis=1) - current)
+        
+        state[agents] = ns
+        episode_reward[agents] += r.astype(np.int64)
+        episode_steps[agents] += 1
+        
+        # Fin d'épisode : arrivée ou limite de pas
+        ended = goal[ns] | (episode_steps[agents] >= max_steps)
+        if ended.any():
+            e = agents[ended]
+            k = done_episodes[e]
+            rewards_log[e, k] = episode_reward[e]
+            steps_log[e, k] = episode_steps[e]
+            goal_log[e, k] = goal[ns[ended]]
+            done_episodes[e] = k + 1
+            state[e] = starts[e]
+            episode_reward[e] = 0
+            episode_steps[e] = 0
+            if (k + 1 >= agents_episodes[ended]).any():
+                agents = None
+    q[~valid_mask] = 0.0
+    
+    elapsed = time.perf_counter() - started
+    total_episodes = int(episodes.sum())
+    TRAINING_EPISODES.inc(total_episodes)
+    TRAINING_STEPS.inc(int(steps_log.sum()))
+    TRAINING_DURATION.observe(elapsed)
+    if elapsed > 0 and total_episodes:
+        TRAINING_THROUGHPUT.observe(total_episodes / elapsed)
+    
+    results = []
+    for i, (grid, env) in enumerate(zip(grids, envs)):
+        agent = QLearnerWithVisualization(alpha=float(alpha[i]), gamma=float(gamma[i]),
+                                          epsilon=float(epsilon[i]), backend='array')
+        agent.init_q_table(grid)
+        agent.q_table.load(q[offsets[i]:offsets[i + 1]])
+        results.append({
+            'final_path': agent.get_current_best_path(grid, env.start_pos),
+            'q_table': agent.q_table,
+            'rewards': rewards_log[i, :episodes[i]].tolist(),
+            'steps': steps_log[i, :episodes[i]].tolist(),
+            'reached_goal': goal_log[i, :episodes[i]].tolist()
+        })
+    
+    return results
+
+
+def _train_one_by_one(grids, envs, alpha, gamma, epsilon, episodes, seed, max_steps):
+    """train_batch pour un petit lot : un agent après l'autre (voir BATCH_MIN_AGENTS)"""
+    # Une graine par agent, dérivée de celle du lot
+    seeds = np.random.SeedSequence(seed).spawn(len(grids))
+    results = []
+    for i, (grid, env) in enumerate(zip(grids, envs)):
+        agent = QLearnerWithVisualization(alpha=float(alpha[i]), gamma=float(gamma[i]),
+                                          epsilon=float(epsilon[i]), seed=seeds[i])
+        agent.MAX_STEPS = max_steps
+        history = agent.train_with_callback(grid, env.start_pos, int(episodes[i]),
+                                            history='summary')
+        # Même type de Q-table que le lot vectorisé
+        q_table = ArrayQTable(grid)
+        q_table.load(q_table_to_array(agent.q_table, env.rows, env.cols))
+        results.append({
+            'final_path': agent.get_current_best_path(grid, env.start_pos),
+            'q_table': q_table,
+            'rewards': [summary['reward'] for summary in history],
+            'steps': [summary['steps'] for summary in history],
+            'reached_goal': [summary['reached_goal'] for summary in history]
+        })
+    return results
@@ -0,0 +1,253 @@
+"""
+Module q_table.py
+Stockage de la Q-table sous forme de tableau NumPy contigu (en mémoire ou
+projeté depuis un fichier pour les très grands labyrinthes)
+"""
+
+import os
+import tempfile
+import weakref
+from collections.abc import Mapping
+from typing import Iterator, List, Tuple, Union
+
+import numpy as np
+
+
+def _valid_mask(grid: List[List[str]]) -> np.ndarray:
+    """Masque des cases non-murs, indexé par identifiant d'état (r * cols + c)"""
+    rows = len(grid)
+    cols = len(grid[0]) if rows > 0 else 0
+    if not rows:
+        return np.zeros(0, dtype=bool)
+    return np.array(grid, dtype='U1').reshape(rows * cols) != '#'
+
+
+class _CompactRows:
+    """
+    Séquence des vues par état d'une Q-table compacte, créées à la demande
+
+    Aucune liste de taille rows * cols n'est construite ; la boucle
+    d'entraînement n'utilise pas ces vues (voir CompactQTable.flat_offsets).
+    """
+
+    __slots__ = ('_flat', '_index')
+
+    def __init__(self, flat: memoryview, index: np.ndarray):
+        self._flat = flat
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, sid: int):
+        row = int(self._index[sid])
+        if row < 0:
+            return None
+        return self._flat[row * 4:row * 4 + 4]
+
+
+class CompactQTable(Mapping):
+    """
+    Q-table NumPy ne stockant que les cases non-murs
+
+    Les valeurs sont un tableau contigu de forme (nombre de cases libres, 4) ;
+    un index indexé par identifiant d'état (r * cols + c) donne la ligne de
+    chaque case (-1 pour un mur). Aucun objet Python n'est créé par case :
+    une table occupe 32 octets par case libre (float64) et 4 octets par case.
+    La classe se comporte comme un dictionnaire {(r, c): valeurs} en lecture
+    afin de rester compatible avec le code existant ; les valeurs retournées
+    sont des vues sur le tableau, donc q_table[(r, c)][a] = x modifie la table.
+    """
+
+    def _set_index(self, valid: np.ndarray, rows: int, cols: int) -> int:
+        """Calcule l'index des lignes et retourne le nombre de cases libres"""
+        self.rows = rows
+        self.cols = cols
+        self.valid = valid
+        n_valid = int(valid.sum())
+        index_dtype = np.int32 if n_valid < 2 ** 29 else np.int64
+        self.index = np.cumsum(valid, dtype=index_dtype) - 1
+        self.index[~valid] = -1
+        return n_valid
+
+    def row_views(self) -> _CompactRows:
+        """Vues memoryview par état (None pour les murs), créées à la demande"""
+        flat = memoryview(self.values.reshape(-1))
+        return _CompactRows(flat, self.index)
+
+    def flat_offsets(self) -> Tuple[memoryview, memoryview]:
+        """
+        Valeurs à plat et position de la première Q-valeur de chaque état
+
+        Q(s, a) vaut flat[offsets[s] + a] ; l'indexation d'une memoryview
+        renvoie directement un float Python (boucle d'entraînement, voir
+        QLearnerWithVisualization).
+        """
+        offsets = self.index * 4
+        offsets[~self.valid] = -1
+        return memoryview(self.values.reshape(-1)), memoryview(offsets)
+
+    def state_id(self, state: Tuple[int, int]) -> int:
+        """Convertit une position (r, c) en identifiant d'état"""
+        return state[0] * self.cols + state[1]
+
+    def state_of(self, state_id: int) -> Tuple[int, int]:
+        """Convertit un identifiant d'état en position (r, c)"""
+        return divmod(int(state_id), self.cols)
+
+    def _checked_row(self, state) -> int:
+        try:
+            r, c = state
+        except (TypeError, ValueError):
+            raise KeyError(state)
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise KeyError(state)
+        row = int(self.index[r * self.cols + c])
+        if row < 0:
+            raise KeyError(state)
+        return row
+
+    def __getitem__(self, state) -> np.ndarray:
+        return self.values[self._checked_row(state)]
+
+    def __setitem__(self, state, q_values):
+        self.values[self._checked_row(state)] = q_values
+
+    def __contains__(self, state) -> bool:
+        try:
+            self._checked_row(state)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for sid in np.flatnonzero(self.valid):
+            yield self.state_of(sid)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def load(self, values: np.ndarray):
+        """Remplit la table depuis un tableau (rows * cols, 4) indexé par identifiant d'état"""
+        self.values[:] = values[self.valid]
+
+    def to_array(self) -> np.ndarray:
+        """Copie de forme (rows * cols, 4) indexée par identifiant d'état, murs à 0"""
+        array = np.zeros((self.rows * self.cols, 4), dtype=self.values.dtype)
+        array[self.valid] = self.values
+        return array
+
+    def to_dict(self) -> dict:
+        """Retourne une copie au format dict {(r, c): [q0, q1, q2, q3]}"""
+        return {state: self.values[row].tolist()
+                for row, state in enumerate(self)}
+
+
+class ArrayQTable(CompactQTable):
+    """Q-table compacte en mémoire (tableau NumPy, voir CompactQTable)"""
+
+    def __init__(self, grid: List[List[str]], dtype=np.float64):
+        rows = len(grid)
+        n_valid = self._set_index(_valid_mask(grid), rows, len(grid[0]) if rows > 0 else 0)
+        self.values = np.zeros((n_valid, 4), dtype=dtype)
+
+
+class MemmapQTable(CompactQTable):
+    """
+    Q-table compacte projetée en mémoire depuis un fichier (numpy.memmap)
+
+    Même disposition qu'ArrayQTable, dans un fichier de forme (nombre de
+    cases libres, 4). Le système ne garde en mémoire que les pages
+    utilisées ; avec l'environnement compact (CompiledMaze(compact=True)), un
+    entraînement sur 1000x1000 occupe environ 80 Mo en plus de la grille.
+
+    Sans chemin, la table est écrite dans un fichier temporaire supprimé avec
+    l'objet. Avec un chemin explicite, la table est conservée sur disque et
+    partagée sans copie avec les autres processus : pickle ne transmet que le
+    chemin et le masque des cases, le processus destinataire rouvre le fichier.
+    """
+
+    def __init__(self, grid: List[List[str]], path: str = None, dtype=np.float64,
+                 mode: str = 'w+'):
+        rows = len(grid)
+        cols = len(grid[0]) if rows > 0 else 0
+        self._setup(_valid_mask(grid), rows, cols, path, dtype, mode)
+
+    def _setup(self, valid: np.ndarray, rows: int, cols: int, path: str, dtype, mode: str):
+        n_valid = self._set_index(valid, rows, cols)
+
+        self._owned = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.qtable')
+            os.close(fd)
+            # Le fichier temporaire disparaît avec la table
+            self._finalizer = weakref.finalize(self, _remove_file, path)
+        self.path = path
+        # np.memmap refuse une taille nulle : au moins une ligne dans le fichier
+        self.values = np.memmap(path, dtype=dtype, mode=mode, shape=(max(n_valid, 1), 4))
+        if n_valid == 0:
+            self.values = self.values[:0]
+
+    @classmethod
+    def open(cls, grid: List[List[str]], path: str, dtype=np.float64,
+             mode: str = 'r+') -> 'MemmapQTable':
+        """Ouvre une table existante (mode 'r' pour la lecture seule)"""
+        return cls(grid, path=path, dtype=dtype, mode=mode)
+
+    def __reduce__(self):
+        packed = np.packbits(self.valid)
+        if self._owned:
+            # Fichier temporaire : lié à la vie de cet objet, les valeurs sont copiées
+            return (_restore_memmap, (None, self.rows, self.cols, packed,
+                                      self.values.dtype.str, np.asarray(self.values)))
+        self.flush()
+        return (_restore_memmap, (self.path, self.rows, self.cols, packed,
+                                  self.values.dtype.str, None))
+
+    def flush(self):
+        """Écrit les modifications sur disque"""
+        if isinstance(self.values, np.memmap):
+            self.values.flush()
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _restore_memmap(path, rows, cols, packed_valid, dtype, values):
+    valid = np.unpackbits(packed_valid, count=rows * cols).astype(bool)
+    table = MemmapQTable.__new__(MemmapQTable)
+    table._setup(valid, rows, cols, path, dtype, 'w+' if path is None else 'r+')
+    if values is not None:
+        table.values[:] = values
+    return table
+
+
+def q_table_to_array(q_table: Union[Mapping, np.ndarray], rows: int, cols: int,
+                     dtype=np.float64) -> np.ndarray:
+    """
+    Convertit une Q-table (dict {(r, c): valeurs}, ArrayQTable, MemmapQTable
+    ou tableau) en tableau (rows * cols, 4) indexé par identifiant d'état
+
+    Les états absents (murs) valent 0.
+
+    Raises:
+        ValueError: si la forme ne correspond pas à la grille
+    """
+    if isinstance(q_table, CompactQTable):
+        q_table = q_table.to_array()
+    if isinstance(q_table, np.ndarray):
+        if q_table.shape != (rows * cols, 4):
+            raise ValueError(
+                f"Q-table de forme {q_table.shape} incompatible avec une grille {rows}x{cols}")
+        return q_table.astype(dtype, copy=True)
+
+    values = np.zeros((rows * cols, 4), dtype=dtype)
+    for (r, c), q_values in q_table.items():
+        if not (0 <= r < rows and 0 <= c < cols):
+            raise ValueError(f"État ({r}, {c}) hors de la grille {rows}x{cols}")
+        values[r * cols + c] = q_values
+    return values
@@ -0,0 +1,119 @@
+"""
+Module sweeping.py
+Planification par balayage prioritaire (prioritized sweeping)
+
+Variante de Dyna-Q (voir dyna.py) : au lieu de rejouer des transitions
+tirées au hasard, les mises à jour simulées suivent une file de priorité.
+La priorité d'un couple (état, action) est l'écart |r + gamma * V(s') - Q(s, a)|
+entre sa valeur et la cible donnée par le modèle. Après chaque mise à jour
+de Q(s, .), les prédécesseurs observés de s (couples menant à s) sont
+réévalués et ajoutés à la file : la récompense de G remonte le labyrinthe
+d'un bout à l'autre au lieu d'une case par visite.
+
+Le modèle étant déterministe, une mise à jour simulée est une sauvegarde de
+Bellman complète (Q(s, a) = r + gamma * V(s')) : le pas alpha ne sert qu'à
+moyenner des transitions bruitées, il n'est utilisé que pour les pas réels.
+"""
+
+import heapq
+from typing import List, Tuple
+
+import numpy as np
+
+from rl_engine.dyna import DynaModel
+from rl_engine.maze import CompiledMaze
+
+
+class PrioritizedSweeping(DynaModel):
+    """
+    Modèle des transitions observées, index des prédécesseurs et file de priorité
+
+    Les couples sont identifiés comme dans DynaModel (s * 4 + a). La file est
+    un tas (priorité négative, couple) ; une entrée est périmée si la priorité
+    enregistrée du couple a changé depuis son ajout (suppression paresseuse).
+    """
+
+    # Écart en dessous duquel un couple n'est pas ajouté à la file
+    THETA = 1e-3
+
+    def __init__(self, env: CompiledMaze, generator: np.random.Generator, theta: float = None):
+        super().__init__(env, generator)
+        self.theta = self.THETA if theta is None else theta
+        # Couples observés menant à chaque état (créés à la première observation)
+        self._predecessors = {}
+        self._priority = [0.0] * (env.n_states * 4)
+        self._heap = []
+        # Couples observés depuis le dernier balayage, à évaluer au prochain
+        self._pending = []
+        self._next_list = self._next_state.tolist()
+        self._reward_list = self._rewards.tolist()
+        self._valid_actions = env.valid_actions
+
+    def record(self, sid: int, action: int):
+        """Enregistre une transition observée et la marque pour le prochain balayage"""
+        key = sid * 4 + action
+        if not self._seen[key]:
+            self._predecessors.setdefault(self._next_list[key], []).append(key)
+        super().record(sid, action)
+        self._pending.append(key)
+
+    def _push(self, key: int, priority: float):
+        if priority > self.theta and priority > self._priority[key]:
+            self._priority[key] = priority
+            heapq.heappush(self._heap, (-priority, key))
+
+    def plan(self, values: np.ndarray, row_index: np.ndarray, alpha: float, gamma: float,
+             n_updates: int) -> Tuple[np.ndarray, float]:
+        """
+        Effectue au plus n_updates mises à jour, par ordre de priorité décroissante
+
+        Le balayage s'arrête plus tôt si aucun couple n'a un écart supérieur
+        à theta. alpha n'est pas utilisé (sauvegardes complètes, voir le module).
+
+        Returns:
+            Tuple (états mis à jour, plus grande variation absolue)
+        """
+        next_list, reward_list, priority = self._next_list, self._reward_list, self._priority
+        valid_actions = self._valid_actions
+        row_of = None if row_index is None else row_index.tolist()
+
+        def state_value(sid: int) -> float:
+            actions = valid_actions[sid]
+            if not actions:
+                return 0.0
+            q_values = values[sid if row_of is None else row_of[sid]]
+            return max([q_values[a] for a in actions])
+
+        # Couples observés depuis le dernier balayage
+        for key in self._pending:
+            sid = key >> 2
+            current = values[sid if row_of is None else row_of[sid], key & 3]
+            self._push(key, abs(reward_list[key] + gamma * state_value(next_list[key]) - current))
+        self._pending = []
+
+        heap = self._heap
+        predecessors = self._predecessors
+        updated: List[int] = []
+        max_delta = 0.0
+        while heap and len(updated) < n_updates:
+            negative_priority, key = heapq.heappop(heap)
+            if -negative_priority != priority[key]:
+                continue  # entrée périmée
+            priority[key] = 0.0
+            sid = key >> 2
+            row = sid if row_of is None else row_of[sid]
+            target = reward_list[key] + gamma * state_value(next_list[key])
+            delta = abs(target - values[row, key & 3])
+            values[row, key & 3] = target
+            updated.append(sid)
+            if delta > max_delta:
+                max_delta = delta
+
+            # La valeur de sid a changé : réévaluation de ses prédécesseurs
+            value = gamma * state_value(sid)
+            for predecessor in predecessors.get(sid, ()):
+                p_sid = predecessor >> 2
+                current = values[p_sid if row_of is None else row_of[p_sid], predecessor & 3]
+                self._push(predecessor, abs(reward_list[predecessor] + value - current))
+
+        return np.array(updated, dtype=np.intp), float(max_delta)